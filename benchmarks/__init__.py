@@ -0,0 +1,7 @@
+"""性能基准：合成简历生成器和各处理阶段的计时。
+
+    python -m benchmarks --sizes 10 100 1000 --output results.json
+
+结果为 JSON，记录每个阶段在每种规模下的吞吐量、p50/p99 延迟和峰值内存，
+可用 ``--compare`` 与之前版本的结果对比。
+"""
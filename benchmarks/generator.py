@@ -0,0 +1,114 @@
+"""可复现的合成简历：同一 (entries, seed) 总是生成完全相同的数据。
+
+规模从极小到极端（10 到 10,000 个条目），描述以较长的中文为主并混入英文
+术语，技能类别数随规模增长。生成的数据已规范化，可直接交给渲染和预览。
+"""
+import random
+
+from resume_schema import normalize_resume_data
+
+# 常用汉字，用于拼出描述文本
+_CJK = ("的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而"
+        "方后多定行学法所民得经十三之进着等部度家电力里如水化高自二理起小物现实加量都两体制机当使点从业本去把性好"
+        "应开它合还因由其些然前外天政四日那社义事平形相全表间样与关各重新线内数正心反你明看原又么利比或但质气第向"
+        "道命此变条只没结解问意建月公无系军很情者最立代想已通并提直题党程展五果料象员革位入常文总次品式活设及管特"
+        "件长求老头基资边流路级少图山统接知较将组见计别她手角期根论运农指几九区强放决西被干做必战先回则任取据处理"
+        "项目负责优化设计实现系统平台服务性能数据架构团队协作客户需求上线迭代测试部署监控")
+_PUNCTUATION = "，，，。；、"
+_LATIN_TERMS = ("Python", "Go", "Kubernetes", "API", "Redis", "PostgreSQL", "CI/CD", "gRPC", "React", "QPS",
+                "P99", "SLA", "Kafka", "Docker", "Linux", "TypeScript")
+_LEVELS = ("入门", "熟练", "精通", "未指定")
+_DEGREES = ("学士", "硕士", "博士", "")
+_LANGUAGES = ("英语", "日语", "德语", "法语", "韩语", "西班牙语", "俄语")
+
+SIZES = (10, 100, 1000, 10000)
+
+# 条目在各部分之间的分配比例
+_SHARES = (("education", 0.05), ("experience", 0.3), ("projects", 0.3), ("skills", 0.3), ("languages", 0.05))
+
+
+def _sentence(rng, length):
+    """约 length 个字符的中文句子，夹杂英文术语和标点"""
+    parts = []
+    while length > 0:
+        roll = rng.random()
+        if roll < 0.08:
+            word = rng.choice(_LATIN_TERMS)
+            parts.append(f" {word} ")
+        elif roll < 0.16:
+            word = rng.choice(_PUNCTUATION)
+            parts.append(word)
+        else:
+            word = "".join(rng.choice(_CJK) for _ in range(rng.randint(2, 6)))
+            parts.append(word)
+        length -= len(word)
+    return "".join(parts).strip() + "。"
+
+
+def _description(rng, lines, chars):
+    return "\n".join(_sentence(rng, rng.randint(*chars)) for _ in range(rng.randint(*lines)))
+
+
+def _year_month(rng):
+    return f"{rng.randint(2000, 2024)}-{rng.randint(1, 12):02d}"
+
+
+def _allocate(entries):
+    """把 entries 个条目分配到各部分（规模足够时每部分至少一个）"""
+    counts = {section: int(entries * share) for section, share in _SHARES}
+    if entries >= len(_SHARES):
+        for section in counts:
+            counts[section] = max(counts[section], 1)
+    counts["experience"] += entries - sum(counts.values())
+    return counts
+
+
+def generate_resume(entries=100, seed=0, description_lines=(1, 5), description_chars=(20, 160)):
+    """生成包含约 entries 个条目的简历数据"""
+    rng = random.Random(f"{seed}:{entries}")
+    counts = _allocate(entries)
+    skill_types = max(3, int(entries ** 0.5)) # 类别数随规模增长
+    resume_data = {
+        "personal_info": {
+            "name": "".join(rng.choice(_CJK) for _ in range(3)),
+            "email": f"candidate{seed}@example.com",
+            "phone": f"138{rng.randint(0, 99999999):08d}",
+            "address": "北京市海淀区" + "".join(rng.choice(_CJK) for _ in range(6)),
+            "linkedin": f"linkedin.com/in/candidate{seed}",
+            "github": f"github.com/candidate{seed}",
+            "summary": _description(rng, (2, 4), (60, 240)),
+        },
+        "education": [
+            {"school": "".join(rng.choice(_CJK) for _ in range(4)) + "大学",
+             "major": "".join(rng.choice(_CJK) for _ in range(4)),
+             "degree": rng.choice(_DEGREES),
+             "start_year": str(start), "end_year": str(start + 4) if rng.random() < 0.9 else "至今",
+             "gpa": f"{rng.uniform(2.5, 4.0):.2f}" if rng.random() < 0.5 else "",
+             "description": _description(rng, description_lines, description_chars) if rng.random() < 0.6 else ""}
+            for start in (rng.randint(1995, 2020) for _ in range(counts["education"]))],
+        "experience": [
+            {"company": "".join(rng.choice(_CJK) for _ in range(rng.randint(4, 10))) + "有限公司",
+             "position": rng.choice(_LATIN_TERMS) + "工程师",
+             "start_date": _year_month(rng), "end_date": _year_month(rng) if rng.random() < 0.8 else "至今",
+             "description": _description(rng, description_lines, description_chars)}
+            for _ in range(counts["experience"])],
+        "projects": [
+            {"name": "".join(rng.choice(_CJK) for _ in range(rng.randint(3, 8))) + "系统",
+             "role": rng.choice(("负责人", "核心开发", "架构师", "成员")),
+             "date": _year_month(rng) if rng.random() < 0.7 else "",
+             "description": _description(rng, description_lines, description_chars),
+             "link": f"https://example.com/p/{rng.randint(1, 10 ** 6)}" if rng.random() < 0.3 else ""}
+            for _ in range(counts["projects"])],
+        "skills": [
+            {"name": rng.choice(_LATIN_TERMS) + str(i), "type": f"技能类别{rng.randrange(skill_types):03d}",
+             "level": rng.choice(_LEVELS)}
+            for i in range(counts["skills"])],
+        "languages": [
+            {"name": rng.choice(_LANGUAGES), "level": rng.choice(("流利", "CET-6", "N1", "未指定"))}
+            for _ in range(counts["languages"])],
+    }
+    return normalize_resume_data(resume_data)
+
+
+def entry_count(resume_data):
+    return sum(len(resume_data[section]) for section, _ in _SHARES)
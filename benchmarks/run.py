@@ -0,0 +1,318 @@
+"""基准测试运行器：对各阶段在不同规模的合成简历上计时，输出表格和 JSON 结果。
+
+每个阶段由 setup(resume_data, workdir) 定义，返回 prepare()；每次迭代先调用
+prepare() 做不计时的准备（复制数据、清空缓存等），它返回真正计时的零参数函数。
+迭代前先预热，峰值内存在单独的一次迭代中用 tracemalloc 测量，不影响计时。
+"""
+import copy
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+from benchmarks.generator import SIZES, entry_count, generate_resume
+from resume_schema import json_default, normalize_resume_data
+
+RESULTS_VERSION = 1
+
+# needs_font: 阶段需要中文字体（PDF 渲染），字体不可用时记为跳过
+Stage = namedtuple("Stage", "name needs_font setup")
+
+
+# --- 各阶段 ---
+
+def _setup_ensure_data_structure(resume_data, workdir):
+    """补全刚从 JSON 读出的数据（对应界面的 ensure_data_structure）"""
+    serialized = json.dumps(resume_data, ensure_ascii=False, default=json_default)
+
+    def prepare():
+        data = json.loads(serialized)
+        del data["languages"]
+        return lambda: normalize_resume_data(data)
+    return prepare
+
+
+def _setup_save_resume(resume_data, workdir):
+    """与界面 save_resume 相同的写法：ensure_ascii=False, indent=4"""
+    path = os.path.join(workdir, "save.json")
+
+    def save():
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(resume_data, f, ensure_ascii=False, indent=4, default=json_default)
+    return lambda: save
+
+
+def _setup_load_resume(resume_data, workdir):
+    """与界面 load_resume 相同：读取 JSON 并规范化"""
+    path = os.path.join(workdir, "load.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(resume_data, f, ensure_ascii=False, indent=4, default=json_default)
+
+    def load():
+        with open(path, 'r', encoding='utf-8') as f:
+            return normalize_resume_data(json.load(f))
+    return lambda: load
+
+
+def _setup_preview(resume_data, workdir):
+    """不带缓存的完整预览"""
+    from resume_preview import preview_text
+    return lambda: lambda: preview_text(resume_data)
+
+
+def _setup_preview_incremental(resume_data, workdir):
+    """只修改简介后的增量预览（其余部分取自缓存）"""
+    from resume_preview import PreviewRenderer
+    data = copy.deepcopy(resume_data)
+    renderer = PreviewRenderer()
+    renderer.render(data)
+    counter = iter(range(sys.maxsize))
+
+    def prepare():
+        data["personal_info"]["summary"] = f"修改后的简介 {next(counter)}"
+        return lambda: renderer.render(data, dirty={"summary"})
+    return prepare
+
+
+def _setup_pdf(resume_data, workdir):
+    """冷启动导出 PDF：每次迭代前清空布局缓存（字体缓存保留）"""
+    import resume_render
+
+    def prepare():
+        resume_render._LAYOUT_CACHE.clear()
+        return lambda: resume_render.render_resume(resume_data)
+    return prepare
+
+
+def _setup_pdf_reexport(resume_data, workdir):
+    """修改一条经历后再次导出：其余条目复用布局缓存"""
+    import resume_render
+    data = copy.deepcopy(resume_data)
+    resume_render.render_resume(data)
+    counter = iter(range(sys.maxsize))
+
+    def prepare():
+        edited = f"修改后的描述 {next(counter)}"
+        if data["experience"]:
+            data["experience"][0] = data["experience"][0].replace(description=edited)
+        else:
+            data["personal_info"]["summary"] = edited
+        return lambda: resume_render.render_resume(data)
+    return prepare
+
+
+def _setup_export_formats(resume_data, workdir):
+    """一次构建文档树，导出 HTML、Markdown、TXT 和 DOCX"""
+    from resume_export import export_all
+    return lambda: lambda: export_all(resume_data, ("html", "md", "txt", "docx"))
+
+
+STAGES = {stage.name: stage for stage in (
+    Stage("ensure_data_structure", False, _setup_ensure_data_structure),
+    Stage("save_resume", False, _setup_save_resume),
+    Stage("load_resume", False, _setup_load_resume),
+    Stage("preview", False, _setup_preview),
+    Stage("preview_incremental", False, _setup_preview_incremental),
+    Stage("export_formats", False, _setup_export_formats),
+    Stage("pdf", True, _setup_pdf),
+    Stage("pdf_reexport", True, _setup_pdf_reexport),
+)}
+
+
+# --- 计时与统计 ---
+
+def percentile(sorted_values, pct):
+    """最近秩百分位数（sorted_values 已升序）"""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _peak_memory(prepare):
+    """单独一次迭代中 Python 分配的峰值内存（字节）"""
+    op = prepare()
+    tracemalloc.start()
+    try:
+        op()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(prepare, repeat=5, warmup=1, max_seconds=30.0, memory=True):
+    """返回 (各次耗时秒数列表, 峰值内存字节或 None)
+
+    预热 warmup 次后最多计时 repeat 次；累计耗时超过 max_seconds 后停止，
+    但至少计时一次。
+    """
+    for _ in range(warmup):
+        prepare()()
+    timings = []
+    spent = 0.0
+    while len(timings) < repeat and (not timings or spent < max_seconds):
+        op = prepare()
+        start = time.perf_counter()
+        op()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        spent += elapsed
+    return timings, _peak_memory(prepare) if memory else None
+
+
+def summarize(stage, entries, timings, peak_memory):
+    ordered = sorted(timings)
+    mean = sum(ordered) / len(ordered)
+    return {
+        "stage": stage,
+        "entries": entries,
+        "iterations": len(ordered),
+        "mean_ms": mean * 1000,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "ops_per_sec": 1 / mean if mean else None,
+        "entries_per_sec": entries / mean if mean else None,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+# --- 环境与输出 ---
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _check_font(font):
+    """返回字体不可用的原因，可用时返回 None"""
+    import resume_render
+    try:
+        if font:
+            resume_render.CHINESE_FONT_PATH = font
+            resume_render.warm_fonts()
+        else:
+            resume_render.locate_font()
+    except Exception as e:
+        return f"无法加载中文字体 '{resume_render.CHINESE_FONT_PATH}': {str(e).splitlines()[0]}"
+    return None
+
+
+def _format_bytes(n):
+    if n is None:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f}{unit}"
+        n /= 1024
+    return f"{n:.1f}GB"
+
+
+def print_table(results, file=sys.stdout):
+    print(f"{'阶段':<22}{'条目':>7}{'次数':>5}{'p50(ms)':>11}{'p99(ms)':>11}{'条目/秒':>12}{'峰值内存':>10}",
+          file=file)
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['stage']:<22}{r['entries']:>7}  跳过: {r['skipped']}", file=file)
+            continue
+        print(f"{r['stage']:<22}{r['entries']:>7}{r['iterations']:>5}{r['p50_ms']:>11.2f}{r['p99_ms']:>11.2f}"
+              f"{r['entries_per_sec']:>12.0f}{_format_bytes(r['peak_memory_bytes']):>10}", file=file)
+
+
+def compare(results, baseline, threshold=None, file=sys.stdout):
+    """打印与基线相比的 p50 变化；返回超过 threshold 百分比的回退项列表"""
+    previous = {(r["stage"], r["entries"]): r for r in baseline["results"] if "skipped" not in r}
+    regressions = []
+    print(f"\n与基线 {baseline['meta'].get('git_revision') or ''} 比较 (p50):", file=file)
+    for r in results:
+        old = previous.get((r["stage"], r["entries"]))
+        if old is None or "skipped" in r or not old["p50_ms"]:
+            continue
+        change = (r["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100
+        flag = ""
+        if threshold is not None and change > threshold:
+            regressions.append((r["stage"], r["entries"], change))
+            flag = "  <-- 回退"
+        print(f"  {r['stage']:<22}{r['entries']:>7}{old['p50_ms']:>11.2f} -> {r['p50_ms']:>9.2f} ms"
+              f" ({change:+.1f}%){flag}", file=file)
+    return regressions
+
+
+def run(sizes=SIZES, stages=tuple(STAGES), seed=0, repeat=5, warmup=1, max_seconds=30.0, memory=True,
+        font=None, log=sys.stderr):
+    """运行基准测试，返回可直接写成 JSON 的结果字典"""
+    font_problem = _check_font(font) if any(STAGES[name].needs_font for name in stages) else None
+    results = []
+    with tempfile.TemporaryDirectory(prefix="resume_bench_") as workdir:
+        for size in sizes:
+            resume_data = generate_resume(size, seed)
+            entries = entry_count(resume_data)
+            for name in stages:
+                stage = STAGES[name]
+                if stage.needs_font and font_problem:
+                    results.append({"stage": name, "entries": entries, "skipped": font_problem})
+                    continue
+                print(f"  {name} @ {entries} ...", file=log, flush=True)
+                prepare = stage.setup(resume_data, workdir)
+                timings, peak = measure(prepare, repeat, warmup, max_seconds, memory)
+                results.append(summarize(name, entries, timings, peak))
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "warmup": warmup,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="在合成简历上测量导出、预览、保存/加载等阶段的性能")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="条目数（可多个）")
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=list(STAGES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="每个阶段的计时次数")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--max-seconds", type=float, default=30.0,
+                        help="每个阶段的计时预算，超出后不再重复（至少计时一次）")
+    parser.add_argument("--no-memory", action="store_true", help="不测量峰值内存")
+    parser.add_argument("--font", help="中文字体路径（默认使用配置的字体或自动发现的系统字体）")
+    parser.add_argument("--output", help="把结果写入 JSON 文件")
+    parser.add_argument("--compare", metavar="BASELINE", help="与之前的结果 JSON 比较")
+    parser.add_argument("--fail-above", type=float, metavar="PCT",
+                        help="与基线相比 p50 变慢超过 PCT%% 时返回非零退出码")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.stages, args.seed, args.repeat, args.warmup, args.max_seconds,
+                 not args.no_memory, args.font)
+    print_table(report["results"])
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入: {args.output}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report["results"], baseline, args.fail_above):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
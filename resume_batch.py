@@ -0,0 +1,232 @@
+"""批量导出：把一批简历 JSON 文件分发到进程池中并行渲染。
+
+每个工作进程启动时解析一次字体（warm_fonts）并编译模板，之后的每个任务
+只做读取、排版和序列化，结果先写入输出目录中的临时文件。输出文件名沿用
+图形界面的约定 ``<姓名>_简历.pdf``，重名时依次加 ``_2``、``_3``；姓名由工作
+进程读出，主进程按输入顺序确定文件名并改名，结果可复现。失败的任务（包括
+工作进程崩溃）最多重试 retries 次，无法读取的简历文件不重试::
+
+    report = export_batch(["a.json", "简历目录/"], "输出目录")
+    print(report.succeeded, report.files_per_second)
+
+命令行：``python -m resume_builder batch 简历目录/ -o 输出目录 --workers 8``
+"""
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from resume_schema import normalize_resume_data, safe_name
+
+# tmp_path: 工作进程写入的临时文件，完成后由主进程改名为正式的输出文件
+BatchJob = namedtuple("BatchJob", "index source tmp_path")
+# attempts: 实际执行的次数；seconds: 最后一次执行在工作进程中的耗时
+BatchResult = namedtuple("BatchResult", "source output ok error attempts seconds")
+BatchReport = namedtuple("BatchReport", "results seconds succeeded failed files_per_second")
+
+
+def collect_inputs(paths):
+    """展开输入：目录取其中的 *.json（按文件名排序），文件原样保留"""
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            sources.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                           if name.lower().endswith(".json"))
+        else:
+            sources.append(path)
+    return sources
+
+
+def output_filename(name, ext, taken):
+    """<姓名>_简历.<ext>，与 taken 中已有的文件名（不区分大小写）重复时加序号"""
+    base = f"{safe_name(name)}_简历"
+    filename, n = f"{base}.{ext}", 2
+    while filename.lower() in taken:
+        filename, n = f"{base}_{n}.{ext}", n + 1
+    taken.add(filename.lower())
+    return filename
+
+
+class InvalidResume(ValueError):
+    """简历文件无法读取或结构不对（重试也不会成功）"""
+
+
+def resume_name(resume_data):
+    """简历中的姓名（用于输出文件名）；结构不对时抛出 ValueError"""
+    personal = resume_data.get("personal_info") if isinstance(resume_data, dict) else None
+    if not isinstance(personal, dict) or "name" not in personal:
+        raise ValueError("缺少 personal_info.name")
+    name = personal["name"]
+    if name is not None and not isinstance(name, str):
+        raise ValueError(f"personal_info.name 应为字符串，实际为 {type(name).__name__}")
+    return name or ""
+
+
+def _describe(error):
+    return f"{type(error).__name__}: {error}" if not str(error) else str(error)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# --- 工作进程 ---
+_WORKER_TEMPLATE = None
+
+
+def _init_worker(font_path, template):
+    """工作进程启动时调用一次：设定字体并预先解析，编译模板"""
+    global _WORKER_TEMPLATE
+    from resume_templates import compile_template
+    if font_path: # 只有 PDF 需要 fpdf 和字体
+        import resume_render
+        resume_render.CHINESE_FONT_PATH = font_path
+        resume_render.warm_fonts()
+    _WORKER_TEMPLATE = compile_template(template)
+
+
+def _export_job(source, tmp_path, fmt):
+    """在工作进程中把一个文件导出到 tmp_path，返回 (姓名, 耗时秒数)"""
+    from resume_export import export_resume
+    start = time.perf_counter()
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            resume_data = json.load(f)
+        name = resume_name(resume_data)
+    except (OSError, ValueError) as e:
+        raise InvalidResume(f"无法读取简历文件: {_describe(e)}") from None
+    resume_data = normalize_resume_data(resume_data)
+    if fmt == "pdf":
+        from resume_render import render_result
+        with open(tmp_path, 'wb') as f:
+            render_result(resume_data, _WORKER_TEMPLATE, stream=f) # 直接写入文件，不经过 bytes
+    else:
+        data = export_resume(resume_data, fmt, _WORKER_TEMPLATE)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+    return name, time.perf_counter() - start
+
+
+def _prepare_font():
+    """在主进程中确定字体路径（只查找一次），工作进程直接使用"""
+    import resume_render
+    if not os.path.isfile(resume_render.CHINESE_FONT_PATH):
+        resume_render.locate_font()
+    return resume_render.CHINESE_FONT_PATH
+
+
+# --- 调度 ---
+def export_batch(sources, output_dir, template="default", fmt="pdf", workers=None, retries=2, progress=None,
+                 mp_context=None):
+    """并行导出 sources（文件或目录）到 output_dir，返回 BatchReport
+
+    workers 默认为 CPU 核数；progress(已完成, 总数) 在每个文件完成（或最终失败）
+    后调用。失败的任务在新一轮中重试；工作进程崩溃后进程池会被重建。
+    从带有线程的进程（如图形界面）调用时应传入 spawn 方式的 mp_context。
+    PDF 字体不可用时抛出 RenderError，不启动任何进程。
+    """
+    start = time.perf_counter()
+    jobs = [BatchJob(index, source, os.path.join(output_dir, f".batch-{os.getpid()}-{index}.tmp"))
+            for index, source in enumerate(collect_inputs(sources))]
+    results, taken = [], set()
+    done = 0
+    finished = {} # 输入序号 -> (姓名, 错误, 执行次数, 耗时)，等待按输入顺序命名
+
+    def commit(job, name, error, attempts, seconds):
+        """确定输出文件名并把临时文件改名（按输入顺序调用）"""
+        output = None
+        if error is None:
+            output = os.path.join(output_dir, output_filename(name, fmt, taken))
+            try:
+                os.replace(job.tmp_path, output)
+            except OSError as e:
+                error, output = f"无法写入输出文件: {_describe(e)}", None
+        if error is not None:
+            _remove(job.tmp_path)
+        results.append(BatchResult(job.source, output, error is None, error, attempts, seconds))
+
+    def finish(job, name, error, attempts, seconds):
+        """记录一个任务的最终结果；此前的任务都已完成时依次提交"""
+        nonlocal done
+        done += 1
+        finished[job.index] = (name, error, attempts, seconds)
+        while len(results) in finished:
+            commit(jobs[len(results)], *finished.pop(len(results)))
+        if progress is not None:
+            progress(done, len(jobs))
+
+    if jobs:
+        font_path = _prepare_font() if fmt == "pdf" else None
+        os.makedirs(output_dir, exist_ok=True)
+        workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+        attempts = dict.fromkeys(jobs, 0)
+        pending = jobs
+        while pending:
+            retry = []
+            # 每轮一个新的进程池：上一轮有进程崩溃时进程池已不可用
+            with ProcessPoolExecutor(min(workers, len(pending)), mp_context, _init_worker,
+                                     (font_path, template)) as pool:
+                futures = {pool.submit(_export_job, job.source, job.tmp_path, fmt): job for job in pending}
+                for future in as_completed(futures):
+                    job = futures[future]
+                    attempts[job] += 1
+                    try:
+                        name, seconds = future.result()
+                    except InvalidResume as e:
+                        finish(job, None, str(e), attempts[job], 0.0)
+                    except Exception as e:
+                        if attempts[job] <= retries:
+                            retry.append(job)
+                            continue
+                        finish(job, None, _describe(e), attempts[job], 0.0)
+                    else:
+                        finish(job, name, None, attempts[job], seconds)
+            pending = sorted(retry)
+    seconds = time.perf_counter() - start
+    succeeded = sum(result.ok for result in results)
+    return BatchReport(results, seconds, succeeded, len(results) - succeeded,
+                       succeeded / seconds if seconds else 0.0)
+
+
+def main(argv=None):
+    import argparse
+    from resume_export import EXPORT_FORMATS
+    from resume_templates import TEMPLATES
+    parser = argparse.ArgumentParser(prog="resume_builder.py batch", description="并行批量导出简历 JSON 文件")
+    parser.add_argument("inputs", nargs="+", help="简历 JSON 文件或包含它们的目录")
+    parser.add_argument("-o", "--output-dir", required=True, help="输出目录")
+    parser.add_argument("--format", default="pdf", choices=list(EXPORT_FORMATS))
+    parser.add_argument("--template", default="default", choices=sorted(TEMPLATES))
+    parser.add_argument("--workers", type=int, help="工作进程数（默认为 CPU 核数）")
+    parser.add_argument("--retries", type=int, default=2, help="失败后的重试次数")
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        print(f"\r已完成 {done}/{total}", end="", file=sys.stderr, flush=True)
+
+    render_errors = () # 只有 PDF 需要 fpdf 和字体
+    if args.format == "pdf":
+        from resume_render import RenderError
+        render_errors = RenderError
+    try:
+        report = export_batch(args.inputs, args.output_dir, args.template, args.format, args.workers,
+                              args.retries, progress)
+    except render_errors as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    for result in report.results:
+        if not result.ok:
+            print(f"失败: {result.source}: {result.error}", file=sys.stderr)
+    print(f"共 {len(report.results)} 个文件，成功 {report.succeeded}，失败 {report.failed}，"
+          f"用时 {report.seconds:.2f} 秒（{report.files_per_second:.1f} 文件/秒）")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,79 +1,255 @@
 import sys
+import time
+
+_START_TIME = time.perf_counter() # --profile-startup 从这里开始计时
+
+# 无界面子命令在导入 PyQt6 之前分发，服务器端渲染无需 Qt
+HEADLESS_COMMANDS = {"render": "resume_export", "batch": "resume_batch", "serve": "resume_server",
+                     "validate": "resume_validation", "import": "resume_import", "bench": "benchmarks.run"}
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in HEADLESS_COMMANDS:
+    import importlib
+    sys.exit(importlib.import_module(HEADLESS_COMMANDS[sys.argv[1]]).main(sys.argv[2:]))
+
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QLineEdit, QTextEdit, QPushButton, QComboBox,
-                             QListWidget, QListWidgetItem, QMessageBox, QFileDialog,
-                             QTabWidget, QGroupBox, QFormLayout)
-from PyQt6.QtCore import Qt
-from fpdf import FPDF
+                             QListView, QAbstractItemView, QListWidget, QListWidgetItem,
+                             QMessageBox, QFileDialog,
+                             QTabWidget, QGroupBox, QFormLayout, QDockWidget, QPlainTextEdit)
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QAction, QKeySequence, QTextCursor
 import json
 import os
+import threading
+
+import resume_trace
+from resume_history import EditHistory
+from resume_index import ResumeIndex
+from resume_journal import (ResumeJournal, discard_session, find_crashed_sessions,
+                            recover_session)
+from resume_library import ResumeLibrary
+from resume_models import EntryListModel
+from resume_pdf_cache import PDFCache
+from resume_preview import PREVIEW_SECTIONS, SECTION_OF_PERSONAL_FIELD, PreviewRenderer
+from resume_document import build_document
+from resume_export import format_of, export_document
+from resume_schema import (SECTION_KEYS, Education, Experience, Language, Project, Skill, empty_resume_data,
+                           json_default, normalize_resume_data, safe_name)
+from resume_templates import TEMPLATES, compile_template
+from resume_validation import VALIDATOR, format_report
+
+# fpdf 和 resume_render 在首次导出或后台字体检查时才导入，不在启动路径上
+_IMPORTS_DONE = time.perf_counter()
+
+
+class ExportSignals(QObject):
+    """导出任务的信号，在主线程中创建，槽函数因此在主线程执行"""
+    progress = pyqtSignal(int, int, str)  # 已完成阶段数, 总阶段数, 当前阶段
+    finished = pyqtSignal(str)            # 已写入的文件路径
+    failed = pyqtSignal(str)              # 错误信息
+    cancelled = pyqtSignal()
+
+
+# 导出对话框的文件类型 -> 格式
+EXPORT_FILTERS = {
+    "PDF 文件 (*.pdf)": "pdf",
+    "Word 文档 (*.docx)": "docx",
+    "网页 (*.html)": "html",
+    "Markdown (*.md)": "md",
+    "纯文本 (*.txt)": "txt",
+}
+
+
+class ExportWorker(QRunnable):
+    """在线程池中完成排版、序列化和写文件，不触碰任何界面控件
+
+    导出格式由文件扩展名决定（PDF、HTML、Markdown、TXT、DOCX）。document 为
+    主线程中构建的文档树（不可变，导出期间继续编辑不会影响它）。
+    """
+
+    def __init__(self, document, filepath, template="default", cache=None):
+        super().__init__()
+        self.document = document
+        self.filepath = filepath
+        self.template = template
+        self.cache = cache
+        self.signals = ExportSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        fmt = format_of(self.filepath) or "pdf"
+        cancelled_errors = render_errors = () # 其他格式不导入 fpdf 和字体，也没有取消和渲染错误要处理
+        try:
+            if fmt == "pdf":
+                from resume_render import RenderCancelled, RenderError
+                cancelled_errors, render_errors = RenderCancelled, RenderError
+            data = export_document(self.document, fmt, self.template,
+                                 progress=self.signals.progress.emit, is_cancelled=self._cancel_event.is_set,
+                                 cache=self.cache)
+            with open(self.filepath, 'wb') as f:
+                f.write(data)
+        except cancelled_errors:
+            self.signals.cancelled.emit()
+        except render_errors as e:
+            self.signals.failed.emit(str(e))
+        except Exception as e:
+            self.signals.failed.emit(f"导出时发生错误: {str(e)}\n请检查文件权限或路径。")
+        else:
+            self.signals.finished.emit(self.filepath)
+
+
+class FontCheckSignals(QObject):
+    found = pyqtSignal(str)   # 可用的字体路径
+    failed = pyqtSignal(str)  # 错误信息
 
-# --- 中文字体设置 ---
-CHINESE_FONT_PATH = 'C:/Windows/Fonts/simkai.ttf' # <--- 确认或修改路径
-CHINESE_FONT_NAME = 'chinese'
 
-class PDF(FPDF):
+class FontCheckWorker(QRunnable):
+    """窗口显示后在后台导入 fpdf、查找并解析中文字体，首次导出因此无需等待"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # 添加中文字体
+    def __init__(self):
+        super().__init__()
+        self.signals = FontCheckSignals()
+
+    def run(self):
         try:
-            self.add_font(CHINESE_FONT_NAME, '', CHINESE_FONT_PATH)
-            self.add_font(CHINESE_FONT_NAME, 'B', CHINESE_FONT_PATH) # 粗体
-            self.add_font(CHINESE_FONT_NAME, 'I', CHINESE_FONT_PATH) # 斜体
-            self.font_added = True
-            print(f"成功加载字体: {CHINESE_FONT_PATH}")
+            from resume_render import locate_font
+            path = locate_font()
         except Exception as e:
-            print(f"错误：无法加载字体文件 '{CHINESE_FONT_PATH}'. 请确保文件存在且路径正确。")
-            print(f"错误信息: {e}")
-            print("PDF中的中文将无法正常显示或样式不全。")
-            self.font_added = False
-
-    def header(self):
-        pass
-
-    def footer(self):
-        self.set_y(-15) # 距离底部1.5厘米
-        if self.font_added:
-            self.set_font(CHINESE_FONT_NAME, '', 8) # 页脚使用普通字体
+            self._emit("failed", str(e))
         else:
-            self.set_font('Arial', 'I', 8) # Fallback
-        self.set_text_color(128, 128, 128) # 灰色页脚
-        self.cell(0, 10, f'第 {self.page_no()} 页', 0, 0, 'C')
+            self._emit("found", path)
 
-    def set_chinese_font(self, style='', size=12):
-        """设置中文字体（如果已加载）"""
-        if self.font_added:
-            try:
-                self.set_font(CHINESE_FONT_NAME, style, size)
-            except RuntimeError:
-                 print(f"警告：字体 '{CHINESE_FONT_NAME}' 可能不支持样式 '{style}'，回退到常规样式。")
-                 self.set_font(CHINESE_FONT_NAME, '', size)
+    def _emit(self, signal, value):
+        try:
+            getattr(self.signals, signal).emit(value)
+        except RuntimeError:
+            pass # 检查完成前窗口已关闭，信号对象已被销毁
+
+
+class BatchExportSignals(QObject):
+    progress = pyqtSignal(int, int)   # 已完成, 总数
+    finished = pyqtSignal(object)     # BatchReport
+    failed = pyqtSignal(str)          # 错误信息
+
+
+class BatchExportWorker(QRunnable):
+    """在线程池中调度批量导出；渲染在 resume_batch 的进程池中进行
+
+    界面进程中有其他线程，工作进程用 spawn 方式启动（fork 可能复制持有的锁）。
+    """
+
+    def __init__(self, sources, output_dir, template="default"):
+        super().__init__()
+        self.sources = sources
+        self.output_dir = output_dir
+        self.template = template
+        self.signals = BatchExportSignals()
+
+    def run(self):
+        import multiprocessing
+        from resume_batch import export_batch
+        try:
+            report = export_batch(self.sources, self.output_dir, self.template,
+                                  progress=self.signals.progress.emit,
+                                  mp_context=multiprocessing.get_context("spawn"))
+        except Exception as e:
+            self.signals.failed.emit(str(e))
         else:
-            self.set_font('Arial', style, size) # Fallback
+            self.signals.finished.emit(report)
+
+
+class ImportSignals(QObject):
+    progress = pyqtSignal(int, int)   # 已读取, 已存入
+    finished = pyqtSignal(object)     # ImportStats
+    failed = pyqtSignal(str)          # 错误信息
 
-    def multi_cell_chinese(self, w, h, txt, border=0, align='J', fill=False):
-        """支持中文的 multi_cell"""
-        if self.font_added:
-            self.multi_cell(w, h, txt, border, align, fill)
+
+class ImportWorker(QRunnable):
+    """在线程池中把 CSV / JSON Lines 文件流式导入简历库
+
+    SQLite 连接不能跨线程使用，任务自己打开同一个库文件（WAL 模式下界面仍可读取）。
+    """
+
+    def __init__(self, filepath, library_path):
+        super().__init__()
+        self.filepath = filepath
+        self.library_path = library_path
+        self.signals = ImportSignals()
+
+    def run(self):
+        from resume_import import import_into_library, import_resumes
+        try:
+            with ResumeLibrary(self.library_path) as library:
+                stats = import_into_library(import_resumes(self.filepath), library,
+                                            progress=self.signals.progress.emit)
+        except Exception as e:
+            self.signals.failed.emit(f"导入时出错: {str(e)}")
         else:
-            print(f"警告: 中文字体未加载，尝试输出多行文本: {txt[:30]}...")
-            self.multi_cell(w, h, txt, border, align, fill)
+            self.signals.finished.emit(stats)
+
 
-    def cell_chinese(self, w, h=0, txt="", border=0, ln=0, align="", fill=False, link=""):
-         """支持中文的 cell"""
-         if self.font_added:
-             self.cell(w, h, txt, border, ln, align, fill, link)
-         else:
-            print(f"警告: 中文字体未加载，尝试输出单元格文本: {txt[:30]}...")
-            self.cell(w, h, txt, border, ln, align, fill, link)
+def _qt_length(text):
+    """文本在 QTextDocument 中占用的位置数（按 UTF-16 计）"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+class LivePreview(QPlainTextEdit):
+    """只读预览面板：每次更新只替换内容发生变化的片段"""
+
+    def __init__(self):
+        super().__init__()
+        self.setReadOnly(True)
+        self.setStyleSheet("QPlainTextEdit{ font-size: 13px; }")
+        self._fragments = [] # [(片段, 长度)]
+
+    def show_fragments(self, fragments):
+        if len(fragments) != len(self._fragments):
+            self.setPlainText("".join(fragments))
+            self._fragments = [(f, _qt_length(f)) for f in fragments]
+            return
+        cursor = QTextCursor(self.document())
+        cursor.beginEditBlock()
+        position = 0
+        for i, ((old, old_length), new) in enumerate(zip(self._fragments, fragments)):
+            if old is not new and old != new:
+                new_length = _qt_length(new)
+                cursor.setPosition(position)
+                cursor.setPosition(position + old_length, QTextCursor.MoveMode.KeepAnchor)
+                cursor.insertText(new)
+                self._fragments[i] = (new, new_length)
+                position += new_length
+            else:
+                position += old_length
+        cursor.endEditBlock()
 
 
 class ResumeApp(QMainWindow):
+    font_ready = pyqtSignal(bool) # 后台字体检查完成（是否可用）
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("简历生成器")
-        self.setGeometry(100, 100, 900, 700)
+        self.setGeometry(100, 100, 1300, 700)
+
+        # 正在后台运行的导出任务
+        self.export_worker = None
+        self.import_worker = None
+        self.batch_export_worker = None
+        # 已导出 PDF 的磁盘缓存：内容和模板未变时再次导出直接复制
+        self.pdf_cache = PDFCache()
+        # 后台字体检查任务及其耗时（秒）
+        self.font_check_worker = None
+        self.font_check_seconds = None
+
+        # 简历库（首次使用时打开）及当前简历在库中的 id
+        self.library = None
+        self.library_id = None
+        self.library_search_timer = QTimer(self)
+        self.library_search_timer.setSingleShot(True)
+        self.library_search_timer.setInterval(150)
+        self.library_search_timer.timeout.connect(self.search_library)
 
         # --- 跟踪当前正在编辑的条目索引 ---
         self.editing_index = {
@@ -84,22 +260,78 @@ class ResumeApp(QMainWindow):
             "languages": None
         }
 
+        # 实时预览：编辑后延迟刷新，只重新生成改动过的部分
+        self.preview_renderer = PreviewRenderer()
+        self.preview_dirty = set()
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(250)
+        self.preview_timer.timeout.connect(self.refresh_preview)
+
+        # 自动保存：条目修改立即写入日志，个人信息在输入停顿后写入
+        self.journal = None
+        self.pending_personal_fields = set()
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(1000)
+        self.autosave_timer.timeout.connect(self.commit_personal_edits)
+
+        # 撤销/重做：每一步保存修改记录及其逆操作
+        self.history = EditHistory()
+        self.applying_change = False # 正在执行撤销/重做或编辑时，不重复记录历史
+        self.committed_personal = {} # 最近一次提交到历史的个人信息
+
         # 简历数据结构
         self.reset_resume_data()
 
+        # 已构建的标签页；个人信息表单构建前为空字典
+        self.built_tabs = set()
+        self.personal_edits = {}
+
+        # 各条目列表的模型，直接以 resume_data 为数据源；模型的每次修改同时
+        # 更新派生索引（技能分组、时间顺序、名称查找），预览和导出直接读取
+        self.resume_index = ResumeIndex(self.resume_data)
+        self.entry_models = {}
+        for section in SECTION_KEYS:
+            model = EntryListModel(section, self.resume_data, self, self.resume_index)
+            for signal in (model.rowsInserted, model.rowsRemoved, model.rowsMoved,
+                           model.dataChanged, model.modelReset, model.layoutChanged):
+                signal.connect(lambda *_, section=section: self.schedule_preview(section))
+            model.entryMoved.connect(lambda src, dst, section=section: self.on_entry_moved(section, src, dst))
+            model.entriesReordered.connect(lambda order, section=section: self.on_entries_reordered(section, order))
+            model.rowsInserted.connect(lambda _, first, last, section=section:
+                                       self.on_entries_inserted(section, first, last))
+            model.dataChanged.connect(lambda top_left, bottom_right, *_, section=section:
+                                      self.on_entries_changed(section, top_left.row(), bottom_right.row()))
+            model.rowsRemoved.connect(lambda _, first, last, section=section:
+                                      self.on_entries_removed(section, first, last))
+            self.entry_models[section] = model
+        self.education_model = self.entry_models["education"]
+        self.experience_model = self.entry_models["experience"]
+        self.projects_model = self.entry_models["projects"]
+        self.skills_model = self.entry_models["skills"]
+        self.languages_model = self.entry_models["languages"]
+
         # 初始化UI
         self.init_ui()
 
+        self.start_autosave()
+        QTimer.singleShot(0, self.start_font_check) # 窗口显示后再检查字体
+
+    # 标签页：(键, 标题, 构建方法名)，按显示顺序
+    TAB_BUILDERS = (
+        ("personal", "个人信息", "create_personal_info_tab"),
+        ("education", "教育经历", "create_education_tab"),
+        ("experience", "工作经历", "create_experience_tab"),
+        ("projects", "项目经历", "create_projects_tab"),
+        ("skills", "技能", "create_skills_tab"),
+        ("languages", "语言能力", "create_languages_tab"),
+    )
+
     def reset_resume_data(self):
         """重置简历数据结构"""
-        self.resume_data = {
-            "personal_info": {
-                "name": "", "email": "", "phone": "", "address": "",
-                "linkedin": "", "github": "", "summary": ""
-            },
-            "education": [], "experience": [], "projects": [],
-            "skills": [], "languages": []
-        }
+        self.resume_data = empty_resume_data()
+        self.library_id = None
         # 重置编辑状态
         for key in self.editing_index:
             self.editing_index[key] = None
@@ -114,26 +346,17 @@ class ResumeApp(QMainWindow):
         central_widget.setLayout(main_layout)
 
         # 左侧表单区域 (使用QTabWidget组织不同部分)
+        # 各标签页先放一个空容器，第一次切换到时才构建表单和列表；
+        # 条目数据由列表模型持有，未构建的标签页不影响数据、预览和撤销
         self.tabs = QTabWidget()
-
-        # --- 创建各个标签页 ---
-        personal_tab = self.create_personal_info_tab()
-        self.tabs.addTab(personal_tab, "个人信息")
-
-        education_tab = self.create_education_tab()
-        self.tabs.addTab(education_tab, "教育经历")
-
-        experience_tab = self.create_experience_tab()
-        self.tabs.addTab(experience_tab, "工作经历")
-
-        projects_tab = self.create_projects_tab()
-        self.tabs.addTab(projects_tab, "项目经历")
-
-        skills_tab = self.create_skills_tab()
-        self.tabs.addTab(skills_tab, "技能")
-
-        languages_tab = self.create_languages_tab()
-        self.tabs.addTab(languages_tab, "语言能力")
+        for key, title, _ in self.TAB_BUILDERS:
+            page = QWidget()
+            page_layout = QVBoxLayout()
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            page.setLayout(page_layout)
+            self.tabs.addTab(page, title)
+        self.tabs.currentChanged.connect(self.ensure_tab)
+        self.ensure_tab(self.tabs.currentIndex())
 
         # --- 右侧控制按钮区域 ---
         control_widget = QWidget()
@@ -167,9 +390,28 @@ class ResumeApp(QMainWindow):
         preview_btn.clicked.connect(self.preview_resume)
         control_layout.addWidget(preview_btn)
 
-        export_btn = create_styled_button("导出PDF", "2196F3", "1e88e5", "1976d2")
-        export_btn.clicked.connect(self.export_to_pdf)
-        control_layout.addWidget(export_btn)
+        template_layout = QHBoxLayout()
+        template_layout.addWidget(QLabel("模板:"))
+        self.template_combo = QComboBox()
+        self.template_combo.addItems(sorted(TEMPLATES))
+        self.template_combo.setCurrentText("default")
+        self.template_combo.currentTextChanged.connect(self.on_template_changed)
+        template_layout.addWidget(self.template_combo, stretch=1)
+        control_layout.addLayout(template_layout)
+
+        self.export_btn = create_styled_button("导出PDF", "2196F3", "1e88e5", "1976d2")
+        self.export_btn.clicked.connect(self.export_to_pdf)
+        control_layout.addWidget(self.export_btn)
+
+        self.cancel_export_btn = QPushButton("取消导出")
+        self.cancel_export_btn.clicked.connect(self.cancel_export)
+        self.cancel_export_btn.setVisible(False) # 仅在导出进行中显示
+        control_layout.addWidget(self.cancel_export_btn)
+
+        self.batch_export_btn = QPushButton("批量导出...")
+        self.batch_export_btn.setToolTip("选择多个简历 JSON 文件，并行导出到一个目录（<姓名>_简历.pdf）")
+        self.batch_export_btn.clicked.connect(self.batch_export)
+        control_layout.addWidget(self.batch_export_btn)
 
         save_btn = create_styled_button("保存简历", "FF9800", "fb8c00", "f57c00")
         save_btn.clicked.connect(self.save_resume)
@@ -179,6 +421,35 @@ class ResumeApp(QMainWindow):
         load_btn.clicked.connect(self.load_resume)
         control_layout.addWidget(load_btn)
 
+        undo_layout = QHBoxLayout()
+        self.undo_btn = QPushButton("撤销")
+        self.undo_btn.clicked.connect(self.undo)
+        self.redo_btn = QPushButton("重做")
+        self.redo_btn.clicked.connect(self.redo)
+        undo_layout.addWidget(self.undo_btn)
+        undo_layout.addWidget(self.redo_btn)
+        control_layout.addLayout(undo_layout)
+        self.update_undo_buttons()
+
+        # 输入框以外的位置使用 Ctrl+Z / Ctrl+Y（输入框内仍是其自身的撤销）
+        undo_action = QAction("撤销", self)
+        undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        undo_action.triggered.connect(self.undo)
+        redo_action = QAction("重做", self)
+        redo_action.setShortcut(QKeySequence.StandardKey.Redo)
+        redo_action.triggered.connect(self.redo)
+        self.addActions([undo_action, redo_action])
+
+        # Ctrl+Shift+T 开始/停止记录性能追踪（停止时保存为 Chrome trace 文件）
+        trace_action = QAction("性能追踪", self)
+        trace_action.setShortcut(QKeySequence("Ctrl+Shift+T"))
+        trace_action.triggered.connect(self.toggle_tracing)
+        self.addAction(trace_action)
+
+        library_btn = create_styled_button("简历库", "607D8B", "546e7a", "455a64")
+        library_btn.clicked.connect(self.show_library)
+        control_layout.addWidget(library_btn)
+
         clear_btn = create_styled_button("清空所有", "F44336", "e53935", "d32f2f")
         clear_btn.clicked.connect(self.clear_all)
         control_layout.addWidget(clear_btn)
@@ -195,6 +466,64 @@ class ResumeApp(QMainWindow):
         main_layout.addWidget(self.tabs, stretch=4) # 左侧占更大比例
         main_layout.addWidget(control_widget, stretch=1) # 右侧占较小比例
 
+        # --- 停靠的实时预览面板 ---
+        self.preview_view = LivePreview()
+        self.preview_dock = QDockWidget("简历预览", self)
+        self.preview_dock.setWidget(self.preview_view)
+        self.preview_dock.visibilityChanged.connect(self.on_preview_visibility_changed)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.preview_dock)
+        self.schedule_preview(*PREVIEW_SECTIONS)
+
+        # --- 简历库面板（默认隐藏） ---
+        self.library_dock = QDockWidget("简历库", self)
+        self.library_dock.setWidget(self.create_library_panel())
+        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.library_dock)
+        self.library_dock.hide()
+
+    def create_library_panel(self):
+        panel = QWidget()
+        layout = QVBoxLayout()
+        panel.setLayout(layout)
+
+        self.library_search_edit = QLineEdit()
+        self.library_search_edit.setPlaceholderText("搜索姓名、简介、经历描述...")
+        self.library_search_edit.textChanged.connect(self.library_search_timer.start)
+        layout.addWidget(self.library_search_edit)
+
+        self.library_results = QListWidget()
+        self.library_results.setWordWrap(True)
+        self.library_results.itemDoubleClicked.connect(self.open_library_resume)
+        layout.addWidget(self.library_results, stretch=1)
+
+        btn_layout = QHBoxLayout()
+        open_btn = QPushButton("打开")
+        open_btn.clicked.connect(lambda: self.open_library_resume(self.library_results.currentItem()))
+        store_btn = QPushButton("存入简历库")
+        store_btn.clicked.connect(self.save_to_library)
+        del_btn = QPushButton("删除")
+        del_btn.clicked.connect(self.delete_library_resume)
+        self.import_btn = QPushButton("批量导入")
+        self.import_btn.setToolTip("从 CSV / JSON Lines 文件导入多份简历（列名即字段名，如 name、education.0.school）")
+        self.import_btn.clicked.connect(self.import_to_library)
+        btn_layout.addWidget(open_btn)
+        btn_layout.addWidget(store_btn)
+        btn_layout.addWidget(del_btn)
+        btn_layout.addWidget(self.import_btn)
+        layout.addLayout(btn_layout)
+
+        return panel
+
+    def ensure_tab(self, index):
+        """构建第 index 个标签页的内容（已构建时什么也不做），返回其键"""
+        key, _, builder = self.TAB_BUILDERS[index]
+        if key not in self.built_tabs:
+            self.built_tabs.add(key)
+            self.tabs.widget(index).layout().addWidget(getattr(self, builder)())
+        return key
+
+    def tab_built(self, key):
+        return key in self.built_tabs
+
     def create_personal_info_tab(self):
 
         tab = QWidget()
@@ -245,54 +574,258 @@ class ResumeApp(QMainWindow):
 
         layout.addStretch()
 
+        # 个人信息改动后刷新对应的预览片段
+        self.personal_edits = {
+            "name": self.name_edit, "email": self.email_edit, "phone": self.phone_edit,
+            "address": self.address_edit, "linkedin": self.linkedin_edit,
+            "github": self.github_edit, "summary": self.summary_edit,
+        }
+        self.fill_personal_edits()
+        for field, edit in self.personal_edits.items():
+            edit.textChanged.connect(lambda *_, field=field: self.on_personal_field_changed(field))
+
         return tab
 
-    # --- 更新列表显示的方法 ---
-    def update_education_list(self):
-        self.education_list.clear()
-        for i, edu in enumerate(self.resume_data["education"]):
-            degree_str = f" ({edu['degree']})" if edu.get('degree') else ""
-            item_text = f"{edu.get('school','N/A')} - {edu.get('major','N/A')}{degree_str} [{edu.get('start_year','?')}-{edu.get('end_year','?')}]"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, i) # 存储原始索引
-            self.education_list.addItem(item)
-
-    def update_experience_list(self):
-        self.experience_list.clear()
-        for i, exp in enumerate(self.resume_data["experience"]):
-            item_text = f"{exp.get('company','N/A')} - {exp.get('position','N/A')} [{exp.get('start_date','?')} 至 {exp.get('end_date','?')}]"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, i)
-            self.experience_list.addItem(item)
-
-    def update_projects_list(self):
-        self.projects_list.clear()
-        for i, project in enumerate(self.resume_data["projects"]):
-            date_str = f" ({project['date']})" if project.get('date') else ""
-            item_text = f"{project.get('name','N/A')}{date_str} - {project.get('role','N/A')}"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, i)
-            self.projects_list.addItem(item)
-
-    def update_skills_list(self):
-        self.skills_list.clear()
-        # 为了编辑功能，这里使用简单列表显示，并存储原始索引
-        for i, skill in enumerate(self.resume_data["skills"]):
-             level_str = f" ({skill['level']})" if skill.get('level') and skill['level'] != '未指定' else ""
-             type_str = f" [{skill.get('type', '未分类')}]" # 显示类别以便区分
-             item_text = f"{skill.get('name','N/A')}{level_str}{type_str}"
-             item = QListWidgetItem(item_text)
-             item.setData(Qt.ItemDataRole.UserRole, i) # 存储原始索引
-             self.skills_list.addItem(item)
-
-    def update_languages_list(self):
-        self.languages_list.clear()
-        for i, language in enumerate(self.resume_data["languages"]):
-            level_str = f" ({language['level']})" if language.get('level') and language['level'] != '未指定' else ""
-            item_text = f"{language.get('name','N/A')}{level_str}"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, i)
-            self.languages_list.addItem(item)
+    def create_entry_list_view(self, model):
+        """创建显示条目模型的列表视图（可拖动排序）"""
+        view = QListView()
+        view.setModel(model)
+        view.setStyleSheet("QListView::item { padding: 3px; }")
+        view.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        view.setDefaultDropAction(Qt.DropAction.MoveAction)
+        return view
+
+    def on_entry_moved(self, section, source_row, target_row):
+        """拖动排序后记录日志和撤销历史，并修正正在编辑的条目索引"""
+        record = {"op": "move", "section": section, "from": source_row, "to": target_row}
+        self.record_change(record)
+        if not self.applying_change:
+            self.history.push(record, {"op": "move", "section": section, "from": target_row, "to": source_row})
+            self.update_undo_buttons()
+        index = self.editing_index[section]
+        if index is None:
+            return
+        if index == source_row:
+            self.editing_index[section] = target_row
+        elif source_row < index <= target_row:
+            self.editing_index[section] = index - 1
+        elif target_row <= index < source_row:
+            self.editing_index[section] = index + 1
+
+    def on_entries_reordered(self, section, order):
+        """整体重新排序后记录日志，并修正正在编辑的条目索引（撤销历史由 edit 记录）"""
+        self.record_change({"op": "reorder", "section": section, "order": order})
+        index = self.editing_index[section]
+        if index is not None:
+            self.editing_index[section] = order.index(index)
+
+    def sort_entries_by_date(self, section):
+        """按时间排序条目（结束时间最近的在前，其次是开始时间），可撤销"""
+        order = self.resume_index.chronological_rows(section)
+        if order != list(range(len(order))):
+            self.edit({"op": "reorder", "section": section, "order": order})
+        self.status_label.setText("已按时间排序")
+
+    def on_personal_field_changed(self, field):
+        self.schedule_preview(SECTION_OF_PERSONAL_FIELD[field])
+        self.pending_personal_fields.add(field)
+        self.autosave_timer.start()
+
+    # --- 中文字体 ---
+    def start_font_check(self):
+        self.font_check_started = time.perf_counter()
+        worker = FontCheckWorker()
+        worker.signals.found.connect(self.on_font_found)
+        worker.signals.failed.connect(self.on_font_missing)
+        self.font_check_worker = worker # 保持信号对象存活到任务结束
+        QThreadPool.globalInstance().start(worker)
+
+    def on_font_found(self, path):
+        self.font_check_worker = None
+        self.font_check_seconds = time.perf_counter() - self.font_check_started
+        self.font_ready.emit(True)
+        if self.status_label.text() == "就绪":
+            self.status_label.setText(f"就绪（中文字体: {os.path.basename(path)}）")
+
+    def on_font_missing(self, message):
+        """字体不可用：非模态提示，不阻塞编辑（PDF 以外的格式仍可导出）"""
+        self.font_check_worker = None
+        self.font_check_seconds = time.perf_counter() - self.font_check_started
+        self.font_ready.emit(False)
+        self.status_label.setText("未找到中文字体，PDF 导出不可用")
+        msg = QMessageBox(QMessageBox.Icon.Warning, "字体文件缺失",
+                          f"警告：{message}\n\n请在 resume_fonts.py 中配置正确路径，或设置环境变量 RESUME_FONT。",
+                          QMessageBox.StandardButton.Ok, self)
+        msg.setModal(False)
+        msg.show()
+
+    # --- 自动保存 ---
+    def start_autosave(self):
+        """创建本次会话的自动保存日志，并在窗口显示后检查是否需要恢复"""
+        try:
+            self.journal = ResumeJournal()
+            self.autosave_snapshot()
+        except OSError as e:
+            self.report_autosave_error("无法启用自动保存", e)
+            self.journal = None
+        QTimer.singleShot(0, self.offer_recovery)
+
+    def report_autosave_error(self, message, error):
+        """自动保存出错时不打断编辑：在状态栏提示，并记录追踪事件"""
+        resume_trace.instant("autosave_error", "autosave", message=message, error=str(error))
+        self.status_label.setText(f"{message}: {error}")
+
+    def record_change(self, record):
+        """追加一条修改记录，累计足够多时压缩为快照"""
+        if self.journal is None:
+            return
+        try:
+            self.journal.append(record)
+            if self.journal.needs_compaction:
+                self.autosave_snapshot()
+        except OSError as e:
+            self.report_autosave_error("自动保存失败，已停用", e)
+            self.journal = None
+
+    def autosave_snapshot(self):
+        """把当前完整数据写成快照（加载、清空或日志累计较长时）"""
+        if self.journal is None:
+            return
+        self.update_resume_data()
+        self.pending_personal_fields.clear()
+        self.journal.compact(self.resume_data)
+
+    def commit_personal_edits(self):
+        """提交输入停顿前改动过的个人信息字段：写入日志，并作为一步加入撤销历史"""
+        if not self.pending_personal_fields:
+            return
+        self.update_resume_data()
+        fields, self.pending_personal_fields = self.pending_personal_fields, set()
+        for field in sorted(fields):
+            record = {"op": "personal", "field": field, "value": self.resume_data["personal_info"][field]}
+            self.record_change(record)
+            old_value = self.committed_personal.get(field, "")
+            if record["value"] != old_value:
+                self.committed_personal[field] = record["value"]
+                self.history.push(record, {"op": "personal", "field": field, "value": old_value})
+        self.update_undo_buttons()
+
+    def on_entries_inserted(self, section, first, last):
+        for index in range(first, last + 1):
+            self.record_change({"op": "insert", "section": section, "index": index,
+                                "entry": self.resume_data[section][index]})
+
+    def on_entries_changed(self, section, first, last):
+        for index in range(first, last + 1):
+            self.record_change({"op": "update", "section": section, "index": index,
+                                "entry": self.resume_data[section][index]})
+
+    def on_entries_removed(self, section, first, last):
+        for index in range(last, first - 1, -1):
+            self.record_change({"op": "delete", "section": section, "index": index})
+
+    # --- 编辑操作与撤销/重做 ---
+    def edit(self, record):
+        """执行一次修改并加入撤销历史，返回其逆操作"""
+        inverse = self.apply_change(record)
+        self.history.push(record, inverse)
+        self.update_undo_buttons()
+        return inverse
+
+    def apply_change(self, record):
+        """执行一条修改记录（通过列表模型，以便界面、预览和日志同步更新），返回其逆操作"""
+        op = record["op"]
+        self.applying_change = True
+        try:
+            if op == "personal":
+                field, value = record["field"], record["value"]
+                inverse = {"op": "personal", "field": field, "value": self.committed_personal.get(field, "")}
+                self.committed_personal[field] = value
+                edit = self.personal_edits.get(field)
+                if edit is None: # 个人信息页尚未构建，直接修改数据
+                    self.resume_data["personal_info"][field] = value
+                elif isinstance(edit, QTextEdit): edit.setPlainText(value)
+                else: edit.setText(value)
+                self.update_resume_data()
+                return inverse
+            if op == "replace":
+                self.update_resume_data()
+                inverse = {"op": "replace", "resume_data": self.resume_data}
+                self.resume_data = record["resume_data"]
+                self.update_ui_from_data(); self.clear_all_edit_states()
+                return inverse
+            section = record["section"]
+            model = self.entry_models[section]
+            if op == "insert":
+                model.insert_entry(record["index"], record["entry"])
+                return {"op": "delete", "section": section, "index": record["index"]}
+            if op == "update":
+                inverse = {"op": "update", "section": section, "index": record["index"],
+                           "entry": self.resume_data[section][record["index"]]}
+                model.replace_entry(record["index"], record["entry"])
+                return inverse
+            if op == "delete":
+                removed = model.remove_entry(record["index"])
+                return {"op": "insert", "section": section, "index": record["index"], "entry": removed}
+            if op == "move":
+                model.move_entry(record["from"], record["to"])
+                return {"op": "move", "section": section, "from": record["to"], "to": record["from"]}
+            if op == "reorder":
+                inverse_order = [0] * len(record["order"])
+                for new_row, old_row in enumerate(record["order"]):
+                    inverse_order[old_row] = new_row
+                model.reorder_entries(record["order"])
+                return {"op": "reorder", "section": section, "order": inverse_order}
+            raise ValueError(f"未知的修改类型: {op}")
+        finally:
+            self.applying_change = False
+
+    def undo(self):
+        self.commit_personal_edits() # 先提交正在输入的内容，使其也能被撤销
+        record = self.history.undo()
+        if record is not None:
+            self.clear_all_edit_states()
+            self.apply_change(record)
+            self.status_label.setText("已撤销")
+        self.update_undo_buttons()
+
+    def redo(self):
+        self.commit_personal_edits()
+        record = self.history.redo()
+        if record is not None:
+            self.clear_all_edit_states()
+            self.apply_change(record)
+            self.status_label.setText("已重做")
+        self.update_undo_buttons()
+
+    def update_undo_buttons(self):
+        self.undo_btn.setEnabled(self.history.can_undo)
+        self.redo_btn.setEnabled(self.history.can_redo)
+
+    def offer_recovery(self):
+        """发现上次异常退出留下的自动保存数据时，询问是否恢复"""
+        try:
+            sessions = find_crashed_sessions()
+            recovered = recover_session(sessions[0]) if sessions else None
+        except Exception as e:
+            self.report_autosave_error("读取自动保存数据失败", e)
+            return
+        if recovered is not None:
+            reply = QMessageBox.question(self, '恢复简历', '检测到上次未正常退出，是否恢复自动保存的内容？',
+                                       QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.Yes)
+            if reply == QMessageBox.StandardButton.Yes:
+                self.resume_data = normalize_resume_data(recovered)
+                self.update_ui_from_data(); self.clear_all_edit_states()
+                self.status_label.setText("已恢复自动保存的内容")
+        for session_dir in sessions:
+            discard_session(session_dir)
+
+    def closeEvent(self, event):
+        """正常退出时删除本次会话的自动保存数据"""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        super().closeEvent(event)
 
     def create_education_tab(self):
         tab = QWidget()
@@ -301,10 +834,8 @@ class ResumeApp(QMainWindow):
 
         list_group = QGroupBox("已添加的教育经历 (单击条目进行编辑)") # 提示用户可以点击
         list_layout = QVBoxLayout()
-        self.education_list = QListWidget()
-        self.education_list.setStyleSheet("QListWidget::item { padding: 3px; }")
-        # --- 修改：连接 itemClicked 信号 ---
-        self.education_list.itemClicked.connect(self.load_education_for_edit)
+        self.education_list = self.create_entry_list_view(self.education_model)
+        self.education_list.clicked.connect(self.load_education_for_edit)
         list_layout.addWidget(self.education_list)
         list_group.setLayout(list_layout)
         layout.addWidget(list_group, stretch=1)
@@ -340,6 +871,8 @@ class ResumeApp(QMainWindow):
         self.add_edu_btn.clicked.connect(self.save_education_entry)
         del_edu_btn = QPushButton("删除选中")
         del_edu_btn.clicked.connect(self.delete_education)
+        sort_edu_btn = QPushButton("按时间排序")
+        sort_edu_btn.clicked.connect(lambda: self.sort_entries_by_date("education"))
 
         self.cancel_edit_edu_btn = QPushButton("取消编辑")
         self.cancel_edit_edu_btn.clicked.connect(self.clear_education_form) # 清空表单即取消编辑
@@ -347,6 +880,7 @@ class ResumeApp(QMainWindow):
 
         btn_layout.addWidget(self.add_edu_btn)
         btn_layout.addWidget(del_edu_btn)
+        btn_layout.addWidget(sort_edu_btn)
         btn_layout.addWidget(self.cancel_edit_edu_btn) # 添加到布局
         btn_layout.addStretch()
 
@@ -363,9 +897,8 @@ class ResumeApp(QMainWindow):
 
         list_group = QGroupBox("已添加的工作经历 (单击条目进行编辑)")
         list_layout = QVBoxLayout()
-        self.experience_list = QListWidget()
-        self.experience_list.setStyleSheet("QListWidget::item { padding: 3px; }")
-        self.experience_list.itemClicked.connect(self.load_experience_for_edit) # 连接信号
+        self.experience_list = self.create_entry_list_view(self.experience_model)
+        self.experience_list.clicked.connect(self.load_experience_for_edit)
         list_layout.addWidget(self.experience_list)
         list_group.setLayout(list_layout)
         layout.addWidget(list_group, stretch=1)
@@ -394,12 +927,15 @@ class ResumeApp(QMainWindow):
         self.add_exp_btn.clicked.connect(self.save_experience_entry) # 连接到保存函数
         del_exp_btn = QPushButton("删除选中")
         del_exp_btn.clicked.connect(self.delete_experience)
+        sort_exp_btn = QPushButton("按时间排序")
+        sort_exp_btn.clicked.connect(lambda: self.sort_entries_by_date("experience"))
         self.cancel_edit_exp_btn = QPushButton("取消编辑")
         self.cancel_edit_exp_btn.clicked.connect(self.clear_experience_form)
         self.cancel_edit_exp_btn.setVisible(False)
 
         btn_layout.addWidget(self.add_exp_btn)
         btn_layout.addWidget(del_exp_btn)
+        btn_layout.addWidget(sort_exp_btn)
         btn_layout.addWidget(self.cancel_edit_exp_btn)
         btn_layout.addStretch()
 
@@ -416,9 +952,8 @@ class ResumeApp(QMainWindow):
 
         list_group = QGroupBox("已添加的项目 (单击条目进行编辑)")
         list_layout = QVBoxLayout()
-        self.projects_list = QListWidget()
-        self.projects_list.setStyleSheet("QListWidget::item { padding: 3px; }")
-        self.projects_list.itemClicked.connect(self.load_project_for_edit) # 连接信号
+        self.projects_list = self.create_entry_list_view(self.projects_model)
+        self.projects_list.clicked.connect(self.load_project_for_edit)
         list_layout.addWidget(self.projects_list)
         list_group.setLayout(list_layout)
         layout.addWidget(list_group, stretch=1)
@@ -448,12 +983,15 @@ class ResumeApp(QMainWindow):
         self.add_project_btn.clicked.connect(self.save_project_entry) # 连接到保存函数
         del_project_btn = QPushButton("删除选中")
         del_project_btn.clicked.connect(self.delete_project)
+        sort_project_btn = QPushButton("按时间排序")
+        sort_project_btn.clicked.connect(lambda: self.sort_entries_by_date("projects"))
         self.cancel_edit_proj_btn = QPushButton("取消编辑")
         self.cancel_edit_proj_btn.clicked.connect(self.clear_project_form)
         self.cancel_edit_proj_btn.setVisible(False)
 
         btn_layout.addWidget(self.add_project_btn)
         btn_layout.addWidget(del_project_btn)
+        btn_layout.addWidget(sort_project_btn)
         btn_layout.addWidget(self.cancel_edit_proj_btn)
         btn_layout.addStretch()
 
@@ -470,9 +1008,8 @@ class ResumeApp(QMainWindow):
 
         list_group = QGroupBox("已添加的技能 (单击条目进行编辑)")
         list_layout = QVBoxLayout()
-        self.skills_list = QListWidget()
-        self.skills_list.setStyleSheet("QListWidget::item { padding: 3px; }")
-        self.skills_list.itemClicked.connect(self.load_skill_for_edit) # 连接信号
+        self.skills_list = self.create_entry_list_view(self.skills_model)
+        self.skills_list.clicked.connect(self.load_skill_for_edit)
         list_layout.addWidget(self.skills_list)
         list_group.setLayout(list_layout)
         layout.addWidget(list_group, stretch=1)
@@ -521,9 +1058,8 @@ class ResumeApp(QMainWindow):
 
         list_group = QGroupBox("已添加的语言能力 (单击条目进行编辑)")
         list_layout = QVBoxLayout()
-        self.languages_list = QListWidget()
-        self.languages_list.setStyleSheet("QListWidget::item { padding: 3px; }")
-        self.languages_list.itemClicked.connect(self.load_language_for_edit) # 连接信号
+        self.languages_list = self.create_entry_list_view(self.languages_model)
+        self.languages_list.clicked.connect(self.load_language_for_edit)
         list_layout.addWidget(self.languages_list)
         list_group.setLayout(list_layout)
         layout.addWidget(list_group, stretch=1)
@@ -563,7 +1099,9 @@ class ResumeApp(QMainWindow):
         return tab
 
     def update_resume_data(self):
-        # ... (不变) ...
+        """从个人信息表单读取数据（表单尚未构建时 resume_data 本身就是最新的）"""
+        if not self.personal_edits:
+            return
         self.resume_data["personal_info"] = {
             "name": self.name_edit.text().strip(),
             "email": self.email_edit.text().strip(),
@@ -575,31 +1113,38 @@ class ResumeApp(QMainWindow):
         }
 
     def validate_personal_info(self):
-        # ... (不变) ...
-        info = self.resume_data["personal_info"]
-        if not info["name"] or not info["email"] or not info["phone"]:
+        if VALIDATOR.validate_personal(self.resume_data["personal_info"]):
             QMessageBox.warning(self, "信息不完整", "请确保“个人信息”标签页中的姓名、邮箱和电话已填写！")
             self.tabs.setCurrentIndex(0) # 切换到个人信息标签页
             return False
         return True
 
+    def validate_entry(self, section, entry):
+        """按共享的校验规则检查表单中的条目，一次列出所有问题"""
+        errors = VALIDATOR.validate_entry(section, entry)
+        if not errors:
+            return True
+        title = "警告" if any(e.code == "required" for e in errors) else "格式错误"
+        QMessageBox.warning(self, title, "\n".join(e.message for e in errors))
+        return False
+
     # --- 新增：加载条目到表单的函数 ---
     def load_education_for_edit(self, item):
         index = item.data(Qt.ItemDataRole.UserRole)
         if 0 <= index < len(self.resume_data["education"]):
             data = self.resume_data["education"][index]
-            self.school_edit.setText(data.get("school", ""))
-            self.major_edit.setText(data.get("major", ""))
-            self.degree_combo.setCurrentText(data.get("degree", ""))
-            self.start_year_edit.setText(data.get("start_year", ""))
-            self.end_year_edit.setText(data.get("end_year", ""))
-            self.gpa_edit.setText(data.get("gpa", ""))
-            self.edu_desc_edit.setPlainText(data.get("description", ""))
+            self.school_edit.setText(data.school)
+            self.major_edit.setText(data.major)
+            self.degree_combo.setCurrentText(data.degree)
+            self.start_year_edit.setText(data.start_year)
+            self.end_year_edit.setText(data.end_year)
+            self.gpa_edit.setText(data.gpa)
+            self.edu_desc_edit.setPlainText(data.description)
 
             self.editing_index["education"] = index
             self.add_edu_btn.setText("更新") # 更改按钮文本
             self.cancel_edit_edu_btn.setVisible(True) # 显示取消按钮
-            self.status_label.setText(f"正在编辑教育经历: {data.get('school','')}")
+            self.status_label.setText(f"正在编辑教育经历: {data.school}")
         else:
             print(f"Error loading education: Invalid index {index}")
             self.clear_education_form() # 如果索引无效，清空表单
@@ -608,16 +1153,16 @@ class ResumeApp(QMainWindow):
         index = item.data(Qt.ItemDataRole.UserRole)
         if 0 <= index < len(self.resume_data["experience"]):
             data = self.resume_data["experience"][index]
-            self.company_edit.setText(data.get("company", ""))
-            self.position_edit.setText(data.get("position", ""))
-            self.exp_start_edit.setText(data.get("start_date", ""))
-            self.exp_end_edit.setText(data.get("end_date", ""))
-            self.exp_desc_edit.setPlainText(data.get("description", ""))
+            self.company_edit.setText(data.company)
+            self.position_edit.setText(data.position)
+            self.exp_start_edit.setText(data.start_date)
+            self.exp_end_edit.setText(data.end_date)
+            self.exp_desc_edit.setPlainText(data.description)
 
             self.editing_index["experience"] = index
             self.add_exp_btn.setText("更新")
             self.cancel_edit_exp_btn.setVisible(True)
-            self.status_label.setText(f"正在编辑工作经历: {data.get('company','')}")
+            self.status_label.setText(f"正在编辑工作经历: {data.company}")
         else:
             print(f"Error loading experience: Invalid index {index}")
             self.clear_experience_form()
@@ -626,16 +1171,16 @@ class ResumeApp(QMainWindow):
         index = item.data(Qt.ItemDataRole.UserRole)
         if 0 <= index < len(self.resume_data["projects"]):
             data = self.resume_data["projects"][index]
-            self.project_name_edit.setText(data.get("name", ""))
-            self.project_role_edit.setText(data.get("role", ""))
-            self.project_date_edit.setText(data.get("date", ""))
-            self.project_desc_edit.setPlainText(data.get("description", ""))
-            self.project_link_edit.setText(data.get("link", ""))
+            self.project_name_edit.setText(data.name)
+            self.project_role_edit.setText(data.role)
+            self.project_date_edit.setText(data.date)
+            self.project_desc_edit.setPlainText(data.description)
+            self.project_link_edit.setText(data.link)
 
             self.editing_index["projects"] = index
             self.add_project_btn.setText("更新")
             self.cancel_edit_proj_btn.setVisible(True)
-            self.status_label.setText(f"正在编辑项目: {data.get('name','')}")
+            self.status_label.setText(f"正在编辑项目: {data.name}")
         else:
             print(f"Error loading project: Invalid index {index}")
             self.clear_project_form()
@@ -644,20 +1189,20 @@ class ResumeApp(QMainWindow):
         index = item.data(Qt.ItemDataRole.UserRole)
         if 0 <= index < len(self.resume_data["skills"]):
             data = self.resume_data["skills"][index]
-            self.skill_name_edit.setText(data.get("name", ""))
+            self.skill_name_edit.setText(data.name)
 
-            type_index = self.skill_type_combo.findText(data.get("type", ""), Qt.MatchFlag.MatchFixedString)
+            type_index = self.skill_type_combo.findText(data.type, Qt.MatchFlag.MatchFixedString)
             if type_index >= 0: self.skill_type_combo.setCurrentIndex(type_index)
             else: self.skill_type_combo.setCurrentIndex(0)
 
-            level_index = self.skill_level_combo.findText(data.get("level", ""), Qt.MatchFlag.MatchFixedString)
+            level_index = self.skill_level_combo.findText(data.level, Qt.MatchFlag.MatchFixedString)
             if level_index >= 0: self.skill_level_combo.setCurrentIndex(level_index)
             else: self.skill_level_combo.setCurrentIndex(0)
 
             self.editing_index["skills"] = index
             self.add_skill_btn.setText("更新")
             self.cancel_edit_skill_btn.setVisible(True)
-            self.status_label.setText(f"正在编辑技能: {data.get('name','')}")
+            self.status_label.setText(f"正在编辑技能: {data.name}")
         else:
             print(f"Error loading skill: Invalid index {index}")
             self.clear_skill_form()
@@ -666,16 +1211,16 @@ class ResumeApp(QMainWindow):
         index = item.data(Qt.ItemDataRole.UserRole)
         if 0 <= index < len(self.resume_data["languages"]):
             data = self.resume_data["languages"][index]
-            self.language_name_edit.setText(data.get("name", ""))
+            self.language_name_edit.setText(data.name)
 
-            level_index = self.language_level_combo.findText(data.get("level", ""), Qt.MatchFlag.MatchFixedString)
+            level_index = self.language_level_combo.findText(data.level, Qt.MatchFlag.MatchFixedString)
             if level_index >= 0: self.language_level_combo.setCurrentIndex(level_index)
             else: self.language_level_combo.setCurrentIndex(0)
 
             self.editing_index["languages"] = index
             self.add_language_btn.setText("更新")
             self.cancel_edit_lang_btn.setVisible(True)
-            self.status_label.setText(f"正在编辑语言: {data.get('name','')}")
+            self.status_label.setText(f"正在编辑语言: {data.name}")
         else:
             print(f"Error loading language: Invalid index {index}")
             self.clear_language_form()
@@ -690,33 +1235,25 @@ class ResumeApp(QMainWindow):
         gpa = self.gpa_edit.text().strip()
         description = self.edu_desc_edit.toPlainText().strip()
 
-        if not all([school, major, start_year, end_year]):
-            QMessageBox.warning(self, "警告", "请填写教育经历中带*号的必填字段！")
+        edu_item = Education(
+            school=school, major=major, degree=degree,
+            start_year=start_year, end_year=end_year,
+            gpa=gpa, description=description
+        )
+        if not self.validate_entry("education", edu_item):
             return
-        if not (start_year.isdigit() and len(start_year) == 4) or \
-           not ((end_year.isdigit() and len(end_year) == 4) or end_year.lower() == '至今'):
-             QMessageBox.warning(self, "格式错误", "年份请输入4位数字 (例如 2020) 或 '至今'")
-             return
-
-        edu_item = {
-            "school": school, "major": major, "degree": degree,
-            "start_year": start_year, "end_year": end_year,
-            "gpa": gpa, "description": description
-        }
 
         edit_index = self.editing_index["education"]
         if edit_index is not None: # 更新模式
             if 0 <= edit_index < len(self.resume_data["education"]):
-                self.resume_data["education"][edit_index] = edu_item
-                self.update_education_list()
+                self.edit({"op": "update", "section": "education", "index": edit_index, "entry": edu_item})
                 self.clear_education_form() # 清空表单并重置编辑状态
                 self.status_label.setText(f"已更新教育经历: {school}")
             else:
                 QMessageBox.warning(self, "错误", f"更新教育经历时出错：无效的索引 {edit_index}")
                 self.clear_education_form() # 重置状态
         else: # 添加模式
-            self.resume_data["education"].append(edu_item)
-            self.update_education_list()
+            self.edit({"op": "insert", "section": "education", "index": len(self.resume_data["education"]), "entry": edu_item})
             self.clear_education_form()
             self.status_label.setText(f"已添加教育经历: {school}")
 
@@ -727,32 +1264,24 @@ class ResumeApp(QMainWindow):
         end_date = self.exp_end_edit.text().strip()
         description = self.exp_desc_edit.toPlainText().strip()
 
-        if not all([company, position, start_date, end_date, description]):
-            QMessageBox.warning(self, "警告", "请填写工作经历中带*号的必填字段！")
+        exp_item = Experience(
+            company=company, position=position, start_date=start_date,
+            end_date=end_date, description=description
+        )
+        if not self.validate_entry("experience", exp_item):
             return
-        date_pattern_ok = lambda d: len(d) == 7 and d[4] == '-' and d[:4].isdigit() and d[5:].isdigit()
-        if not date_pattern_ok(start_date) or not (date_pattern_ok(end_date) or end_date.lower() == '至今'):
-             QMessageBox.warning(self, "格式错误", "时间请输入 YYYY-MM 格式 (例如 2022-08) 或 '至今'")
-             return
-
-        exp_item = {
-            "company": company, "position": position, "start_date": start_date,
-            "end_date": end_date, "description": description
-        }
 
         edit_index = self.editing_index["experience"]
         if edit_index is not None: # 更新模式
              if 0 <= edit_index < len(self.resume_data["experience"]):
-                self.resume_data["experience"][edit_index] = exp_item
-                self.update_experience_list()
+                self.edit({"op": "update", "section": "experience", "index": edit_index, "entry": exp_item})
                 self.clear_experience_form()
                 self.status_label.setText(f"已更新工作经历: {company}")
              else:
                 QMessageBox.warning(self, "错误", f"更新工作经历时出错：无效的索引 {edit_index}")
                 self.clear_experience_form()
         else: # 添加模式
-            self.resume_data["experience"].append(exp_item)
-            self.update_experience_list()
+            self.edit({"op": "insert", "section": "experience", "index": len(self.resume_data["experience"]), "entry": exp_item})
             self.clear_experience_form()
             self.status_label.setText(f"已添加工作经历: {company}")
 
@@ -763,28 +1292,24 @@ class ResumeApp(QMainWindow):
         description = self.project_desc_edit.toPlainText().strip()
         link = self.project_link_edit.text().strip()
 
-        if not all([name, role, description]):
-            QMessageBox.warning(self, "警告", "请填写项目中带*号的必填字段！")
+        project_item = Project(
+            name=name, role=role, date=date,
+            description=description, link=link
+        )
+        if not self.validate_entry("projects", project_item):
             return
 
-        project_item = {
-            "name": name, "role": role, "date": date,
-            "description": description, "link": link
-        }
-
         edit_index = self.editing_index["projects"]
         if edit_index is not None: # 更新模式
              if 0 <= edit_index < len(self.resume_data["projects"]):
-                self.resume_data["projects"][edit_index] = project_item
-                self.update_projects_list()
+                self.edit({"op": "update", "section": "projects", "index": edit_index, "entry": project_item})
                 self.clear_project_form()
                 self.status_label.setText(f"已更新项目: {name}")
              else:
                 QMessageBox.warning(self, "错误", f"更新项目时出错：无效的索引 {edit_index}")
                 self.clear_project_form()
         else: # 添加模式
-            self.resume_data["projects"].append(project_item)
-            self.update_projects_list()
+            self.edit({"op": "insert", "section": "projects", "index": len(self.resume_data["projects"]), "entry": project_item})
             self.clear_project_form()
             self.status_label.setText(f"已添加项目: {name}")
 
@@ -793,60 +1318,57 @@ class ResumeApp(QMainWindow):
         skill_type = self.skill_type_combo.currentText()
         level = self.skill_level_combo.currentText()
 
-        if not name:
-            QMessageBox.warning(self, "警告", "请输入技能名称！")
+        skill_item = Skill(
+            name=name,
+            type=skill_type if skill_type else "未分类",
+            level=level if level else "未指定"
+        )
+        if not self.validate_entry("skills", skill_item):
             return
 
-        skill_item = {
-            "name": name,
-            "type": skill_type if skill_type else "未分类",
-            "level": level if level else "未指定"
-        }
-
         edit_index = self.editing_index["skills"]
         if edit_index is not None: # 更新模式
             if 0 <= edit_index < len(self.resume_data["skills"]):
-                self.resume_data["skills"][edit_index] = skill_item
-                self.update_skills_list()
+                self.edit({"op": "update", "section": "skills", "index": edit_index, "entry": skill_item})
                 self.clear_skill_form()
                 self.status_label.setText(f"已更新技能: {name}")
             else:
                 QMessageBox.warning(self, "错误", f"更新技能时出错：无效的索引 {edit_index}")
                 self.clear_skill_form()
         else: # 添加模式
-            self.resume_data["skills"].append(skill_item)
-            self.update_skills_list()
+            duplicate = bool(self.resume_index.find("skills", name))
+            self.edit({"op": "insert", "section": "skills", "index": len(self.resume_data["skills"]), "entry": skill_item})
             self.clear_skill_form()
-            self.status_label.setText(f"已添加技能: {name}")
+            self.status_label.setText(f"已添加技能: {name}" + ("（列表中已有同名技能）" if duplicate else ""))
 
     def save_language_entry(self):
         name = self.language_name_edit.text().strip()
         level = self.language_level_combo.currentText()
 
-        if not name:
-            QMessageBox.warning(self, "警告", "请输入语言名称！")
+        language_item = Language(name=name, level=level if level else "未指定")
+        if not self.validate_entry("languages", language_item):
             return
 
-        language_item = { "name": name, "level": level if level else "未指定" }
-
         edit_index = self.editing_index["languages"]
         if edit_index is not None: # 更新模式
             if 0 <= edit_index < len(self.resume_data["languages"]):
-                self.resume_data["languages"][edit_index] = language_item
-                self.update_languages_list()
+                self.edit({"op": "update", "section": "languages", "index": edit_index, "entry": language_item})
                 self.clear_language_form()
                 self.status_label.setText(f"已更新语言: {name}")
             else:
                 QMessageBox.warning(self, "错误", f"更新语言时出错：无效的索引 {edit_index}")
                 self.clear_language_form()
         else: # 添加模式
-            self.resume_data["languages"].append(language_item)
-            self.update_languages_list()
+            duplicate = bool(self.resume_index.find("languages", name))
+            self.edit({"op": "insert", "section": "languages", "index": len(self.resume_data["languages"]), "entry": language_item})
             self.clear_language_form()
-            self.status_label.setText(f"已添加语言: {name}")
+            self.status_label.setText(f"已添加语言: {name}" + ("（列表中已有同名语言）" if duplicate else ""))
 
     # --- 修改：清空表单函数重置编辑状态 ---
     def clear_education_form(self):
+        if not self.tab_built("education"): # 未构建的标签页没有表单，也不可能处于编辑状态
+            self.editing_index["education"] = None
+            return
         self.school_edit.clear()
         self.major_edit.clear()
         self.degree_combo.setCurrentIndex(0)
@@ -860,6 +1382,9 @@ class ResumeApp(QMainWindow):
         self.cancel_edit_edu_btn.setVisible(False)
 
     def clear_experience_form(self):
+        if not self.tab_built("experience"): # 未构建的标签页没有表单，也不可能处于编辑状态
+            self.editing_index["experience"] = None
+            return
         self.company_edit.clear()
         self.position_edit.clear()
         self.exp_start_edit.clear()
@@ -871,6 +1396,9 @@ class ResumeApp(QMainWindow):
         self.cancel_edit_exp_btn.setVisible(False)
 
     def clear_project_form(self):
+        if not self.tab_built("projects"): # 未构建的标签页没有表单，也不可能处于编辑状态
+            self.editing_index["projects"] = None
+            return
         self.project_name_edit.clear()
         self.project_role_edit.clear()
         self.project_date_edit.clear()
@@ -882,6 +1410,9 @@ class ResumeApp(QMainWindow):
         self.cancel_edit_proj_btn.setVisible(False)
 
     def clear_skill_form(self):
+        if not self.tab_built("skills"): # 未构建的标签页没有表单，也不可能处于编辑状态
+            self.editing_index["skills"] = None
+            return
         self.skill_name_edit.clear()
         self.skill_type_combo.setCurrentIndex(0)
         self.skill_level_combo.setCurrentIndex(0)
@@ -891,6 +1422,9 @@ class ResumeApp(QMainWindow):
         self.cancel_edit_skill_btn.setVisible(False)
 
     def clear_language_form(self):
+        if not self.tab_built("languages"): # 未构建的标签页没有表单，也不可能处于编辑状态
+            self.editing_index["languages"] = None
+            return
         self.language_name_edit.clear()
         self.language_level_combo.setCurrentIndex(0)
         # 重置编辑状态
@@ -900,72 +1434,66 @@ class ResumeApp(QMainWindow):
 
 
     def delete_education(self):
-        selected_item = self.education_list.currentItem()
-        if selected_item:
+        selected_item = self.education_list.currentIndex()
+        if selected_item.isValid():
             index_to_remove = selected_item.data(Qt.ItemDataRole.UserRole)
             if 0 <= index_to_remove < len(self.resume_data["education"]):
                 # 如果删除的是正在编辑的条目，先清空表单
                 if self.editing_index["education"] == index_to_remove:
                     self.clear_education_form()
 
-                removed = self.resume_data["education"].pop(index_to_remove)
-                # 删除后需要更新所有后续条目的索引
-                self.update_education_list()
+                removed = self.edit({"op": "delete", "section": "education", "index": index_to_remove})["entry"]
                 # 如果删除了正在编辑的项之前的项，需要调整编辑索引
                 if self.editing_index["education"] is not None and index_to_remove < self.editing_index["education"]:
                     self.editing_index["education"] -= 1
-                self.status_label.setText(f"已删除教育经历: {removed['school']}")
+                self.status_label.setText(f"已删除教育经历: {removed.school}")
         else:
             QMessageBox.information(self, "提示", "请先在列表中选择要删除的教育经历。")
 
     def delete_experience(self):
-        selected_item = self.experience_list.currentItem()
-        if selected_item:
+        selected_item = self.experience_list.currentIndex()
+        if selected_item.isValid():
             index_to_remove = selected_item.data(Qt.ItemDataRole.UserRole)
             if 0 <= index_to_remove < len(self.resume_data["experience"]):
                 if self.editing_index["experience"] == index_to_remove:
                     self.clear_experience_form()
-                removed = self.resume_data["experience"].pop(index_to_remove)
-                self.update_experience_list()
+                removed = self.edit({"op": "delete", "section": "experience", "index": index_to_remove})["entry"]
                 if self.editing_index["experience"] is not None and index_to_remove < self.editing_index["experience"]:
                     self.editing_index["experience"] -= 1
-                self.status_label.setText(f"已删除工作经历: {removed['company']}")
+                self.status_label.setText(f"已删除工作经历: {removed.company}")
         else:
             QMessageBox.information(self, "提示", "请先在列表中选择要删除的工作经历。")
 
     def delete_project(self):
-        selected_item = self.projects_list.currentItem()
-        if selected_item:
+        selected_item = self.projects_list.currentIndex()
+        if selected_item.isValid():
             index_to_remove = selected_item.data(Qt.ItemDataRole.UserRole)
             if 0 <= index_to_remove < len(self.resume_data["projects"]):
                 if self.editing_index["projects"] == index_to_remove:
                     self.clear_project_form()
-                removed = self.resume_data["projects"].pop(index_to_remove)
-                self.update_projects_list()
+                removed = self.edit({"op": "delete", "section": "projects", "index": index_to_remove})["entry"]
                 if self.editing_index["projects"] is not None and index_to_remove < self.editing_index["projects"]:
                     self.editing_index["projects"] -= 1
-                self.status_label.setText(f"已删除项目: {removed['name']}")
+                self.status_label.setText(f"已删除项目: {removed.name}")
         else:
             QMessageBox.information(self, "提示", "请先在列表中选择要删除的项目。")
 
     def delete_skill(self):
-        selected_item = self.skills_list.currentItem()
-        if selected_item:
+        selected_item = self.skills_list.currentIndex()
+        if selected_item.isValid():
             index_to_remove = selected_item.data(Qt.ItemDataRole.UserRole)
             if index_to_remove is not None:
                 if 0 <= index_to_remove < len(self.resume_data["skills"]):
                     if self.editing_index["skills"] == index_to_remove:
                         self.clear_skill_form()
-                    removed = self.resume_data["skills"].pop(index_to_remove)
-                    # 因为技能列表更新会重新生成所有项，所以索引会自动正确
-                    self.update_skills_list()
+                    removed = self.edit({"op": "delete", "section": "skills", "index": index_to_remove})["entry"]
                      # 如果删除了正在编辑的项之前的项，需要调整编辑索引
                     if self.editing_index["skills"] is not None and index_to_remove < self.editing_index["skills"]:
-                         self.editing_index["skills"] -= 1 # 虽然列表重建了，但如果还想继续编辑之前的下一项，索引需要调整
+                         self.editing_index["skills"] -= 1 # 如果还想继续编辑之前的下一项，索引需要调整
 
                          self.clear_skill_form() # 删除后最好取消编辑状态
 
-                    self.status_label.setText(f"已删除技能: {removed['name']}")
+                    self.status_label.setText(f"已删除技能: {removed.name}")
                 else:
                      print(f"Error: Invalid index {index_to_remove} for skill deletion.")
             else:
@@ -975,324 +1503,174 @@ class ResumeApp(QMainWindow):
 
 
     def delete_language(self):
-        selected_item = self.languages_list.currentItem()
-        if selected_item:
+        selected_item = self.languages_list.currentIndex()
+        if selected_item.isValid():
             index_to_remove = selected_item.data(Qt.ItemDataRole.UserRole)
             if 0 <= index_to_remove < len(self.resume_data["languages"]):
                 if self.editing_index["languages"] == index_to_remove:
                     self.clear_language_form()
-                removed = self.resume_data["languages"].pop(index_to_remove)
-                self.update_languages_list()
+                removed = self.edit({"op": "delete", "section": "languages", "index": index_to_remove})["entry"]
                 if self.editing_index["languages"] is not None and index_to_remove < self.editing_index["languages"]:
                     self.editing_index["languages"] -= 1
-                self.status_label.setText(f"已删除语言: {removed['name']}")
+                self.status_label.setText(f"已删除语言: {removed.name}")
         else:
             QMessageBox.information(self, "提示", "请先在列表中选择要删除的语言能力。")
 
 
 
     def preview_resume(self):
-        """在消息框中预览简历文本"""
-        self.update_resume_data() # 更新个人信息等
-        if not self.validate_personal_info():
-             return
+        """显示实时预览面板并立即刷新"""
+        self.preview_dock.show()
+        self.preview_dock.raise_()
+        self.refresh_preview()
+
+    def schedule_preview(self, *sections):
+        """记录改动的预览部分，并在输入停顿后刷新"""
+        self.preview_dirty.update(sections)
+        self.preview_timer.start()
+
+    def on_preview_visibility_changed(self, visible):
+        if visible:
+            self.refresh_preview()
+
+    def refresh_preview(self):
+        """根据改动过的部分增量刷新预览（面板隐藏时推迟到再次显示）"""
+        self.preview_timer.stop()
+        if not self.preview_dock.isVisible():
+            return
+        self.update_resume_data()
+        fragments = self.preview_renderer.render_fragments(self.resume_data, self.preview_dirty, self.resume_index)
+        self.preview_dirty = set()
+        self.preview_view.show_fragments(fragments)
 
-        preview_text = "=========== 简历预览 ===========\n\n"
-        personal = self.resume_data["personal_info"]
-        preview_text += f"姓名: {personal['name']}\n"
-        contact = [f"电话: {personal['phone']}", f"邮箱: {personal['email']}"]
-        if personal['address']: contact.append(f"地址: {personal['address']}")
-        preview_text += " | ".join(contact) + "\n"
-        links = []
-        if personal["linkedin"]: links.append(f"LinkedIn: {personal['linkedin']}")
-        if personal["github"]: links.append(f"GitHub: {personal['github']}")
-        if links: preview_text += " | ".join(links) + "\n"
-
-        if personal["summary"]:
-            preview_text += f"\n--- 个人简介 ---\n{personal['summary']}\n"
-
-        if self.resume_data["education"]:
-            preview_text += "\n--- 教育经历 ---\n"
-            for edu in self.resume_data["education"]:
-                degree = f", {edu['degree']}" if edu['degree'] else ""
-                gpa = f", GPA: {edu['gpa']}" if edu['gpa'] else ""
-                preview_text += f"- {edu['school']}, {edu['major']}{degree} ({edu['start_year']} - {edu['end_year']}){gpa}\n"
-                if edu["description"]:
-                    lines = edu['description'].split('\n')
-                    for i, line in enumerate(lines):
-                        line = line.strip()  # 去除行首尾空格
-                        if line:  # 只处理非空行
-                            preview_text += f"  • {line}\n"  # 每行都加项目符号和缩进
-        else: preview_text += "\n--- 教育经历 ---\n (未添加)\n"
-
-        if self.resume_data["experience"]:
-            preview_text += "\n--- 工作经历 ---\n"
-            for exp in self.resume_data["experience"]:
-                preview_text += f"- {exp['company']} | {exp['position']} ({exp['start_date']} 至 {exp['end_date']})\n"
-                for line in exp['description'].split('\n'):
-                    if line.strip(): preview_text += f"  • {line.strip()}\n"
-        else: preview_text += "\n--- 工作经历 ---\n (未添加)\n"
-
-        if self.resume_data["projects"]:
-            preview_text += "\n--- 项目经历 ---\n"
-            for proj in self.resume_data["projects"]:
-                date = f" ({proj['date']})" if proj['date'] else ""
-                preview_text += f"- {proj['name']}{date} | 角色: {proj['role']}\n"
-                if proj["description"]:
-                    lines = proj['description'].split('\n')
-                    for line in lines:
-                        if line.strip():
-                            preview_text += f"  {line}\n"
-                if proj["link"]: preview_text += f"  链接: {proj['link']}\n"
-        else: preview_text += "\n--- 项目经历 ---\n (未添加)\n"
-
-        if self.resume_data["skills"]:
-            preview_text += "\n--- 技能 ---\n"
-            skills_by_type = {}
-            for skill in self.resume_data["skills"]:
-                stype = skill.get("type", "未分类")
-                level = f" ({skill['level']})" if skill['level'] != '未指定' else ""
-                if stype not in skills_by_type: skills_by_type[stype] = []
-                skills_by_type[stype].append(f"{skill['name']}{level}")
-            for stype in sorted(skills_by_type.keys()):
-                preview_text += f"- {stype}: {', '.join(skills_by_type[stype])}\n"
-        else: preview_text += "\n--- 技能 ---\n (未添加)\n"
-
-        if self.resume_data["languages"]:
-            preview_text += "\n--- 语言能力 ---\n"
-            langs = [f"{lang['name']} ({lang['level']})" if lang['level'] != '未指定' else lang['name']
-                     for lang in self.resume_data["languages"]]
-            preview_text += "- " + " | ".join(langs) + "\n"
-        else: preview_text += "\n--- 语言能力 ---\n (未添加)\n"
-
-        msgBox = QMessageBox(self)
-        msgBox.setWindowTitle("简历预览")
-        msgBox.setTextFormat(Qt.TextFormat.PlainText)
-        msgBox.setText(preview_text)
-        msgBox.setStyleSheet("QTextEdit{ min-width: 600px; min-height: 500px; font-size: 13px; }")
-        msgBox.exec()
-        self.status_label.setText("简历预览已生成")
-
-    def add_section_title(self, pdf, title, line_height):
-        """辅助函数：添加带样式的章节标题"""
-        COLOR_PRIMARY = (41, 128, 185) # 主题蓝
-        COLOR_LINE = (200, 200, 200)  # 浅灰线条
-
-        pdf.ln(6)
-        pdf.set_chinese_font('B', 14)
-        pdf.set_text_color(*COLOR_PRIMARY)
-        pdf.cell_chinese(0, line_height + 2, title.upper(), 0, 1, 'L')
-        pdf.set_draw_color(*COLOR_PRIMARY)
-        pdf.set_line_width(0.5)
-        pdf.cell(w=0, h=0.1, border='T', ln=1)
-        pdf.set_line_width(0.2)
-        pdf.set_text_color(51, 51, 51)
-        pdf.ln(4)
-        pdf.set_chinese_font(size=10.5)
+    def on_template_changed(self, template):
+        """切换模板：预览改用新模板的部分顺序，下次导出使用新模板"""
+        self.preview_renderer = PreviewRenderer(template)
+        self.schedule_preview(*PREVIEW_SECTIONS)
 
     def export_to_pdf(self):
-        """导出简历为PDF文件"""
+        """导出简历为PDF或其他格式（排版和写文件在后台线程中进行）"""
+        if self.export_worker is not None:
+            return
         self.update_resume_data()
         if not self.validate_personal_info():
             return
 
-        COLOR_PRIMARY = (41, 128, 185);
-        COLOR_TEXT = (51, 51, 51)
-        COLOR_LIGHT_TEXT = (100, 100, 100);
-        COLOR_LINK = (41, 128, 185)
-        COLOR_LINE = (220, 220, 220)
-
-        pdf = PDF()
-        if not pdf.font_added:
-            QMessageBox.critical(self, "错误", f"无法加载中文字体 '{CHINESE_FONT_PATH}'. PDF导出失败。")
+        default_filename = f"{safe_name(self.resume_data['personal_info']['name'])}_简历.pdf"  # 文件名加后缀
+        filepath, selected_filter = QFileDialog.getSaveFileName(self, "导出简历", default_filename,
+                                                                ";;".join(EXPORT_FILTERS))
+        if not filepath:
+            self.status_label.setText("导出已取消"); return
+        if format_of(filepath) is None: # 未写扩展名时按所选的文件类型补上
+            filepath += "." + EXPORT_FILTERS.get(selected_filter, "pdf")
+
+        # 文档树是不可变的快照，导出期间继续编辑不会影响本次结果；技能分组直接取自索引
+        template = self.template_combo.currentText()
+        document = build_document(self.resume_data, compile_template(template).sections, self.resume_index)
+        worker = ExportWorker(document, filepath, template, self.pdf_cache)
+        worker.signals.progress.connect(self.on_export_progress)
+        worker.signals.finished.connect(self.on_export_finished)
+        worker.signals.failed.connect(self.on_export_failed)
+        worker.signals.cancelled.connect(self.on_export_cancelled)
+        self.export_worker = worker
+        self.export_btn.setEnabled(False)
+        self.cancel_export_btn.setVisible(True)
+        self.status_label.setText("正在导出...")
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel_export(self):
+        """请求取消正在进行的导出（在当前部分完成后生效）"""
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+            self.status_label.setText("正在取消导出...")
+
+    def on_export_progress(self, done, total, stage):
+        self.status_label.setText(f"正在导出: {stage} ({done + 1}/{total})")
+
+    def on_export_finished(self, filepath):
+        self.finish_export()
+        QMessageBox.information(self, "导出成功", f"简历已成功导出为:\n{filepath}")
+        self.status_label.setText(f"简历已导出")
+
+    def on_export_failed(self, message):
+        self.finish_export()
+        QMessageBox.critical(self, "导出失败", message)
+        self.status_label.setText("导出PDF时出错")
+
+    def on_export_cancelled(self):
+        self.finish_export()
+        self.status_label.setText("导出已取消")
+
+    def finish_export(self):
+        """恢复导出按钮状态"""
+        self.export_worker = None
+        self.export_btn.setEnabled(True)
+        self.cancel_export_btn.setVisible(False)
+
+    def batch_export(self):
+        """选择多个简历 JSON 文件和输出目录，在后台并行导出 PDF"""
+        sources, _ = QFileDialog.getOpenFileNames(self, "选择要批量导出的简历", "", "JSON 文件 (*.json)")
+        if not sources:
             return
-        pdf.add_page();
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.set_margins(15, 15, 15);
-        pdf.set_text_color(*COLOR_TEXT)
-        line_height = 5.5
-
-        available_width = pdf.w - pdf.l_margin - pdf.r_margin
-
-        # --- 个人信息 (页眉区域) ---
-
-        personal = self.resume_data["personal_info"]
-        pdf.set_chinese_font('B', 22);
-        pdf.set_text_color(*COLOR_PRIMARY)
-        pdf.cell_chinese(0, line_height + 8, personal["name"], 0, 1, 'C')
-        pdf.set_text_color(*COLOR_TEXT);
-        pdf.ln(1)
-        pdf.set_chinese_font(size=9.5)
-        contact_items = [f"电话: {p}" for p in [personal.get("phone")] if p] + \
-                        [f"邮箱: {e}" for e in [personal.get("email")] if e] + \
-                        [f"地址: {a}" for a in [personal.get("address")] if a]
-        pdf.cell_chinese(0, line_height - 1, "  |  ".join(contact_items), 0, 1, 'C')
-        link_items = [f"LinkedIn: {l}" for l in [personal.get("linkedin")] if l] + \
-                     [f"GitHub: {g}" for g in [personal.get("github")] if g]
-        if link_items:
-            pdf.set_text_color(*COLOR_LINK)
-            pdf.cell_chinese(0, line_height - 1, "  |  ".join(link_items), 0, 1, 'C', link=' '.join(link_items))
-            pdf.set_text_color(*COLOR_TEXT)
-        pdf.ln(4);
-        pdf.set_draw_color(*COLOR_LINE);
-        pdf.set_line_width(0.3)
-        pdf.cell(w=0, h=0.1, border='T', ln=1);
-        pdf.ln(5)
-
-        # --- 个人简介 ---
-        if personal["summary"]:
-            self.add_section_title(pdf, "个人简介", line_height)
-
-            pdf.multi_cell_chinese(available_width, line_height, personal["summary"])
-
-        # --- 教育经历 ---
-        if self.resume_data["education"]:
-            self.add_section_title(pdf, "教育经历", line_height)
-            for edu in self.resume_data["education"]:
-                pdf.set_chinese_font('B', 11)
-                date_info = f"{edu['start_year']} - {edu['end_year']}"
-                date_width = pdf.get_string_width(date_info) + 2
-                pdf.cell_chinese(0, line_height, f"* {edu['school']}", 0, 0)
-                pdf.set_text_color(*COLOR_LIGHT_TEXT);
-                pdf.set_chinese_font(size=9.5)
-                pdf.cell(0, line_height, date_info, 0, 1, 'R')
-                pdf.set_text_color(*COLOR_TEXT);
-                pdf.set_chinese_font(size=10.5)
-                degree_info = f"{edu['major']}" + (f" - {edu['degree']}" if edu['degree'] else "") + \
-                              (f" (GPA: {edu['gpa']})" if edu['gpa'] else "")
-                pdf.cell_chinese(0, line_height, f"  {degree_info}", 0, 1)
-                if edu["description"]:
-                    pdf.set_text_color(*COLOR_LIGHT_TEXT)
-                    for line in edu['description'].split('\n'):
-                        line = line.strip()
-                        if line:
-
-                            pdf.multi_cell_chinese(available_width, line_height - 1, f"- {line}")
-                    pdf.set_text_color(*COLOR_TEXT)
-                pdf.ln(3)
-
-        # --- 工作经历 ---
-        if self.resume_data["experience"]:
-            self.add_section_title(pdf, "工作经历", line_height)
-            for exp in self.resume_data["experience"]:
-                pdf.set_chinese_font('B', 11)
-                date_info = f"{exp['start_date']} - {exp['end_date']}"
-                date_width = pdf.get_string_width(date_info) + 2
-                pdf.cell_chinese(0, line_height, f"* {exp['company']}", 0, 0)
-                pdf.set_text_color(*COLOR_LIGHT_TEXT);
-                pdf.set_chinese_font(size=9.5)
-                pdf.cell(0, line_height, date_info, 0, 1, 'R')
-                pdf.set_text_color(*COLOR_TEXT);
-                pdf.set_chinese_font(size=10.5)
-                pdf.set_chinese_font('I');
-                pdf.cell_chinese(0, line_height, f"> {exp['position']}", 0, 1);
-                pdf.set_chinese_font()
-                for line in exp['description'].split('\n'):
-                    line = line.strip()
-                    if line:
-
-                        pdf.multi_cell_chinese(available_width, line_height - 0.5, f"- {line}")
-                pdf.ln(3)
-
-        # --- 项目经历 ---
-        if self.resume_data["projects"]:
-            self.add_section_title(pdf, "项目经历", line_height)
-            for proj in self.resume_data["projects"]:
-                pdf.set_chinese_font('B', 11)
-                date_info = f"({proj['date']})" if proj['date'] else ""
-                date_width = pdf.get_string_width(date_info) + 2
-                pdf.cell_chinese(0, line_height, f"* {proj['name']}", 0, 0)
-                pdf.set_text_color(*COLOR_LIGHT_TEXT);
-                pdf.set_chinese_font(size=9.5)
-                pdf.cell(0, line_height, date_info, 0, 1, 'R')
-                pdf.set_text_color(*COLOR_TEXT);
-                pdf.set_chinese_font(size=10.5)
-                pdf.cell_chinese(0, line_height, f"角色: {proj['role']}", 0, 1)
-                if proj["description"]:
-                    for line in proj['description'].split('\n'):
-                        line = line.strip()
-                        if line:
-
-                            pdf.multi_cell_chinese(available_width, line_height - 0.5, f"{line}")
-                if proj["link"]:
-                    pdf.ln(1);
-                    pdf.set_text_color(*COLOR_LINK)
-                    pdf.cell_chinese(0, line_height - 1, f"> 链接: {proj['link']}", 0, 1, link=proj['link'])
-                    pdf.set_text_color(*COLOR_TEXT)
-                pdf.ln(3)
-
-        # --- 技能 ---
-
-        if self.resume_data["skills"]:
-            self.add_section_title(pdf, "技能", line_height)
-
-            skills_by_type = {}
-            for skill in self.resume_data["skills"]:
-                skill_type = skill.get("type", "未分类")
-                if skill_type not in skills_by_type: skills_by_type[skill_type] = []
-                level = f" ({skill['level']})" if skill.get('level') and skill['level'] != '未指定' else ""
-                skills_by_type[skill_type].append(f"{skill['name']}{level}")
-
-            x_pos_label = pdf.l_margin;
-            x_pos_skills = pdf.l_margin + 35
-            for skill_type in sorted(skills_by_type.keys()):
-                pdf.set_x(x_pos_label);
-                pdf.set_chinese_font('B')
-                pdf.cell_chinese(x_pos_skills - x_pos_label - 2, line_height, f"{skill_type}:", 0, 0, 'R')
-                pdf.set_chinese_font();
-                pdf.set_x(x_pos_skills)
-                # multi_cell 这里已经有显式宽度，不需要改
-                pdf.multi_cell_chinese(pdf.w - pdf.r_margin - x_pos_skills, line_height,
-                                       ", ".join(skills_by_type[skill_type]), border=0, align='L')
-                pdf.ln(1)
-
-        # --- 检查页面空间 ---
-
-        estimated_section_height = (line_height + 2) + line_height + (6 / pdf.k) + (4 / pdf.k)
-        remaining_page_space = pdf.h - pdf.b_margin - pdf.get_y()
-        if self.resume_data["languages"] and remaining_page_space < estimated_section_height * 1.2:
-            print("DEBUG: Adding page break before Languages section")
-            pdf.add_page()
-
-        # --- 语言能力 ---
-        if self.resume_data["languages"]:
-            self.add_section_title(pdf, "语言能力", line_height)
-            lang_list = [
-                f"{lang['name']}" + (f" ({lang['level']})" if lang.get('level') and lang['level'] != '未指定' else "")
-                for lang in self.resume_data["languages"]]
-
-            pdf.multi_cell_chinese(available_width, line_height, " | ".join(lang_list))
-
-        # --- 保存PDF ---
-
+        output_dir = QFileDialog.getExistingDirectory(self, "选择输出目录", os.path.dirname(sources[0]))
+        if not output_dir:
+            return
+        worker = BatchExportWorker(sources, output_dir, self.template_combo.currentText())
+        worker.signals.progress.connect(
+            lambda done, total: self.status_label.setText(f"正在批量导出: {done}/{total}"))
+        worker.signals.finished.connect(self.on_batch_export_finished)
+        worker.signals.failed.connect(self.on_batch_export_failed)
+        self.batch_export_worker = worker # 保持信号对象存活到任务结束
+        self.batch_export_btn.setEnabled(False)
+        self.status_label.setText("正在批量导出...")
+        QThreadPool.globalInstance().start(worker)
+
+    def on_batch_export_finished(self, report):
+        self.batch_export_worker = None
+        self.batch_export_btn.setEnabled(True)
+        message = (f"成功 {report.succeeded} 个，失败 {report.failed} 个，"
+                   f"用时 {report.seconds:.1f} 秒（{report.files_per_second:.1f} 文件/秒）")
+        failures = [f"{os.path.basename(r.source)}: {r.error}" for r in report.results if not r.ok]
+        if failures:
+            message += "\n\n" + "\n".join(failures[:10])
+        self.status_label.setText("批量导出完成")
+        QMessageBox.information(self, "批量导出完成", message)
+
+    def on_batch_export_failed(self, message):
+        self.batch_export_worker = None
+        self.batch_export_btn.setEnabled(True)
+        self.status_label.setText("批量导出失败")
+        QMessageBox.critical(self, "批量导出失败", message)
+
+    def toggle_tracing(self):
+        """开始或停止记录导出流水线的耗时（字体加载、各部分排版、分页、PDF 输出）"""
+        if not resume_trace.is_enabled():
+            resume_trace.enable()
+            self.status_label.setText("性能追踪已开始，再次按 Ctrl+Shift+T 停止并保存")
+            return
+        resume_trace.disable()
+        filepath, _ = QFileDialog.getSaveFileName(self, "保存性能追踪", "resume_trace.json",
+                                                  "Chrome trace (*.json)")
+        if not filepath:
+            self.status_label.setText("性能追踪已停止（未保存）"); return
         try:
-            safe_name = "".join(c for c in personal['name'] if c.isalnum() or c in (' ', '_')).rstrip() or "未命名"
-            default_filename = f"{safe_name}_简历.pdf"  # 文件名加后缀
-            filepath, _ = QFileDialog.getSaveFileName(self, "导出PDF简历", default_filename, "PDF 文件 (*.pdf)")
-            if filepath:
-                pdf.output(filepath)
-                QMessageBox.information(self, "导出成功", f"简历已成功导出为:\n{filepath}")
-                self.status_label.setText(f"简历已导出")
-            else:
-                self.status_label.setText("导出已取消")
+            resume_trace.TRACER.write(filepath)
+            self.status_label.setText(f"性能追踪已保存到: {filepath}")
         except Exception as e:
-            QMessageBox.critical(self, "导出失败", f"导出PDF时发生错误: {str(e)}\n请检查文件权限或路径。")
-            self.status_label.setText("导出PDF时出错")
+            QMessageBox.warning(self, "保存失败", f"保存性能追踪时出错: {str(e)}")
 
     def save_resume(self):
         """保存简历数据到JSON文件"""
         self.update_resume_data()
         if not self.validate_personal_info():
              return
-        personal_name = self.resume_data['personal_info']['name']
-        safe_name = "".join(c for c in personal_name if c.isalnum() or c in (' ', '_')).rstrip() or "未命名"
-        default_filename = f"{safe_name}_简历.json"
+        default_filename = f"{safe_name(self.resume_data['personal_info']['name'])}_简历.json"
         filepath, _ = QFileDialog.getSaveFileName(self, "保存简历数据", default_filename, "JSON 文件 (*.json)")
         if not filepath:
             self.status_label.setText("保存已取消"); return
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.resume_data, f, ensure_ascii=False, indent=4)
+                json.dump(self.resume_data, f, ensure_ascii=False, indent=4, default=json_default)
             QMessageBox.information(self, "保存成功", f"简历数据已保存到:\n{filepath}")
             self.status_label.setText(f"简历已保存")
         except Exception as e:
@@ -1311,45 +1689,156 @@ class ResumeApp(QMainWindow):
                 self.status_label.setText("加载已取消"); return
             with open(filepath, 'r', encoding='utf-8') as f: loaded_data = json.load(f)
             if isinstance(loaded_data, dict) and "personal_info" in loaded_data:
-                 self.resume_data = loaded_data; self.ensure_data_structure()
+                 self.commit_personal_edits()
+                 problems = VALIDATOR.validate(loaded_data) # 在补全之前检查，缺失的结构也能报告
+                 self.edit({"op": "replace", "resume_data": normalize_resume_data(loaded_data)}) # 加载后清除所有编辑状态
+                 self.library_id = None
             else: raise ValueError("无效的简历文件格式")
-            self.update_ui_from_data(); self.clear_all_edit_states() # 加载后清除所有编辑状态
-            QMessageBox.information(self, "加载成功", f"简历数据已从:\n{filepath} 加载")
+            if problems:
+                QMessageBox.warning(self, "加载成功（数据有问题）",
+                                    f"简历数据已从:\n{filepath} 加载，但有以下问题需要修改:\n\n{format_report(problems, 10)}")
+            else:
+                QMessageBox.information(self, "加载成功", f"简历数据已从:\n{filepath} 加载")
             self.status_label.setText(f"已加载简历"); self.tabs.setCurrentIndex(0)
         except Exception as e:
             QMessageBox.critical(self, "加载失败", f"加载简历时出错: {str(e)}")
             self.status_label.setText("加载简历时出错")
 
+    # --- 简历库 ---
+    def get_library(self):
+        """打开（或返回已打开的）简历库，失败时提示并返回 None"""
+        if self.library is None:
+            try:
+                self.library = ResumeLibrary()
+            except Exception as e:
+                QMessageBox.warning(self, "简历库", f"无法打开简历库: {str(e)}")
+        return self.library
+
+    def show_library(self):
+        self.library_dock.show()
+        self.library_dock.raise_()
+        self.library_search_edit.setFocus()
+        self.search_library()
+
+    def search_library(self):
+        """按搜索框内容检索简历库（只读取姓名和摘要）"""
+        library = self.get_library()
+        if library is None:
+            return
+        self.library_search_timer.stop()
+        hits = library.search(self.library_search_edit.text().strip())
+        self.library_results.clear()
+        for hit in hits:
+            text = hit.name or '未命名'
+            if hit.snippet:
+                text += "\n  " + hit.snippet.replace('\n', ' ')
+            item = QListWidgetItem(text)
+            item.setData(Qt.ItemDataRole.UserRole, hit.resume_id)
+            self.library_results.addItem(item)
+        self.status_label.setText(f"简历库：找到 {len(hits)} 份简历")
+
+    def open_library_resume(self, item):
+        """从简历库读取完整简历并加载到编辑器"""
+        if item is None:
+            QMessageBox.information(self, "提示", "请先在简历库中选择要打开的简历。"); return
+        reply = QMessageBox.question(self, '确认加载', '加载新简历将覆盖当前内容，确定要加载吗？',
+                                   QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.No:
+            return
+        resume_id = item.data(Qt.ItemDataRole.UserRole)
+        try:
+            loaded_data = normalize_resume_data(self.library.load(resume_id))
+        except Exception as e:
+            QMessageBox.critical(self, "加载失败", f"从简历库加载时出错: {str(e)}"); return
+        self.commit_personal_edits()
+        self.edit({"op": "replace", "resume_data": loaded_data})
+        self.library_id = resume_id
+        self.status_label.setText(f"已从简历库加载: {self.resume_data['personal_info']['name']}")
+        self.tabs.setCurrentIndex(0)
+
+    def save_to_library(self):
+        """保存当前简历到简历库（已在库中则覆盖）"""
+        self.update_resume_data()
+        if not self.validate_personal_info():
+            return
+        library = self.get_library()
+        if library is None:
+            return
+        try:
+            self.library_id = library.save(self.resume_data, self.library_id)
+        except KeyError: # 库中的记录已被删除，另存为新记录
+            self.library_id = library.save(self.resume_data)
+        except Exception as e:
+            QMessageBox.warning(self, "保存失败", f"保存到简历库时出错: {str(e)}"); return
+        self.status_label.setText("已存入简历库")
+        self.search_library()
+
+    def delete_library_resume(self):
+        item = self.library_results.currentItem()
+        if item is None:
+            QMessageBox.information(self, "提示", "请先在简历库中选择要删除的简历。"); return
+        reply = QMessageBox.question(self, '确认删除', f'确定要从简历库删除“{item.text().splitlines()[0]}”吗？',
+                                   QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            resume_id = item.data(Qt.ItemDataRole.UserRole)
+            self.library.delete(resume_id)
+            if self.library_id == resume_id:
+                self.library_id = None
+            self.search_library()
+
+    def import_to_library(self):
+        """在后台把 CSV / JSON Lines 文件导入简历库，完成后刷新搜索结果"""
+        library = self.get_library()
+        if library is None:
+            return
+        filepath, _ = QFileDialog.getOpenFileName(self, "批量导入简历", "",
+                                                  "CSV / JSON Lines (*.csv *.tsv *.jsonl *.ndjson)")
+        if not filepath:
+            return
+        worker = ImportWorker(filepath, library.path)
+        worker.signals.progress.connect(
+            lambda read, saved: self.status_label.setText(f"正在导入: 已读取 {read} 份，已存入 {saved} 份"))
+        worker.signals.finished.connect(self.on_import_finished)
+        worker.signals.failed.connect(self.on_import_failed)
+        self.import_worker = worker # 保持信号对象存活到任务结束
+        self.import_btn.setEnabled(False)
+        self.status_label.setText("正在导入...")
+        QThreadPool.globalInstance().start(worker)
+
+    def on_import_finished(self, stats):
+        self.import_worker = None
+        self.import_btn.setEnabled(True)
+        message = f"读取 {stats.read} 份，存入简历库 {stats.saved} 份"
+        if stats.skipped:
+            message += f"，{stats.skipped} 份因数据有问题被跳过（可用命令行 import 查看详情）"
+        self.status_label.setText("导入完成")
+        QMessageBox.information(self, "导入完成", message)
+        self.search_library()
+
+    def on_import_failed(self, message):
+        self.import_worker = None
+        self.import_btn.setEnabled(True)
+        self.status_label.setText("导入失败")
+        QMessageBox.warning(self, "导入失败", message)
+
     def ensure_data_structure(self):
         """确保 self.resume_data 包含所有预期的键和列表"""
-        defaults = {
-            "personal_info": {"name": "", "email": "", "phone": "", "address": "", "linkedin": "", "github": "", "summary": ""},
-            "education": [], "experience": [], "projects": [], "skills": [], "languages": []
-        }
-        for key, default_value in defaults.items():
-            if key not in self.resume_data: self.resume_data[key] = default_value
-            elif isinstance(default_value, dict):
-                if not isinstance(self.resume_data.get(key), dict): self.resume_data[key] = default_value.copy()
-                else:
-                    for sub_key, sub_default in default_value.items():
-                        if sub_key not in self.resume_data[key]: self.resume_data[key][sub_key] = sub_default
-            elif isinstance(default_value, list) and not isinstance(self.resume_data.get(key), list):
-                 self.resume_data[key] = []
+        normalize_resume_data(self.resume_data)
 
     def update_ui_from_data(self):
         """根据 self.resume_data 中的数据更新整个UI界面"""
+        self.fill_personal_edits()
+        for model in self.entry_models.values(): # 条目列表（包括未构建的标签页）都由模型更新
+            model.reset(self.resume_data)
+        self.committed_personal = dict(self.resume_data["personal_info"])
+        self.autosave_snapshot()
+
+    def fill_personal_edits(self):
+        """把 resume_data 中的个人信息填入表单（表单尚未构建时跳过）"""
         personal = self.resume_data.get("personal_info", {})
-        self.name_edit.setText(personal.get("name", ""))
-        self.email_edit.setText(personal.get("email", ""))
-        self.phone_edit.setText(personal.get("phone", ""))
-        self.address_edit.setText(personal.get("address", ""))
-        self.linkedin_edit.setText(personal.get("linkedin", ""))
-        self.github_edit.setText(personal.get("github", ""))
-        self.summary_edit.setPlainText(personal.get("summary", ""))
-        self.update_education_list(); self.update_experience_list()
-        self.update_projects_list(); self.update_skills_list()
-        self.update_languages_list()
-        print("UI 已根据加载的数据更新。")
+        for field, edit in self.personal_edits.items():
+            if isinstance(edit, QTextEdit): edit.setPlainText(personal.get(field, ""))
+            else: edit.setText(personal.get(field, ""))
 
     def clear_all_edit_states(self):
         """清除所有标签页的编辑状态和表单"""
@@ -1361,23 +1850,49 @@ class ResumeApp(QMainWindow):
 
     def clear_all(self):
         """清空所有输入和列表"""
-        reply = QMessageBox.question(self, '确认清空', '确定要清空所有已输入的内容吗？此操作不可撤销。',
+        reply = QMessageBox.question(self, '确认清空', '确定要清空所有已输入的内容吗？（可通过“撤销”恢复）',
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            self.reset_resume_data()
-            self.update_ui_from_data() # 更新列表（现在是空的）
-            self.clear_all_edit_states() # 清空所有表单和编辑状态
+            self.commit_personal_edits()
+            self.edit({"op": "replace", "resume_data": empty_resume_data()}) # 同时清空所有表单和编辑状态
+            self.library_id = None
             self.status_label.setText("所有内容已清空")
             self.tabs.setCurrentIndex(0)
 
 
+def profile_startup(app, window, app_created, window_created):
+    """--profile-startup：窗口显示并完成后台字体检查后打印各阶段耗时，然后退出"""
+    def report(font_ok):
+        rows = (("导入模块", _IMPORTS_DONE - _START_TIME),
+                ("创建 QApplication", app_created - _IMPORTS_DONE),
+                ("构建主窗口", window_created - app_created),
+                ("显示窗口到首次事件循环", window.first_event_time - window_created),
+                ("启动合计（窗口可用）", window.first_event_time - _START_TIME),
+                ("后台字体检查（不阻塞）", window.font_check_seconds))
+        print("启动耗时:")
+        for label, seconds in rows:
+            print(f"  {label:<22}{seconds * 1000:>9.1f} ms")
+        print(f"  中文字体{'可用' if font_ok else '不可用'}；启动时已导入 fpdf: {'是' if window.fpdf_at_show else '否'}；"
+              f"已构建标签页: {len(window.built_tabs)}/{len(window.TAB_BUILDERS)}")
+        app.quit()
+
+    def first_event():
+        window.first_event_time = time.perf_counter()
+        window.fpdf_at_show = "fpdf" in sys.modules
+
+    QTimer.singleShot(0, first_event)
+    window.font_ready.connect(report)
+
+
 if __name__ == "__main__":
+    profiling = "--profile-startup" in sys.argv
+    if profiling:
+        sys.argv.remove("--profile-startup")
     app = QApplication(sys.argv)
-    if not os.path.exists(CHINESE_FONT_PATH):
-         msg = QMessageBox()
-         msg.setIcon(QMessageBox.Icon.Warning); msg.setWindowTitle("字体文件缺失")
-         msg.setText(f"警告：未找到中文字体文件:\n'{CHINESE_FONT_PATH}'。\n\n请配置正确路径。")
-         msg.setStandardButtons(QMessageBox.StandardButton.Ok); msg.exec()
+    app_created = time.perf_counter()
     window = ResumeApp()
+    window_created = time.perf_counter()
+    if profiling:
+        profile_startup(app, window, app_created, window_created)
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,122 @@
+"""简历的中间文档树：由 resume_data 构建一次，PDF、HTML、Markdown、纯文本和 DOCX
+输出都只读取这棵树，不再各自遍历 resume_data。
+
+树由不可变的具名元组组成（可直接作为缓存键的内容，也可 JSON 序列化）::
+
+    Document(name, sections)
+      Section(key, title, blocks)       blocks 为下列节点之一的元组
+        Header(name, contacts, links)   contacts/links 为 (标签, 值) 元组
+        Paragraph(text)
+        Entry(title, date, subtitle, bullets, link)
+        SkillGroup(label, items)
+
+没有内容的部分仍然保留（blocks 为空），由各输出方式决定是否显示。给定与数据
+同步的 resume_index.ResumeIndex 时，技能分组直接读取索引，不再重新分组排序。
+"""
+from collections import namedtuple
+
+from resume_index import ResumeIndex
+from resume_schema import normalize_resume_data
+
+# 所有部分及其标题；模板的 "sections" 决定其中哪些部分以什么顺序输出
+SECTION_TITLES = {
+    "header": "个人信息",
+    "summary": "个人简介",
+    "education": "教育经历",
+    "experience": "工作经历",
+    "projects": "项目经历",
+    "skills": "技能",
+    "languages": "语言能力",
+}
+DEFAULT_SECTION_ORDER = ("header", "summary", "education", "experience", "projects", "skills", "languages")
+
+Document = namedtuple("Document", "name sections")
+Section = namedtuple("Section", "key title blocks")
+Header = namedtuple("Header", "name contacts links")
+Paragraph = namedtuple("Paragraph", "text")
+Entry = namedtuple("Entry", "title date subtitle bullets link")
+SkillGroup = namedtuple("SkillGroup", "label items")
+
+
+def _description_lines(description):
+    return tuple(line.strip() for line in description.split('\n') if line.strip())
+
+
+def _level_suffix(item):
+    return f" ({item.level})" if item.level and item.level != '未指定' else ""
+
+
+def _header_blocks(resume_data, index):
+    personal = resume_data["personal_info"]
+    contacts = tuple((label, personal.get(field)) for label, field in
+                     (("电话", "phone"), ("邮箱", "email"), ("地址", "address")) if personal.get(field))
+    links = tuple((label, personal.get(field)) for label, field in
+                  (("LinkedIn", "linkedin"), ("GitHub", "github")) if personal.get(field))
+    return (Header(personal["name"], contacts, links),)
+
+
+def _summary_blocks(resume_data, index):
+    summary = resume_data["personal_info"]["summary"]
+    return (Paragraph(summary),) if summary else ()
+
+
+def _education_blocks(resume_data, index):
+    return tuple(
+        Entry(edu.school, f"{edu.start_year} - {edu.end_year}",
+              f"{edu.major}" + (f" - {edu.degree}" if edu.degree else "") +
+              (f" (GPA: {edu.gpa})" if edu.gpa else ""),
+              _description_lines(edu.description), "")
+        for edu in resume_data["education"])
+
+
+def _experience_blocks(resume_data, index):
+    return tuple(
+        Entry(exp.company, f"{exp.start_date} - {exp.end_date}", exp.position,
+              _description_lines(exp.description), "")
+        for exp in resume_data["experience"])
+
+
+def _project_blocks(resume_data, index):
+    return tuple(
+        Entry(proj.name, proj.date, f"角色: {proj.role}", _description_lines(proj.description),
+              proj.link)
+        for proj in resume_data["projects"])
+
+
+def _skill_blocks(resume_data, index):
+    """技能按类别分组，类别按名称排序（没有索引或索引与数据不同步时临时建一个）"""
+    if index is None or not index["skills"].matches(resume_data["skills"]):
+        index = ResumeIndex(resume_data, sections=("skills",))
+    return tuple(SkillGroup(skill_type, tuple(f"{skill.name}{_level_suffix(skill)}" for skill in skills))
+                 for skill_type, skills in index.skills_by_type())
+
+
+def _language_blocks(resume_data, index):
+    if not resume_data["languages"]:
+        return ()
+    return (Paragraph(" | ".join(f"{lang.name}{_level_suffix(lang)}" for lang in resume_data["languages"])),)
+
+
+SECTION_BUILDERS = {
+    "header": _header_blocks,
+    "summary": _summary_blocks,
+    "education": _education_blocks,
+    "experience": _experience_blocks,
+    "projects": _project_blocks,
+    "skills": _skill_blocks,
+    "languages": _language_blocks,
+}
+
+
+def build_section(resume_data, key, index=None):
+    return Section(key, SECTION_TITLES[key], SECTION_BUILDERS[key](resume_data, index))
+
+
+def build_document(resume_data, sections=DEFAULT_SECTION_ORDER, index=None):
+    """按给定的部分顺序构建文档树（条目仍为字典时先就地转换为记录）
+
+    index 为与 resume_data 同步维护的 ResumeIndex（如编辑器中的），可省略。
+    """
+    normalize_resume_data(resume_data)
+    return Document(resume_data["personal_info"]["name"],
+                    tuple(build_section(resume_data, key, index) for key in sections))
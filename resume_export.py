@@ -0,0 +1,481 @@
+"""多格式导出：从同一棵文档树生成 PDF、HTML、Markdown、纯文本和 DOCX。
+
+文档树只构建一次，各输出方式只是对它的一次廉价遍历::
+
+    files = export_all(resume_data, ("pdf", "html", "md", "txt", "docx"))
+
+DOCX 只用标准库（zipfile）生成最小的 WordprocessingML 包，不依赖 python-docx。
+PDF 之外的格式不需要 fpdf，也不需要中文字体文件。
+"""
+import html
+import io
+import json
+import os
+import re
+import sys
+
+from resume_document import Entry, Header, Paragraph, SkillGroup, build_document
+from resume_schema import normalize_resume_data
+from resume_templates import TEMPLATES, compile_template
+from resume_trace import TRACE_FORMATS, TRACER, span
+
+
+# --- 纯文本（也用于界面中的实时预览） ---
+
+def text_section(section):
+    """一个部分的纯文本；空的部分返回空字符串"""
+    if not section.blocks:
+        return ""
+    lines = [] if section.key == "header" else [f"\n--- {section.title} ---\n"]
+    for node in section.blocks:
+        if isinstance(node, Header):
+            lines.append(f"姓名: {node.name}\n")
+            if node.contacts:
+                lines.append(" | ".join(f"{label}: {value}" for label, value in node.contacts) + "\n")
+            if node.links:
+                lines.append(" | ".join(f"{label}: {url}" for label, url in node.links) + "\n")
+        elif isinstance(node, Paragraph):
+            lines.append(f"{node.text}\n")
+        elif isinstance(node, Entry):
+            subtitle = f" | {node.subtitle}" if node.subtitle else ""
+            date = f" ({node.date})" if node.date else ""
+            lines.append(f"- {node.title}{subtitle}{date}\n")
+            lines.extend(f"  • {line}\n" for line in node.bullets)
+            if node.link: lines.append(f"  链接: {node.link}\n")
+        elif isinstance(node, SkillGroup):
+            lines.append(f"- {node.label}: {', '.join(node.items)}\n")
+    return "".join(lines)
+
+
+def emit_text(document, tpl=None):
+    return "".join(text_section(section) for section in document.sections)
+
+
+# --- Markdown ---
+
+_MD_SPECIAL = re.compile(r'([\\`*_\[\]<>#|])')
+
+
+def _md(text):
+    return _MD_SPECIAL.sub(r'\\\1', text)
+
+
+def emit_markdown(document, tpl=None):
+    lines = []
+    for section in document.sections:
+        if not section.blocks:
+            continue
+        if section.key != "header":
+            lines.append(f"## {_md(section.title)}\n\n")
+        for node in section.blocks:
+            if isinstance(node, Header):
+                lines.append(f"# {_md(node.name)}\n\n")
+                if node.contacts:
+                    lines.append(" | ".join(f"{label}: {_md(value)}" for label, value in node.contacts) + "\n\n")
+                links = [f"[{label}]({_safe_href(url)})" for label, url in node.links if _safe_href(url)]
+                if links:
+                    lines.append(" | ".join(links) + "\n\n")
+            elif isinstance(node, Paragraph):
+                lines.append(_md(node.text).replace("\n", "  \n") + "\n\n")
+            elif isinstance(node, Entry):
+                date = f" · {_md(node.date)}" if node.date else ""
+                lines.append(f"### {_md(node.title)}{date}\n\n")
+                if node.subtitle: lines.append(f"*{_md(node.subtitle)}*\n\n")
+                lines.extend(f"- {_md(line)}\n" for line in node.bullets)
+                if node.bullets: lines.append("\n")
+                if node.link and _safe_href(node.link): lines.append(f"链接: <{_safe_href(node.link)}>\n\n")
+            elif isinstance(node, SkillGroup):
+                lines.append(f"- **{_md(node.label)}**: {_md(', '.join(node.items))}\n")
+        if section.key == "skills":
+            lines.append("\n")
+    return "".join(lines)
+
+
+# --- HTML ---
+
+_SCHEME = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*):')
+
+
+def _safe_href(url):
+    """链接地址：只允许 http/https/mailto，没有协议的地址按 https 处理"""
+    url = url.strip()
+    match = _SCHEME.match(url)
+    if match is None:
+        return "https://" + url
+    return url if match.group(1).lower() in ("http", "https", "mailto") else ""
+
+
+def _css_color(rgb):
+    return "#%02x%02x%02x" % tuple(rgb)
+
+
+def emit_html(document, tpl=None):
+    """独立的 HTML 页面，颜色取自模板"""
+    tpl = compile_template(tpl or "default")
+    e = html.escape
+    parts = [
+        '<!DOCTYPE html>\n<html lang="zh-CN">\n<head>\n<meta charset="utf-8">\n',
+        f'<title>{e(document.name)} - 简历</title>\n<style>\n',
+        f'body {{ max-width: 800px; margin: 2em auto; font-family: "KaiTi", "STKaiti", serif; '
+        f'color: {_css_color(tpl.colors["text"])}; line-height: 1.5; }}\n',
+        f'h1 {{ text-align: center; color: {_css_color(tpl.colors["primary"])}; margin-bottom: 0.2em; }}\n',
+        f'h2 {{ color: {_css_color(tpl.colors["primary"])}; '
+        f'border-bottom: 2px solid {_css_color(tpl.colors["primary"])}; }}\n',
+        '.contact { text-align: center; margin: 0.2em 0; }\n',
+        f'a {{ color: {_css_color(tpl.colors["link"])}; }}\n',
+        '.entry-head { display: flex; justify-content: space-between; font-weight: bold; }\n',
+        f'.date {{ color: {_css_color(tpl.colors["light_text"])}; font-weight: normal; }}\n',
+        '</style>\n</head>\n<body>\n',
+    ]
+    for section in document.sections:
+        if not section.blocks:
+            continue
+        if section.key == "header":
+            parts.append('<header>\n')
+        else:
+            parts.append(f'<section class="{section.key}">\n<h2>{e(section.title)}</h2>\n')
+        for node in section.blocks:
+            if isinstance(node, Header):
+                parts.append(f'<h1>{e(node.name)}</h1>\n')
+                if node.contacts:
+                    parts.append('<p class="contact">' +
+                                 " | ".join(f"{e(label)}: {e(value)}" for label, value in node.contacts) + '</p>\n')
+                if node.links:
+                    parts.append('<p class="contact">' + " | ".join(
+                        f'<a href="{e(_safe_href(url))}">{e(label)}: {e(url)}</a>' for label, url in node.links)
+                        + '</p>\n')
+            elif isinstance(node, Paragraph):
+                parts.append(f'<p>{e(node.text).replace(chr(10), "<br>")}</p>\n')
+            elif isinstance(node, Entry):
+                parts.append(f'<div class="entry">\n<div class="entry-head"><span>{e(node.title)}</span>'
+                             f'<span class="date">{e(node.date)}</span></div>\n')
+                if node.subtitle: parts.append(f'<div class="subtitle">{e(node.subtitle)}</div>\n')
+                if node.bullets:
+                    parts.append('<ul>\n' + "".join(f'<li>{e(line)}</li>\n' for line in node.bullets) + '</ul>\n')
+                if node.link:
+                    parts.append(f'<div>链接: <a href="{e(_safe_href(node.link))}">{e(node.link)}</a></div>\n')
+                parts.append('</div>\n')
+            elif isinstance(node, SkillGroup):
+                parts.append(f'<p><strong>{e(node.label)}:</strong> {e(", ".join(node.items))}</p>\n')
+        parts.append('</header>\n' if section.key == "header" else '</section>\n')
+    parts.append('</body>\n</html>\n')
+    return "".join(parts)
+
+
+# --- DOCX（标准库生成的最小 WordprocessingML 包） ---
+
+_W_NS = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+         'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"')
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+# A4 页面与正文宽度（缇，1 毫米约 56.7 缇）
+_DOCX_PAGE = (11906, 16838)
+_MM = 56.7
+
+_CONTENT_TYPES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                  '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                  '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                  '<Default Extension="xml" ContentType="application/xml"/>'
+                  '<Override PartName="/word/document.xml" ContentType='
+                  '"application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+                  '<Override PartName="/word/styles.xml" ContentType='
+                  '"application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+                  '</Types>')
+_PACKAGE_RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                 '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                 '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                 'relationships/officeDocument" Target="word/document.xml"/></Relationships>')
+
+
+def _docx_color(rgb):
+    return "%02X%02X%02X" % tuple(rgb)
+
+
+class _DocxWriter:
+    """把文档节点写成 WordprocessingML 段落，记录超链接关系"""
+
+    def __init__(self, tpl):
+        self.tpl = tpl
+        self.body = []
+        self.links = [] # 超链接地址，关系编号从 rId100 开始
+        self.text_width = _DOCX_PAGE[0] - 2 * round(tpl.margin * _MM)
+
+    def run(self, text, role):
+        style = self.tpl.text[role]
+        font_style, size = style.font
+        # rPr 子元素必须按架构顺序出现：b, i, color, sz
+        props = ('<w:b/>' if 'B' in font_style else '') + ('<w:i/>' if 'I' in font_style else '') + \
+                f'<w:color w:val="{_docx_color(style.color)}"/>' + \
+                f'<w:sz w:val="{round(size * 2)}"/><w:szCs w:val="{round(size * 2)}"/>'
+        text = _INVALID_XML_CHARS.sub("", text)
+        return f'<w:r><w:rPr>{props}</w:rPr><w:t xml:space="preserve">{html.escape(text, quote=False)}</w:t></w:r>'
+
+    def hyperlink(self, text, url, role):
+        href = _safe_href(url)
+        if not href:
+            return self.run(text, role)
+        self.links.append(href)
+        return f'<w:hyperlink r:id="rId{99 + len(self.links)}">{self.run(text, role)}</w:hyperlink>'
+
+    def paragraph(self, runs, align=None, after=0, indent=0, right_tab=False):
+        props = []
+        if right_tab: props.append(f'<w:tabs><w:tab w:val="right" w:pos="{self.text_width}"/></w:tabs>')
+        props.append(f'<w:spacing w:before="0" w:after="{round(after * _MM)}"/>')
+        if indent: props.append(f'<w:ind w:left="{round(indent * _MM)}"/>')
+        if align: props.append(f'<w:jc w:val="{align}"/>')
+        self.body.append(f'<w:p><w:pPr>{"".join(props)}</w:pPr>{"".join(runs)}</w:p>')
+
+    def rule(self, color, after):
+        self.body.append(f'<w:p><w:pPr><w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" '
+                         f'w:color="{_docx_color(color)}"/></w:pBdr>'
+                         f'<w:spacing w:before="0" w:after="{round(after * _MM)}"/></w:pPr></w:p>')
+
+    def node(self, section, node):
+        tpl, spacing = self.tpl, self.tpl.spacing
+        if isinstance(node, Header):
+            self.paragraph([self.run(node.name, "name")], align="center")
+            if node.contacts:
+                self.paragraph([self.run("  |  ".join(f"{l}: {v}" for l, v in node.contacts), "contact")],
+                               align="center")
+            if node.links:
+                runs = []
+                for i, (label, url) in enumerate(node.links):
+                    if i: runs.append(self.run("  |  ", "contact"))
+                    runs.append(self.hyperlink(f"{label}: {url}", url, "contact_link"))
+                self.paragraph(runs, align="center")
+            self.rule(tpl.colors["line"], spacing["header_after"])
+        elif isinstance(node, Paragraph):
+            for line in node.text.split("\n"):
+                self.paragraph([self.run(line, "paragraph")])
+        elif isinstance(node, Entry):
+            # 标题行用右对齐制表位把日期放到行尾
+            paragraphs = [([self.run(node.title, "entry_title"), '<w:r><w:tab/></w:r>', self.run(node.date, "date")],
+                           {"right_tab": True})]
+            if node.subtitle:
+                role = "position" if section == "experience" else "subtitle"
+                paragraphs.append(([self.run(node.subtitle, role)], {}))
+            paragraphs += [([self.run(f"• {line}", "paragraph")], {"indent": 4}) for line in node.bullets]
+            if node.link:
+                paragraphs.append(([self.run("链接: ", "project_link"),
+                                    self.hyperlink(node.link, node.link, "project_link")], {}))
+            paragraphs[-1][1]["after"] = spacing["entry_after"]
+            for runs, options in paragraphs:
+                self.paragraph(runs, **options)
+        elif isinstance(node, SkillGroup):
+            self.paragraph([self.run(f"{node.label}: ", "skill_label"), self.run(", ".join(node.items), "skill_list")])
+
+    def section(self, section):
+        if not section.blocks:
+            return
+        if section.key != "header":
+            self.paragraph([self.run(section.title, "section_title")])
+            self.rule(self.tpl.colors["primary"], self.tpl.spacing["section_after"])
+        for node in section.blocks:
+            self.node(section.key, node)
+
+    def document_xml(self):
+        margin = round(self.tpl.margin * _MM)
+        return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<w:document {_W_NS}><w:body>{"".join(self.body)}'
+                f'<w:sectPr><w:pgSz w:w="{_DOCX_PAGE[0]}" w:h="{_DOCX_PAGE[1]}"/>'
+                f'<w:pgMar w:top="{margin}" w:right="{margin}" w:bottom="{margin}" w:left="{margin}" '
+                'w:header="0" w:footer="0" w:gutter="0"/></w:sectPr></w:body></w:document>')
+
+    def styles_xml(self):
+        size = round(self.tpl.text["paragraph"].font[1] * 2)
+        return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<w:styles {_W_NS}><w:docDefaults><w:rPrDefault><w:rPr>'
+                '<w:rFonts w:ascii="Arial" w:hAnsi="Arial" w:eastAsia="KaiTi" w:cs="Arial"/>'
+                f'<w:sz w:val="{size}"/><w:lang w:val="en-US" w:eastAsia="zh-CN"/></w:rPr></w:rPrDefault>'
+                '</w:docDefaults></w:styles>')
+
+    def document_rels(self):
+        rels = [f'<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                f'relationships/styles" Target="styles.xml"/>']
+        rels += [f'<Relationship Id="rId{100 + i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                 f'relationships/hyperlink" Target="{html.escape(href)}" TargetMode="External"/>'
+                 for i, href in enumerate(self.links)]
+        return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                + "".join(rels) + '</Relationships>')
+
+
+def emit_docx(document, tpl=None):
+    import zipfile # 只在导出 DOCX 时加载，不拖慢界面启动
+
+    writer = _DocxWriter(compile_template(tpl or "default"))
+    for section in document.sections:
+        writer.section(section)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as package:
+        for name, content in (("[Content_Types].xml", _CONTENT_TYPES),
+                              ("_rels/.rels", _PACKAGE_RELS),
+                              ("word/document.xml", writer.document_xml()),
+                              ("word/styles.xml", writer.styles_xml()),
+                              ("word/_rels/document.xml.rels", writer.document_rels())):
+            # 固定时间戳：相同内容生成相同的文件
+            package.writestr(zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0)), content,
+                             compress_type=zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
+
+
+# --- PDF ---
+
+def emit_pdf(document, tpl=None, progress=None, is_cancelled=None, cache=None):
+    from resume_render import render_document_result # 只有 PDF 需要 fpdf 和字体
+    return render_document_result(document, tpl or "default", progress, is_cancelled, cache=cache).data
+
+
+# 扩展名 -> 输出函数；文本格式返回 str，其余返回 bytes
+EXPORT_FORMATS = {
+    "pdf": emit_pdf,
+    "html": emit_html,
+    "md": emit_markdown,
+    "txt": emit_text,
+    "docx": emit_docx,
+}
+
+
+def format_of(path):
+    """根据文件扩展名判断导出格式（.htm/.markdown 视为 html/md），未知时返回 None"""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    ext = {"htm": "html", "markdown": "md"}.get(ext, ext)
+    return ext if ext in EXPORT_FORMATS else None
+
+
+def export_document(document, fmt, template="default", progress=None, is_cancelled=None, cache=None):
+    """把文档树导出为 fmt 格式，返回文件内容字节（cache 为 PDFCache 时 PDF 先查磁盘缓存）"""
+    tpl = compile_template(template)
+    if fmt == "pdf":
+        return emit_pdf(document, tpl, progress, is_cancelled, cache)
+    with span(f"export.{fmt}", "output") as trace_args:
+        output = EXPORT_FORMATS[fmt](document, tpl)
+        output = output.encode('utf-8') if isinstance(output, str) else output
+        trace_args["bytes"] = len(output)
+    return output
+
+
+def export_resume(resume_data, fmt, template="default", progress=None, is_cancelled=None, cache=None):
+    """把简历数据导出为 fmt 格式（模板名无效时抛出 KeyError）"""
+    tpl = compile_template(template)
+    with span("build_document", "render"):
+        document = build_document(resume_data, tpl.sections)
+    return export_document(document, fmt, tpl, progress, is_cancelled, cache)
+
+
+def export_all(resume_data, formats=tuple(EXPORT_FORMATS), template="default"):
+    """一次构建文档树，导出多种格式；返回 {格式: 字节}"""
+    tpl = compile_template(template)
+    with span("build_document", "render"):
+        document = build_document(resume_data, tpl.sections)
+    return {fmt: export_document(document, fmt, tpl) for fmt in formats}
+
+
+def main(argv=None):
+    """命令行入口：render in.json out.pdf [out.html ...] [--template NAME] [--trace FILE]
+
+    输入或输出写作 "-" 时使用标准输入 / 标准输出（输出格式由 --format 指定），
+    便于在管道中使用而不产生临时文件。
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m resume_builder render",
+                                     description="将简历 JSON 导出为 PDF/HTML/Markdown/TXT/DOCX（无需图形界面）")
+    parser.add_argument("input", help="由“保存简历”生成的 JSON 文件（- 表示标准输入）")
+    parser.add_argument("outputs", nargs="+", metavar="output",
+                        help="输出文件，格式由扩展名决定: " + ", ".join(EXPORT_FORMATS) + "（- 表示标准输出）")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="pdf", help="写到标准输出时的格式")
+    parser.add_argument("--template", default="default", choices=sorted(TEMPLATES))
+    parser.add_argument("--cache", nargs="?", const="", metavar="DIR",
+                        help="使用 PDF 磁盘缓存（默认目录 ~/.resume_builder/pdf_cache）")
+    parser.add_argument("--trace", metavar="FILE", help="记录各阶段耗时并写入 FILE（可在 chrome://tracing 中查看）")
+    parser.add_argument("--trace-format", default="chrome", choices=TRACE_FORMATS)
+    args = parser.parse_args(argv)
+    for path in args.outputs:
+        if path != "-" and format_of(path) is None:
+            parser.error(f"无法从扩展名判断导出格式: {path}")
+    if args.outputs.count("-") > 1:
+        parser.error("只能有一个输出写到标准输出")
+
+    if args.trace:
+        TRACER.enable()
+    try:
+        return _export_files(args)
+    finally:
+        if args.trace:
+            TRACER.write(args.trace, args.trace_format)
+            print(f"追踪已写入: {args.trace}", file=sys.stderr if "-" in args.outputs else sys.stdout)
+
+
+def _output_format(path, args):
+    return args.format if path == "-" else format_of(path)
+
+
+def _export_files(args):
+    """按命令行参数读取 JSON 并写出各个输出文件，返回退出码
+
+    PDF 直接写入输出流（文件或标准输出），不另外复制为 bytes；写到标准输出时
+    提示信息改写到标准错误，不混入输出内容。
+    """
+    formats = [_output_format(path, args) for path in args.outputs]
+    render_errors = () # 只导出其他格式时不导入 fpdf 和字体，也没有渲染错误要处理
+    if "pdf" in formats:
+        import resume_render
+        render_errors = resume_render.RenderError
+        if not os.path.isfile(resume_render.CHINESE_FONT_PATH):
+            try:
+                resume_render.locate_font() # 配置的字体不存在，改用系统中找到的中文字体
+            except render_errors as e:
+                print(f"错误: {e}", file=sys.stderr)
+                return 1
+
+    try:
+        if args.input == "-":
+            resume_data = json.load(sys.stdin.buffer)
+        else:
+            with open(args.input, 'r', encoding='utf-8') as f:
+                resume_data = json.load(f)
+        if not isinstance(resume_data, dict):
+            raise ValueError(f"{args.input} 不是简历 JSON（应为一个对象）")
+        resume_data = normalize_resume_data(resume_data)
+        tpl = compile_template(args.template)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    with span("build_document", "render"):
+        document = build_document(resume_data, tpl.sections)
+    cache = None
+    if args.cache is not None:
+        from resume_pdf_cache import PDF_CACHE_DIR, PDFCache
+        cache = PDFCache(args.cache or PDF_CACHE_DIR)
+    info = sys.stderr if "-" in args.outputs else sys.stdout
+    for path, fmt in zip(args.outputs, formats):
+        try:
+            if path == "-":
+                detail = _write_output(document, fmt, tpl, sys.stdout.buffer, cache)
+                sys.stdout.buffer.flush()
+            else:
+                with open(path, 'wb') as f:
+                    detail = _write_output(document, fmt, tpl, f, cache)
+        except render_errors as e:
+            if path != "-" and os.path.exists(path):
+                os.remove(path) # 不留下不完整的文件
+            print(f"错误: {e}", file=sys.stderr)
+            return 1
+        print(f"简历已导出为: {'标准输出' if path == '-' else path}{detail}", file=info)
+    return 0
+
+
+def _write_output(document, fmt, tpl, stream, cache=None):
+    """把 fmt 格式的输出写入二进制流，返回用于提示的说明（PDF 为页数和大小）"""
+    if fmt == "pdf":
+        from resume_render import render_document_result
+        hits = cache.hits if cache is not None else 0
+        result = render_document_result(document, tpl, stream=stream, cache=cache)
+        cached = "，来自缓存" if cache is not None and cache.hits > hits else ""
+        return f"（{result.pages} 页，{result.size / 1024:.1f} KB{cached}）"
+    data = export_document(document, fmt, tpl)
+    stream.write(data)
+    return f"（{len(data) / 1024:.1f} KB）"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
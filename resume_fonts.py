@@ -0,0 +1,69 @@
+"""中文字体的配置与自动发现，不依赖 fpdf，可在启动路径上安全导入。
+
+配置的字体不存在时，依次尝试环境变量 RESUME_FONT 和各平台常见的中文字体。
+这里只检查文件是否存在；字体能否被解析由 resume_render.locate_font 在后台验证。
+"""
+import hashlib
+import os
+import sys
+import threading
+
+CHINESE_FONT_PATH = 'C:/Windows/Fonts/simkai.ttf' # <--- 确认或修改路径
+
+# 各平台常见的中文 TrueType/OpenType 字体（fpdf 不支持 .ttc 字体集合）
+FONT_CANDIDATES = {
+    "win32": ("C:/Windows/Fonts/simkai.ttf", "C:/Windows/Fonts/simhei.ttf", "C:/Windows/Fonts/simfang.ttf",
+              "C:/Windows/Fonts/STKAITI.TTF", "C:/Windows/Fonts/Deng.ttf"),
+    "darwin": ("/Library/Fonts/Arial Unicode.ttf",
+               "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+               "/Library/Fonts/Songti.ttf", "~/Library/Fonts/simkai.ttf"),
+    "linux": ("/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+              "/usr/share/fonts/google-droid/DroidSansFallbackFull.ttf",
+              "/usr/share/fonts/opentype/noto/NotoSansSC-Regular.otf",
+              "/usr/share/fonts/noto-cjk/NotoSansSC-Regular.otf",
+              "/usr/share/fonts/truetype/arphic/ukai.ttf",
+              "~/.local/share/fonts/simkai.ttf", "~/.fonts/simkai.ttf"),
+}
+
+
+def font_candidates(configured=CHINESE_FONT_PATH):
+    """按优先级列出候选字体路径：配置的路径、RESUME_FONT、当前平台的常见字体"""
+    candidates = [configured]
+    if os.environ.get("RESUME_FONT"):
+        candidates.append(os.environ["RESUME_FONT"])
+    platform = "win32" if sys.platform.startswith("win") else sys.platform
+    platform = "linux" if platform.startswith(("linux", "freebsd")) else platform
+    candidates.extend(os.path.expanduser(path) for path in FONT_CANDIDATES.get(platform, ()))
+    return [path for path in dict.fromkeys(candidates) if path]
+
+
+def discover_fonts(configured=CHINESE_FONT_PATH):
+    """存在的候选字体路径（按优先级）"""
+    return [path for path in font_candidates(configured) if os.path.isfile(path)]
+
+
+_FONT_DIGESTS = {} # (绝对路径, 大小, 修改时间) -> 字体文件的 SHA-256
+_FONT_DIGESTS_LOCK = threading.Lock()
+
+
+def font_digest(path):
+    """字体文件内容的 SHA-256；按路径、大小和修改时间在进程内缓存，文件不变时只读一次
+
+    用作 PDF 缓存和字宽表的键；文件不存在时返回空字符串。
+    """
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = _FONT_DIGESTS.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        with _FONT_DIGESTS_LOCK:
+            _FONT_DIGESTS[key] = digest
+    return digest
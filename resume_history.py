@@ -0,0 +1,47 @@
+"""撤销/重做历史。
+
+每一步保存一对修改记录（与自动保存日志相同的格式）：正向记录和它的逆操作。
+记录只引用被替换下来的条目字典或整份数据，不做深拷贝——界面总是用新字典
+替换条目而不是原地修改，因此旧对象可以安全地共享。每次撤销或重做都是 O(1)。
+"""
+from collections import deque
+
+
+class EditHistory:
+
+    def __init__(self, limit=10000):
+        self._undo = deque(maxlen=limit)
+        self._redo = []
+
+    def push(self, record, inverse):
+        """记录一次新的修改；之前撤销掉的步骤不能再重做"""
+        self._undo.append((record, inverse))
+        self._redo.clear()
+
+    def undo(self):
+        """返回需要执行的逆操作（没有可撤销的步骤时返回 None）"""
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self._redo.append(step)
+        return step[1]
+
+    def redo(self):
+        """返回需要重新执行的正向记录（没有可重做的步骤时返回 None）"""
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        return step[0]
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
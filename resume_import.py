@@ -0,0 +1,352 @@
+"""批量导入：逐行读取 CSV / JSON Lines（例如招聘系统导出的候选人数据），转换为 resume_data。
+
+整个过程是一条生成器流水线，任何时候只在内存中保留当前这一份简历::
+
+    读取行 (read_csv_rows / read_jsonl_rows)
+      -> 按列映射构建简历 (map_rows)
+      -> 合并同一候选人的连续行 (group_rows，可选)
+      -> 规范化并校验 (import_resumes 产出 ImportedResume)
+      -> 存入简历库 (import_into_library) 或直接渲染
+
+列映射把源数据的列名对应到目标字段，目标字段的写法：
+
+* ``name`` 或 ``personal_info.name`` —— 个人信息字段；
+* ``education.0.school`` —— 某部分第 N 个条目的字段（从 0 开始）；
+* ``skills[].name`` —— 单元格按分隔符（默认 ``;``）拆成多个条目，第 i 个值
+  写入第 i 个条目，可与同一部分的其他 ``[]`` 列组合（如 ``skills[].level``）。
+
+未提供映射时，列名本身就是目标字段；无法识别的列被忽略。JSON Lines 中
+已经是 save_resume 格式（包含 personal_info）的行直接使用。
+"""
+import csv
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+from resume_schema import ENTRY_FIELDS, PERSONAL_INFO_FIELDS, SECTION_KEYS, normalize_resume_data
+from resume_validation import VALIDATOR, ValidationError
+
+IMPORT_FORMATS = {".csv": "csv", ".tsv": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+DEFAULT_SEPARATOR = ";"
+
+# line: 简历在源文件中的起始行号；resume_data 无法解析或结构类型不对时为 None，errors 说明原因
+ImportedResume = namedtuple("ImportedResume", "line resume_data errors")
+ImportStats = namedtuple("ImportStats", "read saved skipped")
+
+# 列映射编译后的目标：kind 为 personal / entry / split
+_Target = namedtuple("_Target", "kind section index field")
+
+_PERSONAL_TARGET = re.compile(r"(?:personal_info\.)?(\w+)")
+_ENTRY_TARGET = re.compile(r"(\w+)\.(\d+)\.(\w+)")
+_SPLIT_TARGET = re.compile(r"(\w+)\[\]\.(\w+)")
+
+
+class ImportFormatError(ValueError):
+    """映射或文件格式无效（无法开始导入）"""
+
+
+def parse_target(target):
+    """解析目标字段写法，无效时抛出 ImportFormatError"""
+    match = _SPLIT_TARGET.fullmatch(target) or _ENTRY_TARGET.fullmatch(target)
+    if match:
+        section, field = match.group(1), match.group(match.lastindex)
+        if section not in ENTRY_FIELDS or field not in ENTRY_FIELDS[section]:
+            raise ImportFormatError(f"未知的目标字段: {target}")
+        if match.re is _SPLIT_TARGET:
+            return _Target("split", section, None, field)
+        return _Target("entry", section, int(match.group(2)), field)
+    match = _PERSONAL_TARGET.fullmatch(target)
+    if match and match.group(1) in PERSONAL_INFO_FIELDS:
+        return _Target("personal", None, None, match.group(1))
+    raise ImportFormatError(f"未知的目标字段: {target}")
+
+
+def compile_mapping(mapping):
+    """{列名: 目标字段} -> [(列名, _Target)]；mapping 为 None 时返回 None（按列名自动识别）"""
+    if mapping is None:
+        return None
+    return [(column, parse_target(target)) for column, target in mapping.items()]
+
+
+def _auto_mapping(columns):
+    """没有映射时：能识别为目标字段的列名按原样映射"""
+    compiled = []
+    for column in columns:
+        try:
+            compiled.append((column, parse_target(column)))
+        except ImportFormatError:
+            pass
+    return compiled
+
+
+# --- 读取 ---
+def read_csv_rows(path, delimiter=",", encoding="utf-8-sig"):
+    """逐行产出 (起始行号, {列名: 值})"""
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        reader.fieldnames # 先读入表头，行号从数据的第一行算起
+        line = reader.line_num + 1
+        for row in reader:
+            yield line, row
+            line = reader.line_num + 1
+
+
+def read_jsonl_rows(path, encoding="utf-8"):
+    """逐行产出 (行号, 对象)；无法解析的行产出 (行号, ImportFormatError)，不中断导入"""
+    with open(path, 'r', encoding=encoding) as f:
+        for line, text in enumerate(f, 1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError as e:
+                yield line, ImportFormatError(f"JSON 解析失败: {e}")
+                continue
+            if not isinstance(row, dict):
+                yield line, ImportFormatError("每行应为一个 JSON 对象")
+                continue
+            yield line, row
+
+
+def read_rows(path, fmt=None, encoding=None):
+    """按格式（默认由扩展名判断）逐行读取"""
+    fmt = fmt or IMPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt in ("csv", "tsv"):
+        return read_csv_rows(path, "\t" if fmt == "tsv" else ",", encoding or "utf-8-sig")
+    if fmt == "jsonl":
+        return read_jsonl_rows(path, encoding or "utf-8")
+    raise ImportFormatError(f"无法识别的导入格式: {path}（支持 {', '.join(IMPORT_FORMATS)}）")
+
+
+# --- 映射与合并 ---
+def _text(value):
+    if value is None:
+        return ""
+    return value.strip() if isinstance(value, str) else str(value)
+
+
+def _map_row(row, targets, separator):
+    """把一行按映射转换为未规范化的 resume_data（条目为字典）"""
+    personal = {}
+    entries = {} # section -> {序号: 条目字典}
+    for column, target in targets:
+        value = row.get(column)
+        if target.kind == "personal":
+            value = _text(value)
+            if value:
+                personal[target.field] = value
+            continue
+        if target.kind == "entry":
+            value = _text(value)
+            if value:
+                entries.setdefault(target.section, {}).setdefault(target.index, {})[target.field] = value
+            continue
+        values = value if isinstance(value, list) else _text(value).split(separator)
+        section = entries.setdefault(target.section, {})
+        for index, item in enumerate(values):
+            item = _text(item)
+            if item:
+                section.setdefault(index, {})[target.field] = item
+    resume_data = {"personal_info": personal}
+    for section in SECTION_KEYS:
+        indexed = entries.get(section, {})
+        resume_data[section] = [indexed[index] for index in sorted(indexed)]
+    return resume_data
+
+
+def map_rows(rows, mapping=None, separator=DEFAULT_SEPARATOR):
+    """(行号, 行) -> (行号, resume_data)；解析失败的行原样传递异常对象"""
+    targets = compile_mapping(mapping)
+    columns = None
+    for line, row in rows:
+        if isinstance(row, Exception):
+            yield line, row
+            continue
+        if mapping is None and "personal_info" in row:
+            yield line, row # 已经是 save_resume 的格式
+            continue
+        if targets is None or (mapping is None and row.keys() != columns):
+            columns = row.keys()
+            targets = _auto_mapping(columns) # CSV 的列固定，只识别一次；JSONL 的键变化时重新识别
+        yield line, _map_row(row, targets, separator)
+
+
+def _merge(into, other):
+    """把同一候选人的另一行合并进来：个人信息取先出现的非空值，条目依次追加
+
+    每行重复出现的相同条目（例如每行都带着的技能列）只保留一个。
+    """
+    personal = into["personal_info"]
+    for field, value in other["personal_info"].items():
+        if value and not personal.get(field):
+            personal[field] = value
+    for section in SECTION_KEYS:
+        entries = into[section]
+        entries.extend(entry for entry in other[section] if entry not in entries)
+
+
+def group_rows(mapped, key_of):
+    """合并 key_of(resume_data) 相同的连续行（源文件需按该键排好序）
+
+    一些导出格式每个条目占一行（例如每段工作经历一行），候选人的个人信息在
+    每行重复；合并后每个候选人产出一份简历。
+    """
+    current_line = current = current_key = None
+    for line, resume_data in mapped:
+        if isinstance(resume_data, Exception):
+            yield line, resume_data
+            continue
+        key = key_of(resume_data)
+        if current is not None and key == current_key and key:
+            _merge(current, resume_data)
+            continue
+        if current is not None:
+            yield current_line, current
+        current_line, current, current_key = line, resume_data, key
+    if current is not None:
+        yield current_line, current
+
+
+def _personal_field(resume_data, field):
+    """分组键；personal_info 类型不对的行（之后按 "type" 错误拒绝）不参与合并"""
+    personal = resume_data.get("personal_info")
+    return personal.get(field) if isinstance(personal, dict) else None
+
+
+def import_resumes(path, mapping=None, fmt=None, group_by=None, separator=DEFAULT_SEPARATOR, encoding=None,
+                   validate=True):
+    """流式导入：逐份产出 ImportedResume(行号, 规范化后的 resume_data, 校验错误)
+
+    group_by 为个人信息字段名（如 "email"）时，合并该字段相同的连续行。无法解析
+    或结构类型不对（field 为 None 的 "type" 错误，无法规范化）的行，resume_data 为 None。
+    """
+    mapped = map_rows(read_rows(path, fmt, encoding), mapping, separator)
+    if group_by:
+        if group_by not in PERSONAL_INFO_FIELDS:
+            raise ImportFormatError(f"group_by 应为个人信息字段: {group_by}")
+        mapped = group_rows(mapped, lambda resume_data: _personal_field(resume_data, group_by))
+    for line, resume_data in mapped:
+        if isinstance(resume_data, Exception):
+            yield ImportedResume(line, None, [ValidationError(None, None, None, None, "parse", str(resume_data))])
+            continue
+        errors = VALIDATOR.validate(resume_data) if validate else []
+        if any(error.code == "type" and error.field is None for error in errors): # 字段值的类型错误可以规范化
+            yield ImportedResume(line, None, errors)
+            continue
+        yield ImportedResume(line, normalize_resume_data(resume_data), errors)
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_into_library(imported, library, batch_size=500, skip_invalid=True, progress=None):
+    """把 import_resumes 的结果分批存入简历库（每批一个事务），返回 ImportStats
+
+    skip_invalid 为 True 时跳过有校验错误的简历；无法解析（resume_data 为 None）的行总是跳过。
+    progress(已读取数, 已保存数) 在每批提交后调用。
+    """
+    read = saved = skipped = 0
+
+    def accepted():
+        nonlocal read, skipped
+        for item in imported:
+            read += 1
+            if item.resume_data is None or (skip_invalid and item.errors):
+                skipped += 1
+                continue
+            yield item.resume_data
+
+    for batch in _batches(accepted(), batch_size):
+        library.save_many(batch)
+        saved += len(batch)
+        if progress is not None:
+            progress(read, saved)
+    return ImportStats(read, saved, skipped)
+
+
+def _parse_mapping(args):
+    mapping = None
+    if args.map_file:
+        with open(args.map_file, 'r', encoding='utf-8') as f:
+            mapping = json.load(f)
+    for item in args.map or ():
+        column, sep, target = item.rpartition("=")
+        if not sep or not column:
+            raise ImportFormatError(f"--map 应为 列名=目标字段: {item}")
+        mapping = {**(mapping or {}), column: target}
+    return mapping
+
+
+def main(argv=None):
+    """命令行：校验并导入到简历库，或为每份简历写出 JSON 文件"""
+    import argparse
+    from resume_library import DEFAULT_LIBRARY_PATH, ResumeLibrary
+    from resume_schema import json_default, safe_name
+    from resume_validation import describe
+
+    parser = argparse.ArgumentParser(prog="resume_builder.py import", description="从 CSV / JSON Lines 批量导入简历")
+    parser.add_argument("input", help="源文件（.csv / .tsv / .jsonl）")
+    parser.add_argument("--format", choices=sorted(set(IMPORT_FORMATS.values())), help="默认由扩展名判断")
+    parser.add_argument("--map", action="append", metavar="列名=目标字段",
+                        help="列映射，可重复，例如 --map 姓名=name --map 技能=skills[].name")
+    parser.add_argument("--map-file", help="JSON 格式的列映射 {列名: 目标字段}")
+    parser.add_argument("--separator", default=DEFAULT_SEPARATOR, help="[] 目标字段的单元格分隔符")
+    parser.add_argument("--group-by", metavar="FIELD", help="合并该个人信息字段相同的连续行，例如 email")
+    parser.add_argument("--encoding", help="源文件编码（CSV 默认 utf-8-sig）")
+    parser.add_argument("--library", nargs="?", const=DEFAULT_LIBRARY_PATH, metavar="DB",
+                        help="存入简历库（默认使用图形界面的简历库）")
+    parser.add_argument("--json-dir", metavar="DIR", help="为每份简历写出 <姓名>_简历.json")
+    parser.add_argument("--keep-invalid", action="store_true", help="有校验错误的简历也导入")
+    args = parser.parse_args(argv)
+
+    try:
+        mapping = _parse_mapping(args)
+        imported = import_resumes(args.input, mapping, args.format, args.group_by, args.separator, args.encoding)
+
+        def report(items):
+            for item in items:
+                for error in item.errors:
+                    print(f"第 {item.line} 行: {describe(error)}", file=sys.stderr)
+                yield item
+
+        imported = report(imported)
+        if args.library:
+            with ResumeLibrary(args.library) as library:
+                stats = import_into_library(imported, library, skip_invalid=not args.keep_invalid)
+            print(f"读取 {stats.read} 份，存入简历库 {stats.saved} 份，跳过 {stats.skipped} 份")
+        elif args.json_dir:
+            os.makedirs(args.json_dir, exist_ok=True)
+            read = written = 0
+            for item in imported:
+                read += 1
+                if item.resume_data is None or (item.errors and not args.keep_invalid):
+                    continue
+                name = f"{safe_name(item.resume_data['personal_info']['name'])}_{item.line}_简历.json"
+                with open(os.path.join(args.json_dir, name), 'w', encoding='utf-8') as f:
+                    json.dump(item.resume_data, f, ensure_ascii=False, indent=4, default=json_default)
+                written += 1
+            print(f"读取 {read} 份，写出 {written} 个文件到 {args.json_dir}")
+        else:
+            read = invalid = 0
+            for item in imported:
+                read += 1
+                invalid += bool(item.errors)
+            print(f"读取 {read} 份，{invalid} 份有问题（未导入；使用 --library 或 --json-dir 导入）")
+    except (OSError, ImportFormatError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
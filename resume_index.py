@@ -0,0 +1,238 @@
+"""简历数据的派生索引：技能按类别分组、条目按时间排序、按名称查找。
+
+索引随列表模型的每次修改增量更新（EntryListModel 的插入、更新、删除、移动），
+预览和导出直接读取，不再每次从头分组、排序。
+
+条目在列表中的位置用递增的顺序键表示：插入时取前后两个键的中点，只有两个键
+之间再也放不下时才重新编号整个部分。各个视图是按顺序键（或日期键）排好序的
+列表，用 bisect 维护，行号由顺序键二分得到；每次修改是 O(log n) 次比较加上
+列表插入时的内存移动（与 resume_data 本身的列表相同）。不依赖 PyQt6::
+
+    index = ResumeIndex(resume_data)
+    index.insert("skills", 3, skill)
+    for skill_type, skills in index.skills_by_type(): ...
+    rows = index.chronological_rows("experience")  # 最近的在前
+"""
+import bisect
+import re
+
+from resume_schema import SECTION_KEYS
+
+# 按名称查找时使用的字段
+NAME_FIELDS = {"education": "school", "experience": "company", "projects": "name",
+               "skills": "name", "languages": "name"}
+# 按时间排序时使用的 (开始, 结束) 字段；项目只有一个日期字段，其中可能写了起止两个日期
+DATE_FIELDS = {"education": ("start_year", "end_year"), "experience": ("start_date", "end_date"),
+               "projects": ("date", "date")}
+
+PRESENT_WORDS = ("至今", "现在", "present", "now", "current")
+PRESENT = (9999, 12)
+UNDATED = (0, 0) # 无法解析的日期排在最后（最早）
+_DATE = re.compile(r"(\d{4})(?:\s*[-./年]\s*(\d{1,2}))?")
+
+ORDER_GAP = 1024.0 # 追加条目时顺序键的间隔
+
+
+def _dates(value):
+    """自由格式文本中出现的日期，依次规范为 (年, 月)；只有年份时月份为 0"""
+    dates = [(int(year), min(int(month or 0), 12)) for year, month in _DATE.findall(value)]
+    lowered = value.lower()
+    if any(word in lowered for word in PRESENT_WORDS):
+        dates.append(PRESENT)
+    return dates
+
+
+def date_key(value):
+    """把自由格式的日期规范为可比较的 (年, 月)：2020、2020-08、2020.8、2020年8月、至今
+
+    有多个日期时取第一个；无法解析时为 UNDATED。
+    """
+    dates = _dates(value or "")
+    return dates[0] if dates else UNDATED
+
+
+def date_range_key(start_value, end_value):
+    """条目的 (结束, 开始) 日期键：开始取 start_value 中的第一个日期，结束取 end_value 中的最后一个"""
+    starts = _dates(start_value or "")
+    ends = _dates(end_value or "")
+    start = starts[0] if starts else UNDATED
+    return (ends[-1] if ends else start), start
+
+
+def normalize_name(name):
+    return (name or "").strip().casefold()
+
+
+def _remove_key(keys, key):
+    """从有序列表中删除 key（必须存在）"""
+    del keys[bisect.bisect_left(keys, key)]
+
+
+class SectionIndex:
+    """一个部分的索引；条目按位置操作，与 resume_data[section] 保持一一对应"""
+
+    def __init__(self, section, entries=()):
+        self.section = section
+        self.name_field = NAME_FIELDS[section]
+        self.date_fields = DATE_FIELDS.get(section)
+        self.reset(entries)
+
+    def reset(self, entries):
+        """按 entries 重建（加载、替换整份数据或重新编号时）"""
+        self.order = [] # 与条目列表一一对应的递增顺序键
+        self.records = {} # 顺序键 -> 条目
+        self.by_name = {} # 规范化的名称 -> 有序的顺序键列表
+        self.by_date = [] # 有序的 (负的结束日期, 负的开始日期, 顺序键)：最近的在前，同一时间保持列表顺序
+        self.by_type = {} # 技能类别 -> 有序的顺序键列表
+        self.types = [] # 有序的技能类别
+        for row, entry in enumerate(entries):
+            key = (row + 1) * ORDER_GAP
+            self.order.append(key)
+            self._add(key, entry)
+
+    def __len__(self):
+        return len(self.order)
+
+    # --- 维护 ---
+    def _date_sort_key(self, key, entry):
+        start_field, end_field = self.date_fields
+        (end_year, end_month), (start_year, start_month) = date_range_key(getattr(entry, start_field),
+                                                                          getattr(entry, end_field))
+        return (-end_year, -end_month, -start_year, -start_month, key)
+
+    def _add(self, key, entry):
+        self.records[key] = entry
+        bisect.insort(self.by_name.setdefault(normalize_name(getattr(entry, self.name_field)), []), key)
+        if self.date_fields is not None:
+            bisect.insort(self.by_date, self._date_sort_key(key, entry))
+        if self.section == "skills":
+            keys = self.by_type.get(entry.type)
+            if keys is None:
+                keys = self.by_type[entry.type] = []
+                bisect.insort(self.types, entry.type)
+            bisect.insort(keys, key)
+
+    def _discard(self, key):
+        entry = self.records.pop(key)
+        name = normalize_name(getattr(entry, self.name_field))
+        _remove_key(self.by_name[name], key)
+        if not self.by_name[name]:
+            del self.by_name[name]
+        if self.date_fields is not None:
+            _remove_key(self.by_date, self._date_sort_key(key, entry))
+        if self.section == "skills":
+            keys = self.by_type[entry.type]
+            _remove_key(keys, key)
+            if not keys:
+                del self.by_type[entry.type]
+                _remove_key(self.types, entry.type)
+        return entry
+
+    def _new_key(self, row):
+        """插入到 row 处的条目的顺序键；相邻键之间放不下时返回 None"""
+        if not self.order:
+            return ORDER_GAP
+        if row >= len(self.order):
+            return self.order[-1] + ORDER_GAP
+        after = self.order[row]
+        before = self.order[row - 1] if row > 0 else after - 2 * ORDER_GAP
+        key = (before + after) / 2
+        return key if before < key < after else None
+
+    def insert(self, row, entry):
+        key = self._new_key(row)
+        if key is None: # 同一位置反复插入把间隔用完了：整体重新编号
+            entries = self.entries()
+            entries.insert(row, entry)
+            self.reset(entries)
+            return
+        self.order.insert(row, key)
+        self._add(key, entry)
+
+    def update(self, row, entry):
+        key = self.order[row]
+        self._discard(key)
+        self._add(key, entry)
+
+    def delete(self, row):
+        return self._discard(self.order.pop(row))
+
+    def move(self, source_row, target_row):
+        """把条目移动到 target_row（移动后的位置），与 list.insert(target, list.pop(source)) 相同"""
+        entry = self.delete(source_row)
+        self.insert(target_row, entry)
+
+    # --- 查询 ---
+    def entries(self):
+        return [self.records[key] for key in self.order]
+
+    def matches(self, entries):
+        """索引中的条目与 entries 逐个是同一对象（记录不可变，修改总是换成新记录）"""
+        records = self.records
+        return len(entries) == len(self.order) and all(
+            records[key] is entry for key, entry in zip(self.order, entries))
+
+    def row_of(self, key):
+        return bisect.bisect_left(self.order, key)
+
+    def chronological_rows(self):
+        """按时间排序后各条目的当前行号：结束时间最近的在前，其次是开始时间"""
+        return [self.row_of(item[-1]) for item in self.by_date]
+
+    def find(self, name):
+        """名称（忽略大小写和首尾空格）相同的条目的行号"""
+        return [self.row_of(key) for key in self.by_name.get(normalize_name(name), ())]
+
+    def skills_by_type(self):
+        """[(类别, [技能, ...])]，类别按名称排序，同一类别内保持列表顺序"""
+        records = self.records
+        return [(skill_type, [records[key] for key in self.by_type[skill_type]]) for skill_type in self.types]
+
+
+class ResumeIndex:
+    """整份简历的索引：每个条目类部分一个 SectionIndex"""
+
+    def __init__(self, resume_data=None, sections=SECTION_KEYS):
+        self.sections = {section: SectionIndex(section, resume_data[section] if resume_data else ())
+                         for section in sections}
+
+    def reset(self, resume_data):
+        for section, index in self.sections.items():
+            index.reset(resume_data[section])
+
+    def reset_section(self, section, entries):
+        self.sections[section].reset(entries)
+
+    def matches(self, resume_data):
+        """各部分的条目与 resume_data 一致（用于在读取前发现未同步的修改）"""
+        return all(index.matches(resume_data[section]) for section, index in self.sections.items())
+
+    def __getitem__(self, section):
+        return self.sections[section]
+
+    # --- 修改（与 EntryListModel 的操作一一对应）---
+    def insert(self, section, row, entry):
+        self.sections[section].insert(row, entry)
+
+    def update(self, section, row, entry):
+        self.sections[section].update(row, entry)
+
+    def delete(self, section, row):
+        return self.sections[section].delete(row)
+
+    def move(self, section, source_row, target_row):
+        self.sections[section].move(source_row, target_row)
+
+    # --- 查询 ---
+    def skills_by_type(self):
+        return self.sections["skills"].skills_by_type()
+
+    def chronological_rows(self, section):
+        return self.sections[section].chronological_rows()
+
+    def chronological(self, section):
+        index = self.sections[section]
+        return [index.records[item[-1]] for item in index.by_date]
+
+    def find(self, section, name):
+        return self.sections[section].find(name)
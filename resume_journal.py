@@ -0,0 +1,153 @@
+"""自动保存：追加式修改日志 + 定期快照，异常退出后可恢复。
+
+每个运行中的编辑器在 AUTOSAVE_DIR 下拥有一个会话目录，其中包含：
+
+* ``snapshot.json`` —— 某一时刻的完整简历数据及其对应的日志序号；
+* ``journal.jsonl`` —— 快照之后的每次修改，一行一条记录；
+* ``session.lock`` —— 会话存活期间持有的文件锁。
+
+正常退出时会话目录被删除。启动时若发现锁已失效的会话目录，即说明
+上次异常退出，可以用快照加日志重放恢复数据。
+"""
+import json
+import os
+import shutil
+import time
+
+from resume_paths import APP_DATA_DIR
+from resume_schema import json_default, make_entry
+
+AUTOSAVE_DIR = os.path.join(APP_DATA_DIR, "autosave")
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.jsonl"
+LOCK_FILE = "session.lock"
+
+
+def apply_record(resume_data, record):
+    """把一条修改记录应用到 resume_data（就地修改）"""
+    op = record["op"]
+    if op == "personal":
+        resume_data["personal_info"][record["field"]] = record["value"]
+        return
+    section = record["section"]
+    entries = resume_data[section]
+    if op == "insert":
+        entries.insert(record["index"], make_entry(section, record["entry"]))
+    elif op == "update":
+        entries[record["index"]] = make_entry(section, record["entry"])
+    elif op == "delete":
+        del entries[record["index"]]
+    elif op == "move":
+        entries.insert(record["to"], entries.pop(record["from"]))
+    elif op == "reorder":
+        entries[:] = [entries[i] for i in record["order"]]
+    else:
+        raise ValueError(f"未知的日志记录类型: {op}")
+
+
+def _try_lock(f):
+    """尝试以非阻塞方式锁定已打开的文件，成功返回 True"""
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _write_json_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, default=json_default)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ResumeJournal:
+    """当前编辑器会话的自动保存日志"""
+
+    def __init__(self, directory=AUTOSAVE_DIR, compact_every=200):
+        self.compact_every = compact_every
+        self.session_dir = os.path.join(directory, f"session-{int(time.time() * 1000)}-{os.getpid()}")
+        os.makedirs(self.session_dir)
+        self._lock = open(os.path.join(self.session_dir, LOCK_FILE), 'w')
+        _try_lock(self._lock)
+        self._journal = open(os.path.join(self.session_dir, JOURNAL_FILE), 'a', encoding='utf-8')
+        self.seq = 0
+        self.records_since_snapshot = 0
+
+    def append(self, record):
+        """追加一条修改记录，代价只与这次修改的大小有关"""
+        self.seq += 1
+        self._journal.write(json.dumps({"seq": self.seq, **record}, ensure_ascii=False,
+                                       default=json_default) + "\n")
+        self._journal.flush()
+        self.records_since_snapshot += 1
+
+    @property
+    def needs_compaction(self):
+        return self.records_since_snapshot >= self.compact_every
+
+    def compact(self, resume_data):
+        """写入完整快照并清空日志
+
+        快照记录了它包含的最后一个序号，先原子替换快照再截断日志；两步之间
+        崩溃时，重放会跳过快照中已包含的记录。
+        """
+        _write_json_atomic(os.path.join(self.session_dir, SNAPSHOT_FILE),
+                           {"seq": self.seq, "resume_data": resume_data})
+        self._journal.seek(0)
+        self._journal.truncate()
+        self.records_since_snapshot = 0
+
+    def close(self):
+        """正常退出：删除本会话的自动保存数据"""
+        self._journal.close()
+        self._lock.close()
+        shutil.rmtree(self.session_dir, ignore_errors=True)
+
+
+def find_crashed_sessions(directory=AUTOSAVE_DIR):
+    """返回异常退出留下的会话目录（最新的在前）"""
+    if not os.path.isdir(directory):
+        return []
+    crashed = []
+    for name in os.listdir(directory):
+        session_dir = os.path.join(directory, name)
+        lock_path = os.path.join(session_dir, LOCK_FILE)
+        if not name.startswith("session-") or not os.path.isfile(lock_path):
+            continue
+        with open(lock_path, 'a') as f:
+            if _try_lock(f): # 锁可以获得，说明持有它的进程已不在
+                crashed.append(session_dir)
+    return sorted(crashed, key=os.path.getmtime, reverse=True)
+
+
+def recover_session(session_dir):
+    """用快照和日志重放恢复会话中的简历数据；没有可恢复内容时返回 None"""
+    snapshot_path = os.path.join(session_dir, SNAPSHOT_FILE)
+    if not os.path.isfile(snapshot_path):
+        return None
+    with open(snapshot_path, 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    resume_data, last_seq = snapshot["resume_data"], snapshot["seq"]
+    journal_path = os.path.join(session_dir, JOURNAL_FILE)
+    if os.path.isfile(journal_path):
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError: # 崩溃时写了一半的最后一行
+                    break
+                if record["seq"] > last_seq:
+                    apply_record(resume_data, record)
+    return resume_data
+
+
+def discard_session(session_dir):
+    shutil.rmtree(session_dir, ignore_errors=True)
@@ -0,0 +1,222 @@
+"""两遍排版：先测量所有块的高度（不绘制），再按保持规则分页，最后一次性绘制。
+
+简历内容被拆成一串块（Block）：章节标题、每个条目、每段正文。块由若干行
+（Row）组成，行高在测量时确定，行内的绘制操作使用绝对 x 坐标，y 坐标在分页
+时才确定。分页规则：
+
+* ``keep_together`` —— 整块放在同一页；块本身比一页还高时才在行之间拆开；
+* ``keep_with_next`` —— 与下一块的开头放在同一页（章节标题不会落在页底）；
+* 可拆分的块至少把前 ``ORPHAN_ROWS`` 行与前面的内容放在同一页；
+* 新页顶部的空白行（段前间距）被丢弃。
+
+正文段落两端对齐（与 multi_cell 的 'J' 相同）：折行产生的行对齐到右边距，
+每段（以及段内换行前）的最后一行左对齐。含中日韩文字的行加大字间距，
+其余的行加大词间距。
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict, namedtuple
+
+from resume_linebreak import contains_cjk
+from resume_trace import instant, span
+
+# 可拆分的块在当前页至少要放下的行数
+ORPHAN_ROWS = 2
+# 两端对齐时最多补足的空白占行宽的比例；更短的行（如长网址前被挤短的行）保持左对齐
+MAX_JUSTIFY_SLACK = 0.25
+
+# 单行文本：font 为 (样式, 字号)，color 为 RGB；x 为绝对坐标，y 由所在行决定；
+# align 为 L / C / R，或 J（两端对齐）
+TextOp = namedtuple("TextOp", "x w h text align font color link")
+# 从左边距到右边距的水平线，画在所在行的顶部
+RuleOp = namedtuple("RuleOp", "color width")
+# 一行：高度和这一行的绘制操作（没有操作的行是空白间距）
+Row = namedtuple("Row", "height ops")
+
+# 放置结果：页码（从 0 开始）、行顶部的 y 坐标、行
+Placement = namedtuple("Placement", "page y row")
+
+
+def spacer(height):
+    return Row(height, ())
+
+
+class Block:
+    """一组需要一起分页的行"""
+    __slots__ = ("rows", "height", "keep_together", "keep_with_next")
+
+    def __init__(self, rows, keep_together=True, keep_with_next=False):
+        self.rows = rows
+        self.height = sum(row.height for row in rows)
+        self.keep_together = keep_together
+        self.keep_with_next = keep_with_next
+
+
+class Measurer:
+    """按字体的字宽表计算折行（中日韩禁则见 resume_linebreak），不需要 fpdf 实例
+
+    advances 为 GlyphAdvances；cell_margin 是 fpdf 绘制单元格时文字两侧的内边距，
+    可用宽度为 w - 2 * cell_margin（与 multi_cell 相同）。只读，可在线程间共享。
+    """
+
+    def __init__(self, advances, font_key="", cell_margin=1.0):
+        self.advances = advances
+        self.font_key = font_key # 标识字体文件，参与布局缓存的键
+        self.cell_margin = cell_margin
+
+    def paragraph(self, text, font, color, h, x, w, justify=False):
+        """把一段文本测量成若干行，每行一个 TextOp；justify 时折行产生的行两端对齐"""
+        return self.paragraphs((text,), font, color, h, x, w, justify)
+
+    def paragraphs(self, texts, font, color, h, x, w, justify=False):
+        """一次测量多段同样式的文本（例如一个条目的所有描述行），返回所有行
+
+        font 为 (样式, 字号)，各样式共用一个字体文件。换行符分开的每一部分单独
+        折行，其最后一行不两端对齐。
+        """
+        parts = [part for text in texts for part in text.split("\n")]
+        rows = []
+        for lines in self.advances.break_paragraphs(parts, font[1], w - 2 * self.cell_margin):
+            last = len(lines) - 1
+            rows += [Row(h, (TextOp(x, w, h, line, 'J' if justify and i < last else 'L', font, color, ""),))
+                     for i, line in enumerate(lines)]
+        return rows
+
+
+CacheInfo = namedtuple("CacheInfo", "hits misses size maxsize")
+
+
+def content_digest(*parts):
+    """任意 JSON 可序列化数据的摘要，用作布局缓存的键"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).digest()
+
+
+class LayoutCache:
+    """测量结果的有界 LRU 缓存（线程安全）
+
+    值是测量好的块列表。块在分页和绘制时只被读取，因此可以在多次导出、
+    甚至同一文档的多个位置之间共享。
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = build() # 测量在锁外进行，多个线程可以同时排版
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, len(self._entries), self.maxsize)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+def _lead_height(blocks, i, body_height):
+    """blocks[i] 开始时当前页至少需要的高度（包含 keep_with_next 连带的块）"""
+    block = blocks[i]
+    if block.keep_together and block.height <= body_height:
+        height = block.height
+    else:
+        height = sum(row.height for row in block.rows[:ORPHAN_ROWS])
+    if block.keep_with_next and i + 1 < len(blocks):
+        height += _lead_height(blocks, i + 1, body_height)
+    return height
+
+
+def paginate(blocks, top, bottom):
+    """计算每一行所在的页和 y 坐标（只做算术，不绘制）
+
+    top/bottom 为页面正文区域的上下边界；返回 Placement 列表和总页数。
+    """
+    body_height = bottom - top
+    placements = []
+    page, y = 0, top
+    for i, block in enumerate(blocks):
+        if y > top and y + _lead_height(blocks, i, body_height) > bottom:
+            page, y = page + 1, top
+            instant("page_break", "page", page=page + 1, block=i, reason="keep")
+        for row in block.rows:
+            if y > top and y + row.height > bottom:
+                page, y = page + 1, top
+                instant("page_break", "page", page=page + 1, block=i, reason="overflow")
+            if y == top and page > 0 and not row.ops:
+                continue # 新页顶部不保留空白间距
+            placements.append(Placement(page, y, row))
+            y += row.height
+    return placements, page + 1
+
+
+def _justified_cell(pdf, op, y):
+    """绘制两端对齐的一行：含中日韩文字（或没有空格）时把空白平均分到字与字之间，
+    否则平均分到空格上（fpdf 的 cell 不支持 'J'，逐词用 text 绘制）"""
+    available = op.w - 2 * pdf.c_margin
+    slack = available - pdf.get_string_width(op.text)
+    words = op.text.split(" ")
+    if len(op.text) < 2 or not 0 < slack <= available * MAX_JUSTIFY_SLACK:
+        pdf.cell(op.w, op.h, op.text, align='L', link=op.link)
+    elif len(words) == 1 or contains_cjk(op.text):
+        pdf.set_char_spacing(slack * pdf.k / (len(op.text) - 1)) # 字间距以磅为单位，最后一个字之后的不可见
+        pdf.cell(op.w, op.h, op.text, align='L', link=op.link)
+        pdf.set_char_spacing(0)
+    else:
+        gap = pdf.get_string_width(" ") + slack / (len(words) - 1)
+        x = op.x + pdf.c_margin
+        baseline = y + 0.5 * op.h + 0.3 * pdf.font_size # 与 cell 的文字基线相同
+        for word in words:
+            pdf.text(x, baseline, word)
+            x += pdf.get_string_width(word) + gap
+        if op.link:
+            pdf.link(op.x, y, op.w, op.h, op.link)
+
+
+def paint(pdf, placements, page_count):
+    """按分页结果绘制到 pdf（pdf 需已设好页边距，且尚未添加页面）"""
+    pdf.set_auto_page_break(False, margin=pdf.b_margin) # 分页已经算好
+    current_page = -1
+    font = color = None
+    for placement in placements:
+        while current_page < placement.page:
+            with span("add_page", "page", page=current_page + 2): # 同时绘制上一页的页脚
+                pdf.add_page()
+            current_page += 1
+            font = color = None # 页脚会改变字体和颜色
+        for op in placement.row.ops:
+            if isinstance(op, RuleOp):
+                pdf.set_draw_color(*op.color)
+                pdf.set_line_width(op.width)
+                pdf.line(pdf.l_margin, placement.y, pdf.w - pdf.r_margin, placement.y)
+                continue
+            if op.font != font:
+                pdf.set_chinese_font(*op.font)
+                font = op.font
+            if op.color != color:
+                pdf.set_text_color(*op.color)
+                color = op.color
+            pdf.set_xy(op.x, placement.y)
+            if op.align == 'J':
+                _justified_cell(pdf, op, placement.y)
+            else:
+                pdf.cell(op.w, op.h, op.text, align=op.align, link=op.link)
+    while current_page < page_count - 1: # 空简历也至少有一页
+        pdf.add_page()
+        current_page += 1
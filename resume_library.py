@@ -0,0 +1,165 @@
+"""本地简历库：SQLite 存储（每份简历一行，各部分独立成表），FTS5 全文检索。
+
+搜索只读取索引和姓名，完整的简历数据在打开时才按 id 读取。
+"""
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+from resume_paths import APP_DATA_DIR
+from resume_schema import ENTRY_FIELDS, PERSONAL_INFO_FIELDS, RECORD_TYPES, SECTION_KEYS, normalize_resume_data
+
+DEFAULT_LIBRARY_PATH = os.path.join(APP_DATA_DIR, "library.db")
+
+# trigram 分词按三字切分，可检索中文子串；更短的查询词退回到 LIKE 扫描
+MIN_FTS_TERM_LENGTH = 3
+
+SearchHit = namedtuple("SearchHit", "resume_id name snippet")
+LibraryEntry = namedtuple("LibraryEntry", "resume_id name updated_at")
+
+
+def _create_schema(conn):
+    personal_columns = ", ".join(f"{field} TEXT NOT NULL DEFAULT ''" for field in PERSONAL_INFO_FIELDS)
+    conn.execute(f"""CREATE TABLE IF NOT EXISTS resumes (
+        id INTEGER PRIMARY KEY, {personal_columns}, updated_at REAL NOT NULL)""")
+    for section, fields in ENTRY_FIELDS.items():
+        columns = ", ".join(f"{field} TEXT NOT NULL DEFAULT ''" for field in fields)
+        conn.execute(f"""CREATE TABLE IF NOT EXISTS {section} (
+            resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+            seq INTEGER NOT NULL, {columns}, PRIMARY KEY (resume_id, seq)) WITHOUT ROWID""")
+    # rowid 与 resumes.id 相同；body 汇总各部分条目的标题和描述
+    conn.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts
+        USING fts5(name, summary, body, tokenize='trigram')""")
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def _fts_body(resume_data):
+    """各部分中参与检索的文本"""
+    parts = []
+    for section in SECTION_KEYS:
+        for entry in resume_data[section]:
+            parts.extend(entry.values())
+    return "\n".join(part for part in parts if part)
+
+
+class ResumeLibrary:
+    """SQLite 简历库（一个实例对应一个连接，只在创建它的线程中使用）"""
+
+    def __init__(self, path=DEFAULT_LIBRARY_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        with self.conn:
+            _create_schema(self.conn)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- 写入 ---
+    def save(self, resume_data, resume_id=None):
+        """保存一份简历并返回其 id；resume_id 不为空时覆盖已有记录"""
+        with self.conn:
+            return self._save(normalize_resume_data(resume_data), resume_id)
+
+    def save_many(self, resumes):
+        """在一个事务中批量保存（用于批量导入），返回新 id 列表"""
+        with self.conn:
+            return [self._save(normalize_resume_data(resume_data), None) for resume_data in resumes]
+
+    def _save(self, resume_data, resume_id):
+        personal = resume_data["personal_info"]
+        values = [_text(personal.get(field)) for field in PERSONAL_INFO_FIELDS]
+        now = time.time()
+        if resume_id is None:
+            placeholders = ", ".join("?" for _ in range(len(PERSONAL_INFO_FIELDS) + 1))
+            cursor = self.conn.execute(
+                f"INSERT INTO resumes ({', '.join(PERSONAL_INFO_FIELDS)}, updated_at) VALUES ({placeholders})",
+                values + [now])
+            resume_id = cursor.lastrowid
+        else:
+            assignments = ", ".join(f"{field} = ?" for field in PERSONAL_INFO_FIELDS)
+            cursor = self.conn.execute(f"UPDATE resumes SET {assignments}, updated_at = ? WHERE id = ?",
+                                       values + [now, resume_id])
+            if cursor.rowcount == 0:
+                raise KeyError(f"简历库中不存在 id={resume_id}")
+            for section in SECTION_KEYS:
+                self.conn.execute(f"DELETE FROM {section} WHERE resume_id = ?", (resume_id,))
+            self.conn.execute("DELETE FROM resume_fts WHERE rowid = ?", (resume_id,))
+
+        for section, fields in ENTRY_FIELDS.items():
+            rows = [(resume_id, seq, *entry.values()) for seq, entry in enumerate(resume_data[section])]
+            if rows:
+                placeholders = ", ".join("?" for _ in range(len(fields) + 2))
+                self.conn.executemany(
+                    f"INSERT INTO {section} (resume_id, seq, {', '.join(fields)}) VALUES ({placeholders})", rows)
+        self.conn.execute("INSERT INTO resume_fts (rowid, name, summary, body) VALUES (?, ?, ?, ?)",
+                          (resume_id, personal["name"], personal["summary"], _fts_body(resume_data)))
+        return resume_id
+
+    def delete(self, resume_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM resume_fts WHERE rowid = ?", (resume_id,))
+            self.conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+
+    # --- 读取 ---
+    def load(self, resume_id):
+        """读取一份完整的简历数据（条目为记录）"""
+        row = self.conn.execute(f"SELECT {', '.join(PERSONAL_INFO_FIELDS)} FROM resumes WHERE id = ?",
+                                (resume_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"简历库中不存在 id={resume_id}")
+        resume_data = {"personal_info": dict(zip(PERSONAL_INFO_FIELDS, row))}
+        for section, fields in ENTRY_FIELDS.items():
+            rows = self.conn.execute(
+                f"SELECT {', '.join(fields)} FROM {section} WHERE resume_id = ? ORDER BY seq", (resume_id,))
+            resume_data[section] = [RECORD_TYPES[section].from_values(values) for values in rows]
+        return resume_data
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def list_resumes(self, limit=100, offset=0):
+        """按最近修改时间列出简历"""
+        rows = self.conn.execute(
+            "SELECT id, name, updated_at FROM resumes ORDER BY updated_at DESC LIMIT ? OFFSET ?", (limit, offset))
+        return [LibraryEntry(*row) for row in rows]
+
+    def search(self, query, limit=50):
+        """全文检索姓名、简介和各部分内容；多个词之间为“与”关系"""
+        terms = query.split()
+        if not terms:
+            return [SearchHit(entry.resume_id, entry.name, "") for entry in self.list_resumes(limit)]
+        long_terms = [t for t in terms if len(t) >= MIN_FTS_TERM_LENGTH]
+        short_terms = [t for t in terms if len(t) < MIN_FTS_TERM_LENGTH]
+
+        conditions, params = [], []
+        if long_terms:
+            conditions.append("resume_fts MATCH ?")
+            params.append(" AND ".join('"' + t.replace('"', '""') + '"' for t in long_terms))
+        for term in short_terms:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append("(name LIKE ? ESCAPE '\\' OR summary LIKE ? ESCAPE '\\' OR body LIKE ? ESCAPE '\\')")
+            params.extend([pattern] * 3)
+        if long_terms:
+            columns = "rowid, name, snippet(resume_fts, -1, '[', ']', '…', 16)"
+            order = "rank"
+        else:
+            columns = "rowid, name, substr(summary, 1, 40)"
+            order = "rowid DESC"
+        rows = self.conn.execute(
+            f"SELECT {columns} FROM resume_fts WHERE {' AND '.join(conditions)} ORDER BY {order} LIMIT ?",
+            params + [limit])
+        return [SearchHit(*row) for row in rows]
@@ -0,0 +1,246 @@
+"""中日韩文字与拉丁文字混排的折行。
+
+折行单位：汉字（及假名、全角符号）各自成为一个单位，拉丁单词和数字连在一起；
+空格处可以断行，断在行尾的空格被丢弃。禁则（kinsoku）：
+
+* 行首不能出现的标点（，。、；：？！）」》… 等）与前一个单位连在一起，
+  放不下时连同前一个字一起移到下一行；
+* 行尾不能出现的标点（（「《“ 等）与后一个单位连在一起。
+
+单个单位比一行还宽时（很长的网址等）按字符断开。
+
+字宽来自字体的字宽表（1/1000 em，与 fpdf 的 get_string_width 一致）。每个字体的
+字宽表按字体文件摘要保存在 GLYPH_WIDTHS_DIR 中，之后的运行直接读取，不需要
+为测量解析字体。本模块不依赖 fpdf::
+
+    advances = glyph_advances(font_path, parse=lambda path: _parsed_font(path)[0].cw)
+    lines = advances.break_lines(text, size_pt=10, width_mm=170)
+"""
+import json
+import os
+import threading
+
+from resume_fonts import font_digest
+from resume_paths import APP_DATA_DIR
+
+GLYPH_WIDTHS_DIR = os.path.join(APP_DATA_DIR, "glyph_widths")
+
+PT_PER_MM = 72 / 25.4
+
+# 不能出现在行首的字符
+NO_LINE_START = frozenset(
+    "!%),.:;?]}¢°·’”‰′″℃、。〃々〉》」』】〕〗〙〛〞〟ゝゞヽヾ"
+    "ぁぃぅぇぉっゃゅょゎゕゖァィゥェォッャュョヮヵヶ・ー゠"
+    "！％），．：；？］｝｡｣､･ｧｨｩｪｫｬｭｮｯｰ～…‥—–")
+# 不能出现在行尾的字符
+NO_LINE_END = frozenset("([{£¥‘“〈《「『【〔〖〘〚〝（［｛｟｢＄")
+
+# 每个字都可以单独断开的文字（汉字、假名、谚文、全角符号）
+_BREAK_ANYWHERE = ((0x1100, 0x11FF), (0x2E80, 0xA4CF), (0xAC00, 0xD7A3), (0xF900, 0xFAFF),
+                   (0xFE30, 0xFE4F), (0xFF00, 0xFFEF), (0x20000, 0x3FFFD))
+
+
+def _breaks_anywhere(ch):
+    code = ord(ch)
+    if code < 0x1100:
+        return False
+    for low, high in _BREAK_ANYWHERE:
+        if low <= code <= high:
+            return True
+    return False
+
+
+def contains_cjk(text):
+    """text 中是否有可以逐字断开的文字（两端对齐时据此选择加大字间距还是词间距）"""
+    return any(_breaks_anywhere(ch) for ch in text)
+
+
+def _can_break(before, after):
+    """相邻两个非空格字符之间能否断行"""
+    if after in NO_LINE_START or before in NO_LINE_END:
+        return False
+    if _breaks_anywhere(before) or _breaks_anywhere(after):
+        return True
+    # 中文里常用的半角引号、省略号、破折号（”…— 等）之后或（“‘ 等）之前也可以断开；
+    # 纯 ASCII 的组合（网址、a.b）不断开
+    return (before in NO_LINE_START or after in NO_LINE_END) and not (before.isascii() and after.isascii())
+
+
+def segment(text):
+    """把一行文本（不含换行符）切分为折行单位：[(文本, 是否空格)]"""
+    units = []
+    current = ""
+    for ch in text:
+        if ch == " " or ch == "\t" or ch == "　":
+            if current:
+                units.append((current, False))
+                current = ""
+            if units and units[-1][1]:
+                units[-1] = (units[-1][0] + ch, True)
+            else:
+                units.append((ch, True))
+        elif current and _can_break(current[-1], ch):
+            units.append((current, False))
+            current = ch
+        else:
+            current += ch
+    if current:
+        units.append((current, False))
+    return units
+
+
+class GlyphAdvances:
+    """一个字体的字宽表（1/1000 em），以及按文本缓存的宽度（线程安全：只有字典读写）"""
+
+    MAX_MEMO = 100_000
+
+    def __init__(self, widths, default=0, digest=""):
+        self.widths = widths # 码位 -> 字宽
+        self.default = default # 字体中没有的字符
+        self.digest = digest
+        self._memo = {}
+
+    @classmethod
+    def from_font_widths(cls, cw, digest=""):
+        """由 fpdf 的 TTFFont.cw（defaultdict）构建"""
+        default = cw.default_factory() if getattr(cw, "default_factory", None) else 0
+        return cls(dict(cw), default, digest)
+
+    # --- 持久化：连续码位的相同字宽合并为区间，中文字体的表只有几十 KB ---
+    def to_json(self):
+        ranges = []
+        for code in sorted(self.widths):
+            width = self.widths[code]
+            if ranges and ranges[-1][1] == code - 1 and ranges[-1][2] == width:
+                ranges[-1][1] = code
+            else:
+                ranges.append([code, code, width])
+        return {"digest": self.digest, "default": self.default, "ranges": ranges}
+
+    @classmethod
+    def from_json(cls, data):
+        widths = {}
+        for start, end, width in data["ranges"]:
+            widths.update(dict.fromkeys(range(start, end + 1), width))
+        return cls(widths, data["default"], data.get("digest", ""))
+
+    # --- 测量 ---
+    def text_width(self, text):
+        """text 的宽度（1/1000 em）"""
+        width = self._memo.get(text)
+        if width is None:
+            get, default = self.widths.get, self.default
+            width = sum(get(ord(ch), default) for ch in text)
+            if len(self._memo) >= self.MAX_MEMO:
+                self._memo.clear()
+            self._memo[text] = width
+        return width
+
+    def limit(self, size_pt, width_mm):
+        """width_mm 对应的字宽单位数"""
+        return width_mm * PT_PER_MM * 1000 / size_pt
+
+    def break_lines(self, text, size_pt, width_mm):
+        """text 在 width_mm 内折行后的各行；换行符处强制断行，空行保留"""
+        limit = self.limit(size_pt, width_mm)
+        lines = []
+        for part in text.split("\n"):
+            self._break_part(segment(part), limit, lines)
+        return lines
+
+    def break_paragraphs(self, texts, size_pt, width_mm):
+        """一次测量多段文本（同一字号和宽度），返回每段的行列表"""
+        limit = self.limit(size_pt, width_mm)
+        result = []
+        for text in texts:
+            lines = []
+            for part in text.split("\n"):
+                self._break_part(segment(part), limit, lines)
+            result.append(lines)
+        return result
+
+    def _break_part(self, units, limit, lines):
+        """贪心折行：能放下就放在当前行，否则在前一个单位之后断开"""
+        text_width = self.text_width
+        parts, width = [], 0
+        has_content = False # 当前行除了段首缩进之外是否已有内容
+        wrapped = False # 是否已经折过行
+        space, space_width = "", 0 # 行内待定的空格：后面还有内容时才保留
+        for text, is_space in units:
+            unit_width = text_width(text)
+            if is_space:
+                if has_content:
+                    space, space_width = text, unit_width
+                elif not wrapped: # 段首的缩进保留，折行后新行开头的空格丢弃
+                    parts.append(text)
+                    width += unit_width
+                continue
+            if width + space_width + unit_width <= limit:
+                if space:
+                    parts.append(space)
+                    width += space_width
+                parts.append(text)
+                width += unit_width
+            else:
+                if has_content:
+                    lines.append("".join(parts))
+                    parts, width, wrapped = [], 0, True
+                if width + unit_width <= limit:
+                    parts.append(text)
+                    width += unit_width
+                else: # 一个单位放不下一整行，按字符断开
+                    for ch in text:
+                        ch_width = text_width(ch)
+                        if width + ch_width > limit and parts:
+                            lines.append("".join(parts))
+                            parts, width, wrapped = [], 0, True
+                        parts.append(ch)
+                        width += ch_width
+            has_content = True
+            space, space_width = "", 0
+        if parts or not has_content:
+            lines.append("".join(parts))
+
+
+_ADVANCES = {} # 字体文件摘要 -> GlyphAdvances
+_ADVANCES_LOCK = threading.Lock()
+
+
+def _table_path(digest, directory):
+    return os.path.join(directory, f"{digest}.json")
+
+
+def glyph_advances(font_path, parse, directory=GLYPH_WIDTHS_DIR):
+    """字体的字宽表：依次取自进程内缓存、持久化的文件，最后才调用 parse(font_path)
+
+    parse 返回 fpdf 的字宽表（码位 -> 字宽的 defaultdict）；解析得到的表会写入
+    directory，写入失败不影响使用。
+    """
+    digest = font_digest(font_path)
+    advances = _ADVANCES.get(digest)
+    if advances is not None:
+        return advances
+    with _ADVANCES_LOCK:
+        advances = _ADVANCES.get(digest)
+        if advances is not None:
+            return advances
+        path = _table_path(digest, directory) if digest else None
+        if path is not None:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    advances = GlyphAdvances.from_json(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError):
+                advances = None
+        if advances is None:
+            advances = GlyphAdvances.from_font_widths(parse(font_path), digest)
+            if path is not None:
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                try:
+                    os.makedirs(directory, exist_ok=True)
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(advances.to_json(), f, separators=(',', ':'))
+                    os.replace(tmp_path, path)
+                except OSError:
+                    pass
+        _ADVANCES[digest] = advances
+    return advances
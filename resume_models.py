@@ -0,0 +1,148 @@
+"""条目列表的 Qt 模型：直接以 resume_data 中的列表为数据源，增删改只通知受影响的行。"""
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, pyqtSignal
+
+from resume_schema import make_entry
+
+
+# --- 列表中每个条目的显示文本（条目为 resume_schema 中的记录，字段总是存在） ---
+def format_education(edu):
+    degree_str = f" ({edu.degree})" if edu.degree else ""
+    return f"{edu.school} - {edu.major}{degree_str} [{edu.start_year}-{edu.end_year}]"
+
+def format_experience(exp):
+    return f"{exp.company} - {exp.position} [{exp.start_date} 至 {exp.end_date}]"
+
+def format_project(project):
+    date_str = f" ({project.date})" if project.date else ""
+    return f"{project.name}{date_str} - {project.role}"
+
+def format_skill(skill):
+    level_str = f" ({skill.level})" if skill.level and skill.level != '未指定' else ""
+    type_str = f" [{skill.type}]" # 显示类别以便区分
+    return f"{skill.name}{level_str}{type_str}"
+
+def format_language(language):
+    level_str = f" ({language.level})" if language.level and language.level != '未指定' else ""
+    return f"{language.name}{level_str}"
+
+ENTRY_FORMATTERS = {
+    "education": format_education,
+    "experience": format_experience,
+    "projects": format_project,
+    "skills": format_skill,
+    "languages": format_language,
+}
+
+
+class EntryListModel(QAbstractListModel):
+    """resume_data[section] 的列表模型
+
+    所有修改都应通过本模型进行：添加、更新、删除和拖放移动各自只发出
+    一次针对单行的通知，视图不再需要整体重建。UserRole 返回条目在
+    列表中的当前索引。给定 resume_index（resume_index.ResumeIndex）时，每次修改
+    同时更新该部分的派生索引。
+    """
+    entryMoved = pyqtSignal(int, int) # 原索引, 新索引
+    entriesReordered = pyqtSignal(list) # 新顺序：第 i 个条目原来的索引
+
+    def __init__(self, section, resume_data, parent=None, resume_index=None):
+        super().__init__(parent)
+        self.section = section
+        self.format_entry = ENTRY_FORMATTERS[section]
+        self.resume_data = resume_data
+        self.resume_index = resume_index
+
+    @property
+    def entries(self):
+        return self.resume_data[self.section]
+
+    def reset(self, resume_data):
+        """切换到新的简历数据（加载或清空后调用）"""
+        self.beginResetModel()
+        self.resume_data = resume_data
+        if self.resume_index is not None:
+            self.resume_index.reset_section(self.section, self.entries)
+        self.endResetModel()
+
+    # --- QAbstractListModel 接口 ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.entries):
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.format_entry(self.entries[index.row()])
+        if role == Qt.ItemDataRole.UserRole:
+            return index.row()
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled # 允许放到条目之间
+        return (Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+                | Qt.ItemFlag.ItemIsDragEnabled)
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def moveRows(self, sourceParent, sourceRow, count, destinationParent, destinationChild):
+        """拖放排序：移动单个条目，只通知这一行的位置变化"""
+        if count != 1 or sourceParent.isValid() or destinationParent.isValid():
+            return False
+        if not 0 <= sourceRow < len(self.entries) or not 0 <= destinationChild <= len(self.entries):
+            return False
+        if not self.beginMoveRows(QModelIndex(), sourceRow, sourceRow, QModelIndex(), destinationChild):
+            return False
+        target = destinationChild - 1 if destinationChild > sourceRow else destinationChild
+        self.entries.insert(target, self.entries.pop(sourceRow))
+        if self.resume_index is not None:
+            self.resume_index.move(self.section, sourceRow, target)
+        self.endMoveRows()
+        self.entryMoved.emit(sourceRow, target)
+        return True
+
+    # --- 编辑操作 ---
+    def append_entry(self, entry):
+        self.insert_entry(len(self.entries), entry)
+
+    def insert_entry(self, row, entry):
+        entry = make_entry(self.section, entry)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.entries.insert(row, entry)
+        if self.resume_index is not None:
+            self.resume_index.insert(self.section, row, entry)
+        self.endInsertRows()
+
+    def replace_entry(self, row, entry):
+        entry = make_entry(self.section, entry)
+        self.entries[row] = entry
+        if self.resume_index is not None:
+            self.resume_index.update(self.section, row, entry)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove_entry(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        removed = self.entries.pop(row)
+        if self.resume_index is not None:
+            self.resume_index.delete(self.section, row)
+        self.endRemoveRows()
+        return removed
+
+    def move_entry(self, source_row, target_row):
+        """把条目移动到 target_row（移动后的位置）"""
+        destination = target_row + 1 if target_row > source_row else target_row
+        return self.moveRows(QModelIndex(), source_row, 1, QModelIndex(), destination)
+
+    def reorder_entries(self, order):
+        """按 order 重新排列全部条目（order[i] 为新的第 i 个条目原来的索引）"""
+        if sorted(order) != list(range(len(self.entries))):
+            return False
+        self.layoutAboutToBeChanged.emit()
+        self.entries[:] = [self.entries[i] for i in order]
+        if self.resume_index is not None:
+            self.resume_index.reset_section(self.section, self.entries)
+        self.layoutChanged.emit()
+        self.entriesReordered.emit(list(order))
+        return True
@@ -0,0 +1,7 @@
+"""应用数据目录（简历库、自动保存、字宽表、PDF 缓存都放在这里）。
+
+只有路径常量，不依赖任何其他模块，渲染、导出和编辑器都可以直接导入。
+"""
+import os
+
+APP_DATA_DIR = os.path.join(os.path.expanduser("~"), ".resume_builder")
@@ -0,0 +1,165 @@
+"""已渲染 PDF 的磁盘缓存（按内容寻址）。
+
+PDF 输出对相同输入是逐字节确定的（resume_render 固定了创建时间），因此可以
+按内容缓存：键是 (文档内容, 模板, 字体文件摘要, 渲染器版本) 的 SHA-256，由
+resume_render.pdf_cache_key 计算。任何一项变化都会得到新的键，旧文件不再被
+读取，最终被淘汰；缓存不需要手动失效。
+
+文件布局为 ``<目录>/<键的前两位>/<键>.<页数>.pdf``。读取命中时更新文件的
+修改时间，总大小超过上限时按修改时间从旧到新删除（LRU）。多个进程可以共用
+同一目录：写入先写临时文件再原子替换，读到被其他进程删除的文件按未命中处理。
+不依赖 fpdf 或 PyQt6::
+
+    cache = PDFCache()
+    result = render_result(resume_data, cache=cache)
+    print(cache.stats())
+"""
+import os
+import threading
+from collections import namedtuple
+
+from resume_paths import APP_DATA_DIR
+
+PDF_CACHE_DIR = os.path.join(APP_DATA_DIR, "pdf_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+CacheStats = namedtuple("CacheStats", "hits misses evictions entries size max_bytes")
+
+
+class PDFCache:
+    """有大小上限的 PDF 磁盘缓存（线程安全；统计只针对当前实例）"""
+
+    def __init__(self, directory=PDF_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+        self._size = None # 缓存文件总大小；首次写入时扫描目录得到
+
+    def _shard(self, key):
+        return os.path.join(self.directory, key[:2])
+
+    def _find(self, key):
+        """键对应的缓存文件路径和页数，不存在时为 (None, 0)"""
+        prefix = key + "."
+        try:
+            names = os.listdir(self._shard(key))
+        except OSError:
+            return None, 0
+        for name in names:
+            if name.startswith(prefix) and name.endswith(".pdf"):
+                try:
+                    pages = int(name[len(prefix):-4])
+                except ValueError:
+                    continue
+                return os.path.join(self._shard(key), name), pages
+        return None, 0
+
+    def get(self, key):
+        """返回 (PDF 字节, 页数)，未命中时返回 None"""
+        path, pages = self._find(key)
+        data = None
+        if path is not None:
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                os.utime(path) # 最近使用
+            except OSError: # 刚被其他进程淘汰
+                data = None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return data, pages
+
+    def put(self, key, data, pages):
+        """写入一份 PDF（bytes 或 bytearray），必要时淘汰最久未用的文件"""
+        if len(data) > self.max_bytes:
+            return
+        shard = self._shard(key)
+        path = os.path.join(shard, f"{key}.{pages}.pdf")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        old_path, _ = self._find(key) # 覆盖已有的键时，总大小要扣除旧文件
+        old_size = 0
+        if old_path is not None:
+            try:
+                old_size = os.path.getsize(old_path)
+            except OSError:
+                old_path = None
+        try:
+            os.makedirs(shard, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError: # 缓存写不进去不影响导出
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        if old_path is not None and old_path != path: # 页数不同，文件名也不同
+            try:
+                os.remove(old_path)
+            except OSError:
+                old_size = 0
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        """所有缓存文件的 (路径, 大小, 修改时间)"""
+        entries = []
+        try:
+            shards = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for shard in shards:
+            try:
+                with os.scandir(os.path.join(self.directory, shard)) as it:
+                    for entry in it:
+                        if entry.name.endswith(".pdf"):
+                            try:
+                                stat = entry.stat()
+                            except OSError:
+                                continue
+                            entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                continue
+        return entries
+
+    def _evict(self):
+        """按修改时间从旧到新删除，直到总大小不超过上限的 90%（调用方持有锁）"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        target = self.max_bytes * 0.9
+        for path, file_size, _ in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= file_size
+            self.evictions += 1
+        self._size = size
+
+    def stats(self):
+        entries = self._entries()
+        return CacheStats(self.hits, self.misses, self.evictions, len(entries),
+                          sum(size for _, size, _ in entries), self.max_bytes)
+
+    def clear(self):
+        """删除所有缓存文件并清零统计"""
+        with self._lock:
+            for path, _, _ in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+            self.hits = self.misses = self.evictions = 0
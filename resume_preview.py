@@ -0,0 +1,86 @@
+"""简历文本预览：按部分从文档树生成文本片段，并按内容缓存，未改动的部分不重新生成。"""
+from resume_document import DEFAULT_SECTION_ORDER, build_section
+from resume_export import text_section
+from resume_templates import compile_template
+
+PREVIEW_TITLE = "=========== 简历预览 ===========\n\n"
+
+# 预览由以下片段拼接而成，顺序与 PDF 模板相同；个人信息拆成页眉和简介两段，
+# 输入简介时只需重新生成简介片段
+PREVIEW_SECTIONS = DEFAULT_SECTION_ORDER
+
+# 每个数据字段影响的预览片段
+SECTION_OF_PERSONAL_FIELD = {
+    "name": "header", "email": "header", "phone": "header", "address": "header",
+    "linkedin": "header", "github": "header", "summary": "summary",
+}
+
+
+def _fragment(resume_data, section, index=None):
+    """一个部分的预览片段：与纯文本导出相同，空的条目类部分显示占位提示"""
+    node = build_section(resume_data, section, index)
+    if section == "header":
+        return PREVIEW_TITLE + text_section(node)
+    if not node.blocks and section != "summary":
+        return f"\n--- {node.title} ---\n (未添加)\n"
+    return text_section(node)
+
+
+def _freeze(value):
+    """把 dict/list 转成可比较的元组，作为缓存键（字符串本身不复制）"""
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _content_key(resume_data, section):
+    personal = resume_data["personal_info"]
+    if section == "header":
+        return _freeze({k: v for k, v in personal.items() if k != "summary"})
+    if section == "summary":
+        return personal["summary"]
+    return _freeze(resume_data[section])
+
+
+class PreviewRenderer:
+    """生成预览片段列表，缓存每个部分的 (内容键, 片段)
+
+    片段顺序取自模板的部分顺序，与导出的 PDF 一致。
+    """
+
+    def __init__(self, template="default"):
+        self.sections = compile_template(template).sections
+        self._cache = {}
+
+    def render_fragments(self, resume_data, dirty=None, index=None):
+        """返回与 self.sections 一一对应的片段列表
+
+        dirty 为可能改动过的部分集合；不在其中且已缓存的部分直接复用，
+        连内容键都不重新计算。dirty 为 None 时逐个按内容键比较。index 为
+        与 resume_data 同步的 ResumeIndex，可省略。
+        """
+        fragments = []
+        for section in self.sections:
+            cached = self._cache.get(section)
+            if cached is not None and dirty is not None and section not in dirty:
+                fragments.append(cached[1])
+                continue
+            key = _content_key(resume_data, section)
+            if cached is None or cached[0] != key:
+                cached = self._cache[section] = (key, _fragment(resume_data, section, index))
+            fragments.append(cached[1])
+        return fragments
+
+    def render(self, resume_data, dirty=None, index=None):
+        """返回完整的预览文本"""
+        return "".join(self.render_fragments(resume_data, dirty, index))
+
+    def clear(self):
+        self._cache.clear()
+
+
+def preview_text(resume_data, template="default"):
+    """一次性生成完整预览文本（不使用缓存）"""
+    return PreviewRenderer(template).render(resume_data)
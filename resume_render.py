@@ -0,0 +1,456 @@
+"""简历渲染核心：将 resume_data 字典渲染为 PDF 字节，不依赖 PyQt6。
+
+图形界面、命令行和后台任务共用这里的渲染逻辑::
+
+    python -m resume_builder render in.json out.pdf
+
+嵌入到其他服务时不需要临时文件：render_resume 返回字节，render_result 还会给出
+页数和大小，并可直接写入调用方提供的二进制流（BytesIO、套接字、sys.stdout.buffer）::
+
+    result = render_result(resume_data, stream=sys.stdout.buffer)
+    print(result.pages, result.size, file=sys.stderr)
+
+相同的简历数据和模板总是得到逐字节相同的 PDF（创建时间固定），传入
+resume_pdf_cache.PDFCache 时重复导出直接读取磁盘缓存。
+"""
+import copy
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import fpdf
+from fpdf import FPDF
+from fpdf.enums import TextEmphasis
+from fontTools import ttLib
+
+from resume_layout import Block, LayoutCache, Measurer, Row, content_digest, paginate, paint
+from resume_linebreak import glyph_advances
+from resume_document import Entry, Header, Paragraph, SkillGroup, build_document
+from resume_fonts import CHINESE_FONT_PATH, discover_fonts, font_candidates, font_digest
+from resume_templates import compile_template
+from resume_trace import instant, span
+
+# --- 中文字体设置（字体路径在 resume_fonts.py 中配置）---
+CHINESE_FONT_NAME = 'chinese'
+
+PAGE_BOTTOM_MARGIN = 15 # 正文区域到页面底部的距离，页脚画在其中（毫米）
+
+# 排版或绘制的输出有变化时加 1，使磁盘缓存中的旧 PDF 失效
+RENDERER_VERSION = 3
+
+# 写入 PDF 的创建时间。fpdf 默认使用当前时间，同一份简历每次导出的字节都不同；
+# 固定后输出只取决于内容。设置了 SOURCE_DATE_EPOCH（可复现构建的约定）时使用它
+if os.environ.get("SOURCE_DATE_EPOCH", "").isdigit():
+    CREATION_DATE = datetime.fromtimestamp(int(os.environ["SOURCE_DATE_EPOCH"]), timezone.utc)
+else:
+    CREATION_DATE = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+# data: PDF 字节（写入 stream 时为 None，不另外保留一份）；pages: 页数；size: 字节数
+PDFResult = namedtuple("PDFResult", "data pages size")
+
+
+class RenderError(Exception):
+    """渲染失败（例如中文字体无法加载）"""
+
+
+class RenderCancelled(RenderError):
+    """渲染被调用方取消"""
+
+
+# --- 进程级字体缓存 ---
+# 每个 TTF 文件在进程内只解析一次（cmap、字宽表、字体描述），所有 PDF 实例和
+# 常规/粗体/斜体别名共享这些只读表；每个文档只另建轻量的字体对象和子集映射。
+_FONT_CACHE = {}  # 绝对路径 -> (已解析的字体模板, 字体文件字节)
+_FONT_CACHE_LOCK = threading.Lock()
+
+
+def _parsed_font(path):
+    """返回 path 对应的已解析字体，首次调用时解析并缓存"""
+    key = os.path.abspath(path)
+    cached = _FONT_CACHE.get(key)
+    if cached is not None:
+        return cached
+    with _FONT_CACHE_LOCK:
+        cached = _FONT_CACHE.get(key)
+        if cached is None:
+            prototype = FPDF()
+            prototype.add_font(CHINESE_FONT_NAME, '', key)
+            with open(key, 'rb') as f:
+                font_bytes = f.read()
+            cached = _FONT_CACHE[key] = (prototype.fonts[CHINESE_FONT_NAME], font_bytes)
+    return cached
+
+
+def warm_fonts(*paths):
+    """预先解析字体（默认为中文字体），供后台进程在启动时调用。失败时抛出异常"""
+    for path in paths or (CHINESE_FONT_PATH,):
+        _parsed_font(path)
+
+
+def locate_font():
+    """确定导出使用的中文字体并预先解析，返回字体路径
+
+    依次尝试配置的字体和自动发现的系统字体，选中第一个能解析且包含中文字形的
+    字体作为 CHINESE_FONT_PATH。都不可用时抛出 RenderError。
+    图形界面在窗口显示后于后台线程调用，之后的首次导出不再解析字体。
+    """
+    global CHINESE_FONT_PATH
+    problems = []
+    for path in discover_fonts(CHINESE_FONT_PATH):
+        with span("load_fonts", "font", path=path, purpose="validate") as trace_args:
+            try:
+                font, _ = _parsed_font(path)
+            except Exception as e:
+                problems.append(f"{path}: {e}")
+                trace_args["error"] = str(e)
+                continue
+        if ord('中') not in font.cmap:
+            problems.append(f"{path}: 字体不包含中文字形")
+            continue
+        CHINESE_FONT_PATH = path
+        return path
+    tried = "\n".join(problems or font_candidates(CHINESE_FONT_PATH))
+    raise RenderError(f"未找到可用的中文字体，已尝试:\n{tried}")
+
+
+def add_cached_font(pdf, family, style, path):
+    """与 pdf.add_font 等价，但复用进程级缓存中已解析的字体表"""
+    template, font_bytes = _parsed_font(path)
+    fontkey = f"{family.lower()}{style}"
+    if fontkey in pdf.fonts:
+        return
+    try:
+        font = copy.copy(template)  # 共享 cmap / cw / glyph_ids
+        font.desc = copy.copy(template.desc)  # 输出时会写入对象编号，不能共享
+        font.i = len(pdf.fonts) + 1
+        font.fontkey = fontkey
+        font.emphasis = TextEmphasis.coerce(style)
+        # 输出时 fpdf 会就地裁剪 ttfont 生成子集，因此每个文档需要独立的 TTFont；
+        # 从内存中的字节懒加载，只读取表目录，代价很小
+        font.ttfont = ttLib.TTFont(io.BytesIO(font_bytes), recalcTimestamp=False,
+                                   fontNumber=template.collection_font_number, lazy=True)
+        font.missing_glyphs = []
+        font.biggest_size_pt = 0
+        font._hbfont = None
+        font.subset = copy.deepcopy(template.subset, {id(template): font})
+    except AttributeError:
+        # fpdf2 内部结构不同（版本差异）时退回到常规加载
+        pdf.add_font(family, style, path)
+        return
+    pdf.fonts[fontkey] = font
+
+
+class PDF(FPDF):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_creation_date(CREATION_DATE)
+        # 添加中文字体（解析结果在进程内共享）
+        self.font_error = None
+        with span("load_fonts", "font", path=CHINESE_FONT_PATH) as trace_args:
+            try:
+                add_cached_font(self, CHINESE_FONT_NAME, '', CHINESE_FONT_PATH)
+                add_cached_font(self, CHINESE_FONT_NAME, 'B', CHINESE_FONT_PATH) # 粗体
+                add_cached_font(self, CHINESE_FONT_NAME, 'I', CHINESE_FONT_PATH) # 斜体
+                self.font_added = True
+            except Exception as e:
+                self.font_error = str(e)
+                trace_args["error"] = self.font_error
+                self.font_added = False
+
+    def header(self):
+        pass
+
+    def footer(self):
+        self.set_y(-15) # 距离底部1.5厘米
+        if self.font_added:
+            self.set_font(CHINESE_FONT_NAME, '', 8) # 页脚使用普通字体
+        else:
+            self.set_font('Arial', 'I', 8) # Fallback
+        self.set_text_color(128, 128, 128) # 灰色页脚
+        self.cell(0, 10, f'第 {self.page_no()} 页', 0, 0, 'C')
+
+    def set_chinese_font(self, style='', size=12):
+        """设置中文字体（如果已加载）"""
+        if self.font_added:
+            try:
+                self.set_font(CHINESE_FONT_NAME, style, size)
+            except RuntimeError: # 字体可能不支持该样式，回退到常规样式
+                 instant("font_style_fallback", "font", style=style)
+                 self.set_font(CHINESE_FONT_NAME, '', size)
+        else:
+            self.set_font('Arial', style, size) # Fallback
+
+    def multi_cell_chinese(self, w, h, txt, border=0, align='J', fill=False):
+        """支持中文的 multi_cell"""
+        if self.font_added:
+            self.multi_cell(w, h, txt, border, align, fill)
+        else:
+            instant("missing_font", "font", text=txt[:30])
+            self.multi_cell(w, h, txt, border, align, fill)
+
+    def cell_chinese(self, w, h=0, txt="", border=0, ln=0, align="", fill=False, link=""):
+         """支持中文的 cell"""
+         if self.font_added:
+             self.cell(w, h, txt, border, ln, align, fill, link)
+         else:
+            instant("missing_font", "font", text=txt[:30])
+            self.cell(w, h, txt, border, ln, align, fill, link)
+
+
+def resolve_template(template):
+    """模板名、模板字典或已编译的模板 -> CompiledTemplate"""
+    try:
+        return compile_template(template)
+    except KeyError:
+        raise RenderError(f"未知模板: {template}") from None
+    except ValueError as e:
+        raise RenderError(f"模板无效: {e}") from None
+
+
+def _entry_header_row(tpl, title, date_info):
+    """条目首行：左侧粗体标题，右侧浅色日期"""
+    return Row(tpl.text["entry_title"].height, (tpl.text_op(title, "entry_title"),
+                                                tpl.text_op(date_info, "date", 'R')))
+
+
+def _paragraph_rows(measurer, tpl, text, role, x=None, w=None, justify=False):
+    style = tpl.text[role]
+    return measurer.paragraph(text, style.font, style.color, style.height,
+                              tpl.left if x is None else x, tpl.width if w is None else w, justify)
+
+
+# --- 布局缓存 ---
+# 每个条目（以及简介、技能分组等）测量出的块按 (类别, 内容, 模板, 字体) 的摘要
+# 缓存；只改了一条经历再导出时，其余条目直接复用上次的折行和高度。
+_LAYOUT_CACHE = LayoutCache(maxsize=4096)
+
+
+def layout_cache_info():
+    """布局缓存的命中统计 (hits, misses, size, maxsize)"""
+    return _LAYOUT_CACHE.info()
+
+
+def _cached_block(measurer, tpl, kind, data, build):
+    """返回 build(measurer, tpl, data) 的结果，内容未变时复用缓存"""
+    key = content_digest(kind, data, tpl.key, measurer.font_key)
+    return _LAYOUT_CACHE.get_or_build(key, lambda: build(measurer, tpl, data))
+
+
+# --- 文档节点的排版函数：返回测量好的块，不绘制 ---
+
+def _header_block(measurer, tpl, header):
+    contact_items = [f"{label}: {value}" for label, value in header.contacts]
+    link_items = [f"{label}: {url}" for label, url in header.links]
+    rows = [tpl.text_row(header.name, "name", 'C'),
+            Row(tpl.spacing["header_gap"], ()),
+            tpl.text_row("  |  ".join(contact_items), "contact", 'C')]
+    if link_items:
+        rows.append(tpl.text_row("  |  ".join(link_items), "contact_link", 'C', link=' '.join(link_items)))
+    rows += tpl.header_rule_rows
+    return Block(rows)
+
+
+def _paragraph_block(measurer, tpl, paragraph):
+    return Block(_paragraph_rows(measurer, tpl, paragraph.text, "paragraph", justify=True), keep_together=False)
+
+
+# 条目类部分在 PDF 中的样式：(副标题角色, 副标题前缀, 描述角色, 描述前缀, 日期格式)
+ENTRY_STYLES = {
+    "education": ("subtitle", "  ", "education_detail", "- ", "{}"),
+    "experience": ("position", "> ", "experience_detail", "- ", "{}"),
+    "projects": ("subtitle", "", "project_detail", "", "({})"),
+}
+
+
+def _entry_block(measurer, tpl, entry, section):
+    subtitle_role, subtitle_prefix, detail_role, detail_prefix, date_format = ENTRY_STYLES[section]
+    rows = [_entry_header_row(tpl, f"* {entry.title}", date_format.format(entry.date) if entry.date else ""),
+            tpl.text_row(f"{subtitle_prefix}{entry.subtitle}", subtitle_role)]
+    if entry.bullets: # 所有描述行一次测量
+        style = tpl.text[detail_role]
+        rows += measurer.paragraphs([f"{detail_prefix}{line}" for line in entry.bullets], style.font, style.color,
+                                    style.height, tpl.left, tpl.width, justify=True)
+    if entry.link:
+        rows += [Row(tpl.spacing["link_before"], ()),
+                 tpl.text_row(f"> 链接: {entry.link}", "project_link", link=entry.link)]
+    rows.append(Row(tpl.spacing["entry_after"], ()))
+    return Block(rows)
+
+
+def _skill_group_block(measurer, tpl, group):
+    """一个技能类别：右对齐的类别名 + 折行的技能列表"""
+    x_pos_skills = tpl.left + tpl.spacing["skill_label_width"]
+    rows = _paragraph_rows(measurer, tpl, ", ".join(group.items), "skill_list",
+                           x=x_pos_skills, w=tpl.left + tpl.width - x_pos_skills)
+    label = tpl.text_op(f"{group.label}:", "skill_label", 'R', w=x_pos_skills - tpl.left - 2)
+    rows[0] = Row(rows[0].height, (label,) + rows[0].ops)
+    rows.append(Row(tpl.spacing["skill_after"], ()))
+    return Block(rows)
+
+
+def _node_block(measurer, tpl, section, node):
+    """一个文档节点的块，内容未变时取自布局缓存"""
+    if isinstance(node, Entry):
+        return _cached_block(measurer, tpl, section, node,
+                             lambda m, t, entry: _entry_block(m, t, entry, section))
+    build = {Header: _header_block, Paragraph: _paragraph_block, SkillGroup: _skill_group_block}[type(node)]
+    return _cached_block(measurer, tpl, type(node).__name__, node, build)
+
+
+def layout_section(measurer, tpl, section):
+    """一个部分的块列表：章节标题（页眉没有）加每个节点一个块；空的部分不输出"""
+    if not section.blocks:
+        return []
+    blocks = [_node_block(measurer, tpl, section.key, node) for node in section.blocks]
+    if section.key == "header":
+        return blocks
+    return [tpl.title_blocks[section.key]] + blocks
+
+
+OUTPUT_STAGE = "生成PDF文件"
+
+
+def _check_cancelled(is_cancelled):
+    if is_cancelled is not None and is_cancelled():
+        raise RenderCancelled("导出已取消")
+
+
+_MEASURER = None
+
+
+def _font_key(path):
+    """字体文件的标识：路径、大小和修改时间（文件被替换后布局缓存随之失效）"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return os.path.abspath(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _measurer():
+    """测量实例（只读，各线程共享），字体不变时在多次导出间复用"""
+    global _MEASURER
+    font_key = _font_key(CHINESE_FONT_PATH)
+    measurer = _MEASURER
+    if measurer is None or measurer.font_key != font_key:
+        measurer = _MEASURER = _new_measurer(font_key)
+    return measurer
+
+
+def _new_measurer(font_key):
+    """按中文字体的字宽表测量；字宽表在磁盘上有缓存时不需要解析字体"""
+    with span("load_fonts", "font", path=CHINESE_FONT_PATH, purpose="measure"):
+        advances = glyph_advances(CHINESE_FONT_PATH, lambda path: _parsed_font(path)[0].cw)
+    return Measurer(advances, font_key, FPDF().c_margin)
+
+
+def build_pdf(resume_data, template="default", progress=None, is_cancelled=None):
+    """排版整份简历，返回尚未序列化的 PDF 对象（参数含义见 build_document_pdf）"""
+    tpl = resolve_template(template)
+    return build_document_pdf(build_document(resume_data, tpl.sections), tpl, progress, is_cancelled)
+
+
+def build_document_pdf(document, template="default", progress=None, is_cancelled=None):
+    """排版文档树，返回尚未序列化的 PDF 对象
+
+    第一遍逐部分测量出块列表（未改动的条目直接取自布局缓存），然后按保持规则
+    分页，最后一次性绘制。文档的部分顺序应与模板一致（由 build_document 按
+    模板顺序构建）。
+    progress(done, total, stage) 在每个部分开始前调用；is_cancelled() 返回真时
+    在下一个部分开始前抛出 RenderCancelled。两者都可能在工作线程中被调用。
+    """
+    tpl = resolve_template(template)
+    total = len(document.sections) + 1
+    pdf = PDF()
+    if not pdf.font_added:
+        raise RenderError(f"无法加载中文字体 '{CHINESE_FONT_PATH}'. PDF导出失败。({pdf.font_error})")
+    pdf.set_margins(tpl.margin, tpl.margin, tpl.margin)
+    pdf.set_auto_page_break(auto=True, margin=PAGE_BOTTOM_MARGIN)
+    measurer = _measurer()
+    blocks = []
+    for done, section in enumerate(document.sections):
+        _check_cancelled(is_cancelled)
+        if progress is not None:
+            progress(done, total, section.title)
+        with span(section.title, "section", key=section.key, items=len(section.blocks)) as trace_args:
+            hits, misses = _LAYOUT_CACHE.hits, _LAYOUT_CACHE.misses
+            section_blocks = layout_section(measurer, tpl, section)
+            trace_args.update(cache_hits=_LAYOUT_CACHE.hits - hits, cache_misses=_LAYOUT_CACHE.misses - misses)
+        blocks.extend(section_blocks)
+    _check_cancelled(is_cancelled)
+    with span("paginate", "layout", blocks=len(blocks)) as trace_args:
+        placements, page_count = paginate(blocks, pdf.t_margin, pdf.h - pdf.b_margin)
+        trace_args["pages"] = page_count
+    with span("paint", "layout", rows=len(placements)):
+        paint(pdf, placements, page_count)
+    return pdf
+
+
+def pdf_cache_key(document, template="default"):
+    """磁盘缓存的键：文档内容、模板、字体文件摘要和渲染器（含 fpdf）版本的 SHA-256
+
+    文档树由简历数据按模板唯一确定，且只包含影响输出的内容，因此以它代替原始数据。
+    """
+    tpl = resolve_template(template)
+    payload = json.dumps([RENDERER_VERSION, fpdf.__version__, tpl.key.hex(), font_digest(CHINESE_FONT_PATH),
+                          document], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _deliver(buffer, pages, stream):
+    if stream is not None:
+        stream.write(buffer)
+        return PDFResult(None, pages, len(buffer))
+    return PDFResult(bytes(buffer), pages, len(buffer))
+
+
+def render_document_result(document, template="default", progress=None, is_cancelled=None, stream=None,
+                           cache=None):
+    """将文档树渲染为 PDF，返回 PDFResult（参数含义见 build_document_pdf）
+
+    stream 为可写的二进制流时，PDF 直接写入其中（不复制为 bytes），结果的 data 为 None。
+    cache 为 PDFCache 时先按内容查找，命中则不再排版；未命中时渲染结果写入缓存。
+    """
+    key = None
+    if cache is not None:
+        with span("pdf_cache.get", "output") as trace_args:
+            key = pdf_cache_key(document, template)
+            cached = cache.get(key)
+            trace_args["hit"] = cached is not None
+        if cached is not None:
+            return _deliver(cached[0], cached[1], stream)
+    with span("render_pdf", "render", name=document.name):
+        pdf = build_document_pdf(document, template, progress, is_cancelled)
+        _check_cancelled(is_cancelled)
+        if progress is not None:
+            progress(len(document.sections), len(document.sections) + 1, OUTPUT_STAGE)
+        with span("pdf.output", "output") as trace_args:
+            buffer = pdf.output() # bytearray
+            trace_args.update(pages=pdf.pages_count, bytes=len(buffer))
+    if key is not None:
+        with span("pdf_cache.put", "output"):
+            cache.put(key, buffer, pdf.pages_count)
+    return _deliver(buffer, pdf.pages_count, stream)
+
+
+def render_document(document, template="default", progress=None, is_cancelled=None):
+    """将文档树渲染为 PDF，返回文件内容字节（参数含义见 build_document_pdf）"""
+    return render_document_result(document, template, progress, is_cancelled).data
+
+
+def render_result(resume_data, template="default", progress=None, is_cancelled=None, stream=None, cache=None):
+    """将简历数据渲染为 PDF，返回带页数和大小的 PDFResult；stream、cache 的含义见 render_document_result"""
+    tpl = resolve_template(template)
+    with span("build_document", "render"):
+        document = build_document(resume_data, tpl.sections)
+    return render_document_result(document, tpl, progress, is_cancelled, stream, cache)
+
+
+def render_resume(resume_data, template="default", progress=None, is_cancelled=None):
+    """将简历数据渲染为 PDF，返回文件内容字节"""
+    return render_result(resume_data, template, progress, is_cancelled).data
@@ -0,0 +1,188 @@
+"""简历数据结构：字段定义、条目记录与补全，不依赖 fpdf 或 PyQt6。"""
+import sys
+
+# 简历数据的完整结构，加载外部数据时用于补全缺失字段
+PERSONAL_INFO_FIELDS = ("name", "email", "phone", "address", "linkedin", "github", "summary")
+SECTION_KEYS = ("education", "experience", "projects", "skills", "languages")
+# 每类条目的字段（与图形界面表单一致）
+ENTRY_FIELDS = {
+    "education": ("school", "major", "degree", "start_year", "end_year", "gpa", "description"),
+    "experience": ("company", "position", "start_date", "end_date", "description"),
+    "projects": ("name", "role", "date", "description", "link"),
+    "skills": ("name", "type", "level"),
+    "languages": ("name", "level"),
+}
+
+
+
+class EntryRecord:
+    """条目记录的基类：每类条目一个子类，字段与 ENTRY_FIELDS 一致
+
+    用 __slots__ 存储字段，比 dict 少占内存；所有字段总是存在且为字符串，
+    读取时无需再给默认值。记录视为不可变，修改请用 replace() 生成新记录。
+    INTERNED 中的字段（学位、技能类别、熟练程度、日期等）取值重复度高，
+    经 sys.intern 后同一取值只保留一个字符串对象。
+    """
+    __slots__ = ()
+    section = None
+    FIELDS = ()
+    INTERNED = ()
+    DEFAULTS = {}
+
+    def __init__(self, **fields):
+        unknown = set(fields).difference(self.FIELDS)
+        if unknown:
+            raise TypeError(f"{type(self).__name__} 没有字段: {', '.join(sorted(unknown))}")
+        for field in self.FIELDS:
+            self._set(field, fields.get(field))
+
+    def _set(self, field, value):
+        if value is None:
+            value = self.DEFAULTS.get(field, "")
+        elif not isinstance(value, str):
+            value = str(value)
+        if field in self.INTERNED:
+            value = sys.intern(value)
+        object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} 不可修改，请使用 replace()")
+
+    @classmethod
+    def from_dict(cls, data):
+        """由 JSON 读出的字典构建；忽略未知字段，缺失的字段取默认值"""
+        record = cls.__new__(cls)
+        for field in cls.FIELDS:
+            record._set(field, data.get(field))
+        return record
+
+    @classmethod
+    def from_values(cls, values):
+        """按 FIELDS 顺序的取值构建（用于数据库行）"""
+        record = cls.__new__(cls)
+        for field, value in zip(cls.FIELDS, values):
+            record._set(field, value)
+        return record
+
+    def values(self):
+        """按 FIELDS 顺序的取值元组"""
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def replace(self, **changes):
+        """返回修改了部分字段的新记录"""
+        return type(self)(**{**self.to_dict(), **changes})
+
+    def __getitem__(self, field):
+        """兼容按键读取：record["school"]"""
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.values() == other.values()
+
+    def __hash__(self):
+        return hash((self.section, self.values()))
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self):
+        return type(self).from_values, (self.values(),)
+
+    # 记录不可变，复制时直接共享
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class Education(EntryRecord):
+    __slots__ = FIELDS = ENTRY_FIELDS["education"]
+    section = "education"
+    INTERNED = frozenset(("degree", "start_year", "end_year"))
+
+
+class Experience(EntryRecord):
+    __slots__ = FIELDS = ENTRY_FIELDS["experience"]
+    section = "experience"
+    INTERNED = frozenset(("position", "start_date", "end_date"))
+
+
+class Project(EntryRecord):
+    __slots__ = FIELDS = ENTRY_FIELDS["projects"]
+    section = "projects"
+    INTERNED = frozenset(("role", "date"))
+
+
+class Skill(EntryRecord):
+    __slots__ = FIELDS = ENTRY_FIELDS["skills"]
+    section = "skills"
+    INTERNED = frozenset(("type", "level"))
+    DEFAULTS = {"type": "未分类", "level": "未指定"}
+
+
+class Language(EntryRecord):
+    __slots__ = FIELDS = ENTRY_FIELDS["languages"]
+    section = "languages"
+    INTERNED = frozenset(("name", "level"))
+    DEFAULTS = {"level": "未指定"}
+
+
+# 部分 -> 条目记录类型
+RECORD_TYPES = {cls.section: cls for cls in (Education, Experience, Project, Skill, Language)}
+
+
+def make_entry(section, entry):
+    """把字典转换为该部分的条目记录（已是记录时原样返回）"""
+    if isinstance(entry, EntryRecord):
+        return entry
+    return RECORD_TYPES[section].from_dict(entry)
+
+
+def json_default(obj):
+    """json.dump 的 default 参数：条目记录序列化为普通字典，保存的 JSON 格式不变"""
+    if isinstance(obj, EntryRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def empty_resume_data():
+    """返回空白的简历数据"""
+    return {
+        "personal_info": {field: "" for field in PERSONAL_INFO_FIELDS},
+        **{key: [] for key in SECTION_KEYS},
+    }
+
+
+def normalize_resume_data(resume_data):
+    """确保 resume_data 包含所有预期的键和列表，个人信息字段为字符串，条目转换为记录（就地补全并返回）"""
+    personal = resume_data.get("personal_info")
+    if not isinstance(personal, dict):
+        personal = resume_data["personal_info"] = {}
+    for field in PERSONAL_INFO_FIELDS:
+        value = personal.get(field)
+        if value is None:
+            personal[field] = ""
+        elif not isinstance(value, str): # 与条目记录相同，所有字段都是字符串
+            personal[field] = str(value)
+    for key in SECTION_KEYS:
+        entries = resume_data.get(key)
+        if not isinstance(entries, list):
+            resume_data[key] = []
+        elif not all(isinstance(entry, EntryRecord) for entry in entries):
+            resume_data[key] = [make_entry(key, entry) for entry in entries
+                                if isinstance(entry, (dict, EntryRecord))]
+    return resume_data
+
+
+def safe_name(name):
+    """由姓名生成可用作文件名的字符串"""
+    return "".join(c for c in name if c.isalnum() or c in (' ', '_')).rstrip() or "未命名"
@@ -0,0 +1,298 @@
+"""本地 HTTP 渲染服务：接收简历 JSON（save_resume 保存的格式），返回 PDF。
+
+渲染在常驻的进程池中进行，每个工作进程启动时加载一次字体（与批量导出相同）。
+同时交给进程池的渲染数由 max_concurrency 限制，其余请求排队；排队数超过
+max_queue 时直接返回 503，由调用方稍后重试。内容相同（模板和请求体的 SHA-256
+相同）且仍在渲染中的请求共用同一次渲染::
+
+    python -m resume_builder serve --port 8765 --workers 4
+    curl --data-binary @张三_简历.json "http://127.0.0.1:8765/render?template=compact" > 张三.pdf
+
+接口：``POST /render``（响应头 X-Resume-Pages 为页数）、``GET /health``（JSON 统计）。
+只实现了 HTTP/1.1 的最小子集（Content-Length、keep-alive），默认只监听回环地址，
+需要对外提供时请在前面放反向代理。
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs
+
+from resume_templates import TEMPLATES
+from resume_validation import VALIDATOR
+
+MAX_BODY = 16 * 1024 * 1024 # 请求体上限（字节）
+MAX_HEADERS = 100
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               411: "Length Required", 413: "Payload Too Large", 422: "Unprocessable Entity",
+               500: "Internal Server Error", 503: "Service Unavailable"}
+
+Request = namedtuple("Request", "method path query headers body keep_alive")
+Response = namedtuple("Response", "status headers body")
+
+
+class RequestError(Exception):
+    """请求无法处理，status 为返回的 HTTP 状态码"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ServiceBusy(Exception):
+    """排队的渲染已达上限"""
+
+
+# --- 工作进程 ---
+def _warm():
+    """空任务：提交到每个工作进程，使其在第一个请求到来前完成初始化"""
+    return os.getpid()
+
+
+def _render_job(body, template):
+    """在工作进程中渲染一份简历 JSON，返回 PDFResult"""
+    from resume_render import render_result
+    from resume_schema import normalize_resume_data
+    return render_result(normalize_resume_data(json.loads(body)), template)
+
+
+# --- 服务 ---
+class RenderService:
+    """进程池 + 并发限制 + 相同请求合并；所有方法都在同一个事件循环中调用"""
+
+    def __init__(self, workers=None, max_concurrency=None, max_queue=32, template="default", mp_context=None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_concurrency = max(1, max_concurrency or self.workers)
+        self.max_queue = max(0, max_queue)
+        self.template = template
+        self.stats = Counter() # rendered / coalesced / rejected / failed
+        self._mp_context = mp_context
+        self._font_path = None
+        self._pool = None
+        self._slots = None
+        self._inflight = {} # 内容哈希 -> 渲染中的 Future
+        self._pending = 0 # 排队和正在渲染的（不重复的）请求数
+
+    async def start(self):
+        """确定字体并启动、预热进程池；字体不可用时抛出 RenderError"""
+        from resume_batch import _prepare_font
+        self._font_path = _prepare_font()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._pool = self._new_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _warm) for _ in range(self.workers)))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _new_pool(self):
+        from resume_batch import _init_worker
+        return ProcessPoolExecutor(self.workers, self._mp_context, _init_worker, (self._font_path, self.template))
+
+    async def render(self, body, template=None):
+        """渲染请求体中的简历 JSON，返回 PDFResult；排队已满时抛出 ServiceBusy"""
+        template = template or self.template
+        key = hashlib.sha256(template.encode("utf-8") + b"\0" + body).hexdigest()
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            if self._pending >= self.max_concurrency + self.max_queue:
+                self.stats["rejected"] += 1
+                raise ServiceBusy(f"渲染队列已满（{self._pending}）")
+            self._pending += 1 # 在任务开始运行之前计数，同一轮事件循环中到达的请求也受限制
+            future = asyncio.ensure_future(self._render(body, template))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        # 某个客户端断开时不取消共用的渲染，其他等待者仍能拿到结果
+        return await asyncio.shield(future)
+
+    def _finish(self, key, future):
+        self._pending -= 1
+        self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is not None: # 取出异常，等待者都已离开时也不告警
+            self.stats["failed"] += 1
+
+    async def _render(self, body, template):
+        async with self._slots:
+            pool = self._pool
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(pool, _render_job, body, template)
+            except BrokenProcessPool:
+                if self._pool is pool: # 工作进程崩溃：换一个新的进程池，本次请求返回错误
+                    pool.shutdown(wait=False)
+                    self._pool = self._new_pool()
+                raise
+        self.stats["rendered"] += 1
+        return result
+
+    def health(self):
+        return {"workers": self.workers, "max_concurrency": self.max_concurrency, "max_queue": self.max_queue,
+                "pending": self._pending, "in_flight": len(self._inflight),
+                **{name: self.stats[name] for name in ("rendered", "coalesced", "rejected", "failed")}}
+
+    # --- HTTP ---
+    async def handle(self, reader, writer):
+        """asyncio.start_server 的连接回调：按顺序处理同一连接上的请求"""
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except RequestError as e: # 请求体可能未读完，回复后关闭连接
+                    await write_response(writer, _error(e.status, str(e)), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                response = await self.dispatch(request)
+                await write_response(writer, response, request.keep_alive)
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request):
+        if request.path == "/health":
+            if request.method != "GET":
+                return _error(405, "只支持 GET", Allow="GET")
+            return _json(200, self.health())
+        if request.path != "/render":
+            return _error(404, f"未知的路径: {request.path}")
+        if request.method != "POST":
+            return _error(405, "只支持 POST", Allow="POST")
+
+        template = request.query.get("template", [self.template])[-1]
+        if template not in TEMPLATES:
+            return _error(400, f"未知的模板: {template}")
+        try:
+            resume_data = json.loads(request.body)
+        except ValueError as e:
+            return _error(400, f"JSON 格式无效: {e}")
+        if not isinstance(resume_data, dict):
+            return _error(400, "简历数据格式无效")
+        errors = VALIDATOR.validate_personal(resume_data.get("personal_info")) # 与图形界面导出前的检查相同
+        if errors:
+            return _json(422, {"error": "个人信息不完整", "errors": [error.message for error in errors]})
+
+        from resume_render import RenderError
+        try:
+            result = await self.render(request.body, template)
+        except ServiceBusy as e:
+            return _error(503, str(e), **{"Retry-After": "1"})
+        except RenderError as e:
+            return _error(500, str(e))
+        except BrokenProcessPool:
+            return _error(500, "渲染进程异常退出")
+        except Exception as e:
+            return _error(500, f"{type(e).__name__}: {e}")
+        return Response(200, {"Content-Type": "application/pdf", "X-Resume-Pages": str(result.pages)}, result.data)
+
+
+def _json(status, obj, **headers):
+    body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    return Response(status, {"Content-Type": "application/json; charset=utf-8", **headers}, body)
+
+
+def _error(status, message, **headers):
+    return _json(status, {"error": message}, **headers)
+
+
+async def read_request(reader, max_body=MAX_BODY):
+    """读取一个请求；连接在请求之间关闭时返回 None，请求无效时抛出 RequestError"""
+    try:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise RequestError(400, "请求行无效") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, sep, value = line.decode("latin-1").partition(":")
+            if not sep or len(headers) >= MAX_HEADERS:
+                raise RequestError(400, "请求头无效")
+            headers[name.strip().lower()] = value.strip()
+    except ValueError: # 行超过 StreamReader 的长度限制
+        raise RequestError(400, "请求行或请求头过长") from None
+    if "transfer-encoding" in headers:
+        raise RequestError(411, "不支持分块传输，请提供 Content-Length")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise RequestError(400, "Content-Length 无效") from None
+    if length < 0:
+        raise RequestError(400, "Content-Length 无效")
+    if length > max_body:
+        raise RequestError(413, f"请求体超过 {max_body} 字节")
+    body = await reader.readexactly(length) if length else b""
+    path, _, query = target.partition("?")
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return Request(method.upper(), path, parse_qs(query), headers, body, keep_alive)
+
+
+async def write_response(writer, response, keep_alive):
+    lines = [f"HTTP/1.1 {response.status} {STATUS_TEXT.get(response.status, '')}",
+             f"Content-Length: {len(response.body)}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    lines.extend(f"{name}: {value}" for name, value in response.headers.items())
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    writer.write(response.body)
+    await writer.drain()
+
+
+async def serve(service, host="127.0.0.1", port=8765, ready=None):
+    """启动服务并一直运行；ready(server) 在开始监听后调用"""
+    await service.start()
+    try:
+        server = await asyncio.start_server(service.handle, host, port)
+        async with server:
+            if ready is not None:
+                ready(server)
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="resume_builder.py serve", description="本地 HTTP 渲染服务（简历 JSON -> PDF）")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址（默认只监听回环地址）")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, help="渲染进程数（默认为 CPU 核数）")
+    parser.add_argument("--max-concurrency", type=int, help="同时渲染的请求数上限（默认等于进程数）")
+    parser.add_argument("--max-queue", type=int, default=32, help="排队请求数上限，超过时返回 503")
+    parser.add_argument("--template", default="default", choices=sorted(TEMPLATES), help="请求未指定模板时使用")
+    args = parser.parse_args(argv)
+
+    service = RenderService(args.workers, args.max_concurrency, args.max_queue, args.template)
+
+    def ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"渲染服务已启动: http://{host}:{port}/render（{service.workers} 个进程）", file=sys.stderr)
+
+    from resume_render import RenderError
+    try:
+        asyncio.run(serve(service, args.host, args.port, ready))
+    except RenderError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
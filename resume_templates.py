@@ -0,0 +1,167 @@
+"""简历模板：声明式的字体、字号、颜色、间距和部分顺序。
+
+模板是普通字典，``compile_template`` 把它编译成 ``CompiledTemplate``：每种文字
+角色的 (字体, 颜色, 行高)、预先生成的章节标题和分隔线等固定绘制操作，以及
+用于布局缓存的模板摘要。编译结果按模板名缓存，同一模板的成千上万次渲染
+不再重复解析样式。预览和 PDF 导出按同一个部分顺序输出。
+
+自定义模板只需给出与默认模板不同的项，其余项从默认模板继承::
+
+    compile_template({"colors": {"primary": (192, 57, 43)}, "line_height": 6})
+"""
+from collections import namedtuple
+
+from resume_document import DEFAULT_SECTION_ORDER, SECTION_TITLES
+from resume_layout import Block, Row, RuleOp, TextOp, content_digest, spacer
+
+PAGE_WIDTH = 595.28 * 25.4 / 72 # A4 宽度：fpdf 中为 595.28 点，换算为毫米
+
+DEFAULT_TEMPLATE = {
+    "margin": 15,          # 上、左、右边距（毫米）
+    "line_height": 5.5,
+    "colors": {
+        "primary": (41, 128, 185),     # 主题蓝
+        "text": (51, 51, 51),
+        "light_text": (100, 100, 100),
+        "link": (41, 128, 185),
+        "line": (220, 220, 220),       # 页眉分隔线
+    },
+    # 文字角色：字体样式、字号、颜色名，行高 = line_height + leading
+    "text_styles": {
+        "name":          {"font": ('B', 22), "color": "primary", "leading": 8},
+        "contact":       {"font": ('', 9.5), "color": "text", "leading": -1},
+        "contact_link":  {"font": ('', 9.5), "color": "link", "leading": -1},
+        "section_title": {"font": ('B', 14), "color": "primary", "leading": 2},
+        "entry_title":   {"font": ('B', 11), "color": "text", "leading": 0},
+        "date":          {"font": ('', 9.5), "color": "light_text", "leading": 0},
+        "subtitle":      {"font": ('', 10.5), "color": "text", "leading": 0},
+        "position":      {"font": ('I', 12), "color": "text", "leading": 0},
+        "paragraph":     {"font": ('', 10.5), "color": "text", "leading": 0},
+        "education_detail": {"font": ('', 10.5), "color": "light_text", "leading": -1},
+        "experience_detail": {"font": ('', 12), "color": "text", "leading": -0.5},
+        "project_detail": {"font": ('', 10.5), "color": "text", "leading": -0.5},
+        "project_link":  {"font": ('', 10.5), "color": "link", "leading": -1},
+        "skill_label":   {"font": ('B', 12), "color": "text", "leading": 0},
+        "skill_list":    {"font": ('', 12), "color": "text", "leading": 0},
+    },
+    "spacing": {
+        "section_before": 6,     # 章节标题前
+        "section_after": 4,      # 标题分隔线后
+        "section_rule": 0.5,     # 标题分隔线粗细
+        "header_gap": 1,         # 姓名与联系方式之间
+        "header_before_rule": 4,
+        "header_rule": 0.3,
+        "header_after": 5,
+        "entry_after": 3,        # 条目之间
+        "link_before": 1,
+        "skill_label_width": 35, # 技能类别列宽
+        "skill_after": 1,
+    },
+    "sections": DEFAULT_SECTION_ORDER,
+}
+
+# 紧凑模板：字号和间距更小，工作经历提前
+COMPACT_TEMPLATE = {
+    "margin": 12,
+    "line_height": 4.8,
+    "colors": {"primary": (44, 62, 80), "link": (44, 62, 80)},
+    "text_styles": {
+        "name":          {"font": ('B', 18), "color": "primary", "leading": 6},
+        "section_title": {"font": ('B', 12), "color": "primary", "leading": 1.5},
+        "experience_detail": {"font": ('', 10), "color": "text", "leading": -0.3},
+        "position":      {"font": ('I', 10.5), "color": "text", "leading": 0},
+        "skill_label":   {"font": ('B', 10.5), "color": "text", "leading": 0},
+        "skill_list":    {"font": ('', 10.5), "color": "text", "leading": 0},
+    },
+    "spacing": {"section_before": 4, "section_after": 2.5, "header_after": 3, "entry_after": 2,
+                "skill_label_width": 30},
+    "sections": ("header", "summary", "experience", "projects", "education", "skills", "languages"),
+}
+
+TEMPLATES = {"default": DEFAULT_TEMPLATE, "compact": COMPACT_TEMPLATE}
+
+# 一种文字角色编译后的样式：font 为 (样式, 字号)，color 为 RGB，height 为行高
+TextStyle = namedtuple("TextStyle", "font color height")
+
+
+def _merge(base, overrides):
+    """递归合并模板字典：overrides 中的项覆盖 base，嵌套字典逐项合并"""
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            merged[key] = _merge(base[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class CompiledTemplate:
+    """编译后的模板：渲染时只读取这里预先算好的值"""
+
+    def __init__(self, spec, name=None):
+        self.name = name
+        self.spec = spec
+        self.key = content_digest(spec) # 参与布局缓存的键
+        self.margin = spec["margin"]
+        self.left = spec["margin"]
+        self.width = PAGE_WIDTH - 2 * spec["margin"]
+        self.line_height = spec["line_height"]
+        self.colors = {color: tuple(rgb) for color, rgb in spec["colors"].items()}
+        self.spacing = spec["spacing"]
+        for section in spec["sections"]:
+            if section not in SECTION_TITLES:
+                raise ValueError(f"模板中有未知的部分: {section}")
+        self.sections = tuple(spec["sections"])
+        self.text = {
+            role: TextStyle(tuple(style["font"]), self.colors[style["color"]],
+                            self.line_height + style["leading"])
+            for role, style in spec["text_styles"].items()}
+        # 与内容无关的绘制操作：编译时生成一次，所有文档共享
+        self.title_blocks = {section: self._section_title_block(SECTION_TITLES[section])
+                             for section in self.sections if section != "header"}
+        self.header_rule_rows = (spacer(self.spacing["header_before_rule"]),
+                                 Row(0.1, (RuleOp(self.colors["line"], self.spacing["header_rule"]),)),
+                                 spacer(self.spacing["header_after"]))
+
+    def _section_title_block(self, title):
+        """章节标题：段前间距、标题、分隔线；与下一块保持在同一页"""
+        style = self.text["section_title"]
+        return Block([
+            spacer(self.spacing["section_before"]),
+            self.text_row(title.upper(), "section_title"),
+            Row(0.1, (RuleOp(style.color, self.spacing["section_rule"]),)),
+            spacer(self.spacing["section_after"]),
+        ], keep_with_next=True)
+
+    def text_op(self, text, role, align='L', link="", x=None, w=None):
+        style = self.text[role]
+        return TextOp(self.left if x is None else x, self.width if w is None else w, style.height,
+                      text, align, style.font, style.color, link)
+
+    def text_row(self, text, role, align='L', link=""):
+        """占满正文宽度的单行文本"""
+        return Row(self.text[role].height, (self.text_op(text, role, align, link),))
+
+
+_COMPILED = {}
+
+
+def compile_template(template="default"):
+    """模板名或模板字典 -> CompiledTemplate；按名称的编译结果在进程内缓存
+
+    未知的模板名抛出 KeyError，模板内容有误时抛出 ValueError。
+    """
+    if isinstance(template, CompiledTemplate):
+        return template
+    if isinstance(template, str):
+        compiled = _COMPILED.get(template)
+        if compiled is None:
+            if template not in TEMPLATES:
+                raise KeyError(template)
+            compiled = _COMPILED[template] = CompiledTemplate(_merge(DEFAULT_TEMPLATE, TEMPLATES[template]),
+                                                              template)
+        return compiled
+    try:
+        return CompiledTemplate(_merge(DEFAULT_TEMPLATE, template or {}))
+    except KeyError as e:
+        raise ValueError(f"模板引用了不存在的颜色: {e}") from None
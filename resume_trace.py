@@ -0,0 +1,193 @@
+"""渲染流水线的性能追踪：记录字体加载、各部分排版、分页和 PDF 序列化的耗时。
+
+默认关闭，关闭时 ``span`` 只返回一个空操作对象。可在运行时开关::
+
+    import resume_trace
+    resume_trace.enable()
+    render_resume(resume_data)
+    resume_trace.TRACER.write("trace.json")           # Chrome trace 格式
+    resume_trace.TRACER.write("spans.json", "json")   # 普通 JSON 列表
+
+Chrome trace 文件可在 chrome://tracing 或 https://ui.perfetto.dev 中查看。
+命令行使用 ``render ... --trace trace.json``；设置环境变量
+``RESUME_TRACE=trace.json`` 时在启动时开启，并在进程退出时写出。
+只依赖标准库，图形界面、命令行和后台进程均可使用。
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+# phase 为 "X"（有持续时间的区间）或 "i"（瞬时事件）；start/duration 单位为秒，
+# start 相对于开启追踪的时刻
+TraceEvent = namedtuple("TraceEvent", "name category phase start duration thread args")
+
+TRACE_FORMATS = ("chrome", "json")
+
+
+class _Span:
+    """一个计时区间；进入时返回 args 字典，可在区间内补充参数"""
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self.args
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self.name, self.category, "X", self.start, duration, self.args)
+        return False
+
+
+class _NullSpan:
+    """追踪关闭时使用的空操作区间"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """线程安全的事件记录器（渲染可能在工作线程或线程池中进行）"""
+
+    def __init__(self):
+        self.enabled = False
+        self._events = []
+        self._threads = {}  # 线程 id -> 线程名
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def enable(self, clear=True):
+        if clear:
+            self.clear()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self._events = []
+            self._threads = {}
+            self._origin = time.perf_counter()
+
+    def span(self, name, category="render", /, **args):
+        """with tracer.span("名称", "类别", 参数=值) as args: ..."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def instant(self, name, category="render", /, **args):
+        """记录一个瞬时事件（例如分页的原因）"""
+        if self.enabled:
+            self._record(name, category, "i", time.perf_counter(), 0.0, args)
+
+    def _record(self, name, category, phase, start, duration, args):
+        thread = threading.current_thread()
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self._events.append(TraceEvent(name, category, phase, start - self._origin, duration,
+                                           thread.ident, args))
+
+    def events(self):
+        """已记录事件的副本，按开始时间排序"""
+        with self._lock:
+            return sorted(self._events, key=lambda event: event.start)
+
+    def summary(self):
+        """按名称汇总区间：[(名称, 次数, 总耗时秒数)]，耗时多的在前"""
+        totals = {}
+        for event in self.events():
+            if event.phase == "X":
+                count, total = totals.get(event.name, (0, 0.0))
+                totals[event.name] = (count + 1, total + event.duration)
+        return sorted(((name, count, total) for name, (count, total) in totals.items()),
+                      key=lambda item: item[2], reverse=True)
+
+    def to_chrome_trace(self):
+        """Chrome trace 事件格式（时间单位为微秒）"""
+        pid = os.getpid()
+        with self._lock:
+            threads = dict(self._threads)
+        trace_events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                        for tid, name in threads.items()]
+        for event in self.events():
+            record = {"name": event.name, "cat": event.category, "ph": event.phase, "pid": pid,
+                      "tid": event.thread, "ts": event.start * 1e6, "args": event.args}
+            if event.phase == "X":
+                record["dur"] = event.duration * 1e6
+            else:
+                record["s"] = "t"
+            trace_events.append(record)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def to_json(self):
+        """普通 JSON 格式：每个事件一个字典，时间单位为毫秒"""
+        with self._lock:
+            threads = dict(self._threads)
+        return {"events": [{"name": event.name, "category": event.category,
+                            "type": "span" if event.phase == "X" else "instant",
+                            "start_ms": event.start * 1000, "duration_ms": event.duration * 1000,
+                            "thread": threads.get(event.thread, event.thread), "args": event.args}
+                           for event in self.events()]}
+
+    def write(self, path, fmt="chrome"):
+        """把已记录的事件写入 path，fmt 为 chrome 或 json"""
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"未知的追踪格式: {fmt}")
+        data = self.to_chrome_trace() if fmt == "chrome" else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+
+
+# 进程内共享的记录器；各模块通过下面的函数使用它
+TRACER = Tracer()
+
+
+def enable(clear=True):
+    TRACER.enable(clear)
+
+
+def disable():
+    TRACER.disable()
+
+
+def is_enabled():
+    return TRACER.enabled
+
+
+def span(name, category="render", /, **args):
+    return TRACER.span(name, category, **args)
+
+
+def instant(name, category="render", /, **args):
+    TRACER.instant(name, category, **args)
+
+
+def _enable_from_environment():
+    """RESUME_TRACE=文件路径 时开启追踪，进程退出时写出（格式由 RESUME_TRACE_FORMAT 指定，默认 chrome）"""
+    path = os.environ.get("RESUME_TRACE")
+    if not path:
+        return
+    fmt = os.environ.get("RESUME_TRACE_FORMAT", "chrome")
+    enable()
+    atexit.register(TRACER.write, path, fmt)
+
+
+_enable_from_environment()
@@ -0,0 +1,266 @@
+"""简历数据校验：一次检查整份简历或一批简历，返回所有问题的结构化列表。
+
+规则以声明式的 RULES 描述（字段 -> 检查项），由 Validator 预先编译成
+每部分一张 (字段, 检查函数, 消息) 表，校验时只做循环和函数调用。
+图形界面的表单保存、个人信息检查和批量导入都使用同一套规则::
+
+    errors = VALIDATOR.validate(resume_data)
+    if errors:
+        print(format_report(errors))
+
+条目可以是记录，也可以是尚未规范化的字典（导入前先校验）。
+不依赖 fpdf 或 PyQt6。
+"""
+import re
+import sys
+from collections import Counter, namedtuple
+
+from resume_schema import ENTRY_FIELDS, PERSONAL_INFO_FIELDS, SECTION_KEYS, EntryRecord
+
+# resume: 批量校验时简历在批次中的序号（单份校验时为 None）
+# section: "personal_info" 或条目部分；index: 条目序号（个人信息和整体结构问题为 None）
+# code: required / year / year_or_present / year_month / year_month_or_present / type
+#       （type：结构不对时 field 为 None，字段值不是字符串时为该字段；批量导入时无法解析的行为 parse）
+ValidationError = namedtuple("ValidationError", "resume section index field code message")
+
+PRESENT = "至今"
+
+_YEAR = re.compile(r"\d{4}", re.ASCII).fullmatch
+_YEAR_MONTH = re.compile(r"\d{4}-\d{2}", re.ASCII).fullmatch
+
+# 检查项名 -> (值为非空字符串时的检查函数, 消息模板)；必填检查单独处理
+CHECKS = {
+    "year": (_YEAR, "{label}请输入4位数字 (例如 2020)"),
+    "year_or_present": (lambda value: value == PRESENT or _YEAR(value),
+                        "{label}请输入4位数字 (例如 2020) 或 '至今'"),
+    "year_month": (_YEAR_MONTH, "{label}请输入 YYYY-MM 格式 (例如 2022-08)"),
+    "year_month_or_present": (lambda value: value == PRESENT or _YEAR_MONTH(value),
+                              "{label}请输入 YYYY-MM 格式 (例如 2022-08) 或 '至今'"),
+}
+
+# 与图形界面表单一致的字段名称
+FIELD_LABELS = {
+    "personal_info": {"name": "姓名", "email": "邮箱", "phone": "电话", "address": "地址",
+                      "linkedin": "LinkedIn", "github": "GitHub", "summary": "个人简介"},
+    "education": {"school": "学校", "major": "专业", "degree": "学位", "start_year": "开始年份",
+                  "end_year": "结束年份", "gpa": "GPA", "description": "补充描述"},
+    "experience": {"company": "公司", "position": "职位", "start_date": "开始时间", "end_date": "结束时间",
+                   "description": "工作描述"},
+    "projects": {"name": "项目名称", "role": "你的角色", "date": "项目日期", "description": "项目描述",
+                 "link": "相关链接"},
+    "skills": {"name": "技能名称", "type": "技能类别", "level": "熟练程度"},
+    "languages": {"name": "语言", "level": "水平/证书"},
+}
+
+SECTION_LABELS = {"personal_info": "个人信息", "education": "教育经历", "experience": "工作经历",
+                  "projects": "项目经历", "skills": "技能", "languages": "语言能力"}
+
+# 默认规则：字段 -> 检查项元组（"required" 表示必填）
+RULES = {
+    "personal_info": {"name": ("required",), "email": ("required",), "phone": ("required",)},
+    "education": {"school": ("required",), "major": ("required",),
+                  "start_year": ("required", "year"), "end_year": ("required", "year_or_present")},
+    "experience": {"company": ("required",), "position": ("required",),
+                   "start_date": ("required", "year_month"), "end_date": ("required", "year_month_or_present"),
+                   "description": ("required",)},
+    "projects": {"name": ("required",), "role": ("required",), "description": ("required",)},
+    "skills": {"name": ("required",)},
+    "languages": {"name": ("required",)},
+}
+
+_Check = namedtuple("_Check", "field code test message")
+
+
+def _value(entry, field):
+    """条目字段的字符串值（兼容尚未规范化的字典）"""
+    value = entry.get(field)
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+class Validator:
+    """按规则预编译的校验器；同一规则只需创建一次，可在多线程中共享"""
+
+    def __init__(self, rules=RULES):
+        unknown = set(rules).difference(("personal_info", *SECTION_KEYS))
+        if unknown:
+            raise ValueError(f"未知的部分: {', '.join(sorted(unknown))}")
+        self.rules = rules
+        self._checks = {section: self._compile(section, fields) for section, fields in rules.items()}
+        # 字典条目的每个字段都要是字符串（或缺失），与规则无关：否则导出时无法处理
+        self._text_fields = {section: tuple((field, f"{FIELD_LABELS[section].get(field, field)}应为文本")
+                                            for field in fields)
+                             for section, fields in (("personal_info", PERSONAL_INFO_FIELDS), *ENTRY_FIELDS.items())}
+
+    @staticmethod
+    def _compile(section, fields):
+        known = PERSONAL_INFO_FIELDS if section == "personal_info" else ENTRY_FIELDS[section]
+        labels = FIELD_LABELS.get(section, {})
+        checks = []
+        for field, names in fields.items():
+            if field not in known:
+                raise ValueError(f"{section} 没有字段: {field}")
+            label = labels.get(field, field)
+            for name in names:
+                if name == "required":
+                    checks.append(_Check(field, name, None, f"{label}为必填项"))
+                elif name in CHECKS:
+                    test, template = CHECKS[name]
+                    checks.append(_Check(field, name, test, template.format(label=label)))
+                else:
+                    raise ValueError(f"未知的检查项: {name}")
+        return tuple(checks)
+
+    # --- 单个条目 / 个人信息 ---
+    def validate_entry(self, section, entry, index=None, resume=None):
+        """校验一个条目（记录或字典），返回错误列表"""
+        errors = []
+        self._check_entry(section, entry, index, resume, errors)
+        return errors
+
+    def _check_entry(self, section, entry, index, resume, errors):
+        checks = self._checks.get(section, ())
+        if isinstance(entry, EntryRecord): # 记录的字段总是字符串
+            get = entry.__getattribute__
+            wrong_type = ()
+        elif isinstance(entry, dict):
+            get = lambda field: _value(entry, field)
+            wrong_type = self._check_text_fields(section, entry, index, resume, errors)
+        else:
+            errors.append(ValidationError(resume, section, index, None, "type", "条目格式无效"))
+            return
+        failed = None # 同一字段只报告第一个问题（缺失时不再报告格式错误）
+        for check in checks:
+            if check.field == failed or check.field in wrong_type:
+                continue
+            value = get(check.field)
+            if check.test is None:
+                ok = bool(value)
+            else:
+                ok = not value or check.test(value)
+            if not ok:
+                failed = check.field
+                errors.append(ValidationError(resume, section, index, check.field, check.code, check.message))
+
+    def _check_text_fields(self, section, entry, index, resume, errors):
+        """报告值不是字符串的字段，返回这些字段"""
+        wrong_type = ()
+        for value in entry.values():
+            if value is not None and not isinstance(value, str):
+                break
+        else: # 常见情况：所有值都是字符串
+            return wrong_type
+        for field, message in self._text_fields[section]:
+            value = entry.get(field)
+            if value is not None and not isinstance(value, str):
+                errors.append(ValidationError(resume, section, index, field, "type", message))
+                wrong_type += (field,)
+        return wrong_type
+
+    def validate_personal(self, personal, resume=None):
+        errors = []
+        self._check_personal(personal, resume, errors)
+        return errors
+
+    def _check_personal(self, personal, resume, errors):
+        if not isinstance(personal, dict):
+            errors.append(ValidationError(resume, "personal_info", None, None, "type", "个人信息格式无效"))
+            return
+        self._check_entry("personal_info", personal, None, resume, errors)
+
+    # --- 整份简历 / 批量 ---
+    def validate(self, resume_data, resume=None, errors=None):
+        """校验整份简历，返回所有问题（没有问题时为空列表）"""
+        if errors is None:
+            errors = []
+        if not isinstance(resume_data, dict):
+            errors.append(ValidationError(resume, None, None, None, "type", "简历数据格式无效"))
+            return errors
+        self._check_personal(resume_data.get("personal_info"), resume, errors)
+        for section in SECTION_KEYS:
+            entries = resume_data.get(section, [])
+            if not isinstance(entries, list):
+                errors.append(ValidationError(resume, section, None, None, "type",
+                                              f"{SECTION_LABELS[section]}应为列表"))
+                continue
+            check_entry = self._check_entry
+            for index, entry in enumerate(entries):
+                check_entry(section, entry, index, resume, errors)
+        return errors
+
+    def validate_many(self, resumes, limit=None):
+        """在一次遍历中校验一批简历，错误的 resume 为简历在批次中的序号
+
+        limit 不为空时，错误达到该数量后停止（用于只需要预览问题的场合）。
+        """
+        errors = []
+        for resume, resume_data in enumerate(resumes):
+            self.validate(resume_data, resume, errors)
+            if limit is not None and len(errors) >= limit:
+                del errors[limit:]
+                break
+        return errors
+
+    def is_valid(self, resume_data):
+        return not self.validate(resume_data)
+
+
+# 使用默认规则的共享校验器
+VALIDATOR = Validator()
+
+
+def summarize(errors):
+    """按 (部分, 字段, 问题) 汇总：[(section, field, code, message, 次数)]，多的在前"""
+    counts = Counter((e.section, e.field, e.code, e.message) for e in errors)
+    return [(*key, count) for key, count in counts.most_common()]
+
+
+def describe(error):
+    """一条错误的可读描述，例如 "工作经历 #3: 开始时间请输入 YYYY-MM 格式 …" """
+    where = SECTION_LABELS.get(error.section, error.section or "简历")
+    if error.index is not None:
+        where += f" #{error.index + 1}"
+    if error.resume is not None:
+        where = f"简历 #{error.resume + 1} {where}"
+    return f"{where}: {error.message}"
+
+
+def format_report(errors, limit=20):
+    """汇总报告：先列出各类问题的次数，再列出前 limit 条具体位置"""
+    if not errors:
+        return "未发现问题"
+    lines = [f"共 {len(errors)} 处问题:"]
+    lines.extend(f"  {SECTION_LABELS.get(section, section or '简历')}: {message} × {count}"
+                 for section, field, code, message, count in summarize(errors))
+    lines.append("")
+    lines.extend(describe(error) for error in errors[:limit])
+    if len(errors) > limit:
+        lines.append(f"…… 另有 {len(errors) - limit} 处未列出")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """校验一个或多个简历 JSON 文件，有问题时返回 1"""
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(prog="resume_builder.py validate", description="校验简历 JSON 文件")
+    parser.add_argument("inputs", nargs="+", help="简历 JSON 文件（save_resume 保存的格式）")
+    parser.add_argument("--limit", type=int, default=20, help="最多列出的具体问题条数")
+    args = parser.parse_args(argv)
+    failed = False
+    for path in args.inputs:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                errors = VALIDATOR.validate(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"{path}: 无法读取: {e}", file=sys.stderr)
+            failed = True
+            continue
+        print(f"{path}: {format_report(errors, args.limit)}")
+        failed = failed or bool(errors)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""测试共用的夹具"""
+import functools
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def font_path():
+    """PDF 渲染用的字体：环境变量 RESUME_FONT 指定的文件，否则自动查找中文字体；都没有时跳过"""
+    import resume_render
+    path = os.environ.get("RESUME_FONT")
+    if path and os.path.isfile(path):
+        return path
+    try:
+        return resume_render.locate_font()
+    except resume_render.RenderError:
+        pytest.skip("没有可用的字体（可用环境变量 RESUME_FONT 指定）")
+
+
+@pytest.fixture
+def pdf_font(font_path, tmp_path, monkeypatch):
+    """让 resume_render 使用 font_path，字宽表写入临时目录而不是用户目录"""
+    import resume_linebreak
+    import resume_render
+    monkeypatch.setattr(resume_render, "CHINESE_FONT_PATH", font_path)
+    monkeypatch.setattr(resume_render, "glyph_advances",
+                        functools.partial(resume_linebreak.glyph_advances, directory=str(tmp_path / "glyph_widths")))
+    monkeypatch.setattr(resume_render, "_MEASURER", None)
+    return font_path
@@ -0,0 +1,56 @@
+"""resume_batch：输出文件命名与无法读取的简历文件（使用 txt 格式，不需要字体）"""
+import json
+import os
+
+import pytest
+
+from resume_batch import export_batch, output_filename, resume_name
+
+
+def resume(name):
+    return {"personal_info": {"name": name, "email": "a@b.c", "phone": "123"}}
+
+
+def write_inputs(directory, items):
+    directory.mkdir()
+    for filename, content in items:
+        text = content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)
+        (directory / filename).write_text(text, encoding="utf-8")
+    return str(directory)
+
+
+def test_output_filename_numbers_duplicates_case_insensitively():
+    taken = set()
+    assert output_filename("Zhang", "pdf", taken) == "Zhang_简历.pdf"
+    assert output_filename("zhang", "pdf", taken) == "zhang_简历_2.pdf"
+    assert output_filename("ZHANG", "pdf", taken) == "ZHANG_简历_3.pdf"
+
+
+@pytest.mark.parametrize("resume_data", [{"personal_info": {"name": 123}}, {"personal_info": "oops"}, [], {}])
+def test_resume_name_rejects_bad_structure(resume_data):
+    with pytest.raises(ValueError):
+        resume_name(resume_data)
+
+
+def test_bad_files_fail_individually(tmp_path):
+    source = write_inputs(tmp_path / "in", [
+        ("a.json", resume("张三")),
+        ("b.json", {"personal_info": {"name": 123}}),
+        ("c.json", "{bad"),
+        ("d.json", resume("张三")),
+        ("e.json", resume(None)),
+    ])
+    output_dir = tmp_path / "out"
+    progress = []
+    report = export_batch([source], str(output_dir), fmt="txt", workers=2,
+                          progress=lambda done, total: progress.append((done, total)))
+
+    assert [os.path.basename(result.source) for result in report.results] == \
+        ["a.json", "b.json", "c.json", "d.json", "e.json"]
+    assert [result.ok for result in report.results] == [True, False, False, True, True]
+    assert "personal_info.name" in report.results[1].error
+    assert [result.attempts for result in report.results[1:3]] == [1, 1] # 无法读取的文件不重试
+    assert [os.path.basename(result.output) for result in report.results if result.ok] == \
+        ["张三_简历.txt", "张三_简历_2.txt", "未命名_简历.txt"]
+    assert sorted(os.listdir(output_dir)) == sorted(["张三_简历.txt", "张三_简历_2.txt", "未命名_简历.txt"])
+    assert progress[-1] == (5, 5)
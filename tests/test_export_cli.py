@@ -0,0 +1,45 @@
+"""resume_export 命令行：输入错误的处理，以及非 PDF 格式不加载 fpdf"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from resume_export import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESUME = {"personal_info": {"name": "张三", "email": "a@b.c", "phone": "123"},
+          "skills": [{"name": "Python", "type": "编程", "level": "精通"}]}
+
+
+@pytest.mark.parametrize("content", ["{bad", "[1, 2]", None])
+def test_bad_input_reports_error(tmp_path, capsys, content):
+    path = tmp_path / "in.json"
+    if content is not None:
+        path.write_text(content, encoding="utf-8")
+    assert main([str(path), str(tmp_path / "out.txt")]) == 1
+    assert capsys.readouterr().err.startswith("错误: ")
+    assert not (tmp_path / "out.txt").exists()
+
+
+def test_text_formats_do_not_load_renderer(tmp_path):
+    source = tmp_path / "in.json"
+    source.write_text(json.dumps(RESUME, ensure_ascii=False), encoding="utf-8")
+    outputs = [str(tmp_path / name) for name in ("out.txt", "out.md", "out.html", "out.docx")]
+    code = ("import sys, resume_export\n"
+            f"code = resume_export.main({[str(source), *outputs]!r})\n"
+            "sys.exit(code or 'fpdf' in sys.modules or 'resume_render' in sys.modules)")
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True)
+    assert "Python (精通)" in (tmp_path / "out.txt").read_text(encoding="utf-8")
+
+
+def test_non_string_fields_exported(tmp_path, capsys):
+    source = tmp_path / "in.json"
+    source.write_text(json.dumps({"personal_info": {"name": 123, "email": None, "phone": 138}}), encoding="utf-8")
+    outputs = [tmp_path / "out.html", tmp_path / "out.md"]
+    assert main([str(source), *map(str, outputs)]) == 0
+    assert "123" in outputs[0].read_text(encoding="utf-8")
+    assert "138" in outputs[1].read_text(encoding="utf-8")
+    assert "错误" not in capsys.readouterr().err
@@ -0,0 +1,89 @@
+"""resume_history：撤销/重做栈，以及编辑器中修改记录的逆操作"""
+import os
+import random
+
+import pytest
+
+from resume_history import EditHistory
+
+
+def test_undo_redo_order_and_redo_cleared_by_new_edit():
+    history = EditHistory()
+    assert not history.can_undo and history.undo() is None and history.redo() is None
+    history.push("a", "-a")
+    history.push("b", "-b")
+    assert history.undo() == "-b" and history.can_redo
+    assert history.redo() == "b"
+    assert history.undo() == "-b" and history.undo() == "-a" and not history.can_undo
+    assert history.redo() == "a"
+    history.push("c", "-c") # 新的修改之后不能再重做 b
+    assert not history.can_redo and history.redo() is None
+    assert [history.undo(), history.undo(), history.undo()] == ["-c", "-a", None]
+
+
+def test_limit_drops_oldest_steps():
+    history = EditHistory(limit=2)
+    for step in "abc":
+        history.push(step, f"-{step}")
+    assert [history.undo(), history.undo(), history.undo()] == ["-c", "-b", None]
+    history.clear()
+    assert not history.can_undo and not history.can_redo
+
+
+@pytest.fixture
+def window(tmp_path, monkeypatch):
+    """不读写用户目录的编辑器窗口（自动保存和 PDF 缓存放在 tmp_path 中）"""
+    pytest.importorskip("PyQt6.QtWidgets")
+    monkeypatch.setenv("QT_QPA_PLATFORM", os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    from PyQt6.QtWidgets import QApplication
+    import resume_builder
+    from resume_journal import ResumeJournal
+    from resume_pdf_cache import PDFCache
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.setattr(resume_builder, "ResumeJournal", lambda: ResumeJournal(str(tmp_path / "autosave")))
+    monkeypatch.setattr(resume_builder, "PDFCache", lambda: PDFCache(str(tmp_path / "pdf_cache")))
+    monkeypatch.setattr(resume_builder, "find_crashed_sessions", lambda: [])
+    window = resume_builder.ResumeApp()
+    yield window
+    window.close()
+    app.processEvents()
+
+
+def state(window):
+    return window.resume_data["personal_info"]["name"], [(s.name, s.level) for s in window.resume_data["skills"]]
+
+
+def test_every_edit_undone_and_redone_in_editor(window):
+    rng = random.Random(11)
+    states = [state(window)]
+    for step in range(60):
+        count = len(window.resume_data["skills"])
+        op = rng.choice(["insert", "update", "delete", "move", "reorder", "personal"]) if count > 1 else "insert"
+        if op == "insert":
+            record = {"op": "insert", "section": "skills", "index": rng.randint(0, count),
+                      "entry": {"name": f"s{step}", "type": "编程"}}
+        elif op == "update":
+            record = {"op": "update", "section": "skills", "index": rng.randrange(count),
+                      "entry": {"name": f"u{step}", "type": "编程", "level": "熟练"}}
+        elif op == "delete":
+            record = {"op": "delete", "section": "skills", "index": rng.randrange(count)}
+        elif op == "move":
+            record = {"op": "move", "section": "skills", "from": rng.randrange(count), "to": rng.randrange(count)}
+        elif op == "reorder":
+            order = list(range(count))
+            rng.shuffle(order)
+            record = {"op": "reorder", "section": "skills", "order": order}
+        else:
+            record = {"op": "personal", "field": "name", "value": f"名字{step}"}
+        window.edit(record)
+        states.append(state(window))
+        assert window.resume_index.matches(window.resume_data)
+
+    for expected in reversed(states[:-1]):
+        window.undo()
+        assert state(window) == expected
+    assert not window.history.can_undo
+    for expected in states[1:]:
+        window.redo()
+        assert state(window) == expected
+    assert window.resume_index.matches(window.resume_data)
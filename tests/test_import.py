@@ -0,0 +1,93 @@
+"""resume_import：列映射、连续行合并、结构错误的行"""
+import json
+import os
+
+import pytest
+
+from resume_import import ImportFormatError, import_resumes, main, map_rows, parse_target
+from resume_library import ResumeLibrary
+from resume_schema import Skill
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def valid_row(**personal):
+    return {"personal_info": {"name": "张三", "email": "a@b.c", "phone": "123", **personal}}
+
+
+def test_parse_target_forms():
+    assert parse_target("name").kind == "personal"
+    assert parse_target("personal_info.email").field == "email"
+    assert parse_target("education.1.school")[:3] == ("entry", "education", 1)
+    assert parse_target("skills[].level")[:2] == ("split", "skills")
+    with pytest.raises(ImportFormatError):
+        parse_target("skills[].colour")
+    with pytest.raises(ImportFormatError):
+        parse_target("nickname")
+
+
+def test_split_columns_combine_by_position():
+    rows = [(2, {"姓名": "张三", "技能": "Python; Go;", "水平": "精通;熟悉"})]
+    mapping = {"姓名": "name", "技能": "skills[].name", "水平": "skills[].level"}
+    [(line, resume_data)] = map_rows(rows, mapping)
+    assert line == 2
+    assert resume_data["personal_info"] == {"name": "张三"}
+    assert resume_data["skills"] == [{"name": "Python", "level": "精通"}, {"name": "Go", "level": "熟悉"}]
+
+
+def test_csv_auto_mapping_and_grouping(tmp_path):
+    path = write(tmp_path, "in.csv",
+                 "name,email,phone,experience.0.company,skills[].name\n"
+                 "张三,a@b.c,123,甲公司,Python\n"
+                 "张三,a@b.c,123,乙公司,Python\n"
+                 "李四,l@b.c,456,丙公司,Go\n")
+    imported = list(import_resumes(path, group_by="email", validate=False))
+    assert [item.line for item in imported] == [2, 4]
+    first = imported[0].resume_data
+    assert [entry.company for entry in first["experience"]] == ["甲公司", "乙公司"]
+    assert first["skills"] == [Skill(name="Python", type="未分类", level="未指定")] # 重复的条目只保留一个
+
+
+def test_jsonl_bad_lines_do_not_stop_import(tmp_path):
+    path = write(tmp_path, "in.jsonl", "\n".join([json.dumps(valid_row()), "{oops", "[1, 2]", ""]))
+    imported = list(import_resumes(path))
+    assert [item.line for item in imported] == [1, 2, 3]
+    assert imported[0].resume_data["personal_info"]["name"] == "张三" and not imported[0].errors
+    assert [item.resume_data for item in imported[1:]] == [None, None]
+    assert [item.errors[0].code for item in imported[1:]] == ["parse", "parse"]
+
+
+def test_type_error_row_has_no_resume_data(tmp_path):
+    path = write(tmp_path, "in.jsonl", '{"personal_info": "oops"}\n')
+    [item] = import_resumes(path, group_by="email")
+    assert item.resume_data is None
+    assert any(error.code == "type" for error in item.errors)
+
+
+def test_type_error_row_rejected_with_keep_invalid(tmp_path, capsys):
+    path = write(tmp_path, "in.jsonl", json.dumps(valid_row()) + '\n{"personal_info": "oops"}\n')
+    out_dir = tmp_path / "out"
+    assert main([path, "--json-dir", str(out_dir), "--keep-invalid"]) == 0
+    assert len(os.listdir(out_dir)) == 1
+
+    db = str(tmp_path / "lib.db")
+    assert main([path, "--library", db, "--keep-invalid"]) == 0
+    assert "存入简历库 1 份，跳过 1 份" in capsys.readouterr().out
+    with ResumeLibrary(db) as library:
+        assert library.count() == 1
+
+
+def test_non_string_personal_fields_become_strings(tmp_path):
+    path = write(tmp_path, "in.jsonl", json.dumps(valid_row(name=123, address=None)) + "\n")
+    out_dir = tmp_path / "out"
+    assert main([path, "--json-dir", str(out_dir), "--keep-invalid"]) == 0
+    assert os.listdir(out_dir) == ["123_1_简历.json"]
+    with open(out_dir / "123_1_简历.json", encoding="utf-8") as f:
+        personal = json.load(f)["personal_info"]
+    assert personal["name"] == "123" and personal["address"] == ""
+    assert main([path, "--json-dir", str(tmp_path / "strict")]) == 0 # 不加 --keep-invalid 时跳过
+    assert os.listdir(tmp_path / "strict") == []
@@ -0,0 +1,178 @@
+"""resume_index：增量维护的索引与从头重建的结果一致"""
+import random
+
+import pytest
+
+from resume_document import build_document
+from resume_index import ORDER_GAP, PRESENT, UNDATED, ResumeIndex, SectionIndex, date_key, date_range_key
+from resume_journal import apply_record
+from resume_schema import empty_resume_data, make_entry
+
+
+@pytest.mark.parametrize("value, key", [
+    ("2020", (2020, 0)), ("2020-08", (2020, 8)), ("2020.8", (2020, 8)), ("2020年8月", (2020, 8)),
+    ("2020-13", (2020, 12)), ("至今", PRESENT), ("Present", PRESENT), ("", UNDATED), (None, UNDATED),
+    ("2019.3 - 2021.6", (2019, 3)),
+])
+def test_date_key(value, key):
+    assert date_key(value) == key
+
+
+def test_date_range_key_uses_last_end_date_and_falls_back_to_start():
+    assert date_range_key("2019.3 - 2021.6", "2019.3 - 2021.6") == ((2021, 6), (2019, 3))
+    assert date_range_key("2020-01", "至今") == (PRESENT, (2020, 1))
+    assert date_range_key("2020-01", "") == ((2020, 1), (2020, 1))
+
+
+def skill(name, skill_type="编程", level=""):
+    return make_entry("skills", {"name": name, "type": skill_type, "level": level})
+
+
+def job(company, start, end):
+    return make_entry("experience", {"company": company, "start_date": start, "end_date": end})
+
+
+def assert_consistent(index, section, entries):
+    """index 的每个视图都与由 entries 重新构建的索引相同"""
+    fresh = SectionIndex(section, entries)
+    assert index.entries() == entries
+    assert index.chronological_rows() == fresh.chronological_rows()
+    assert index.skills_by_type() == fresh.skills_by_type()
+    for entry in entries:
+        name = getattr(entry, index.name_field)
+        assert index.find(name) == fresh.find(name)
+    assert index.order == sorted(index.order)
+
+
+def test_skills_grouped_by_type_in_list_order():
+    index = SectionIndex("skills", [skill("Python"), skill("英语", "语言"), skill("Go"), skill("C")])
+    assert [(skill_type, [s.name for s in skills]) for skill_type, skills in index.skills_by_type()] == [
+        ("编程", ["Python", "Go", "C"]), ("语言", ["英语"])]
+    index.delete(1)
+    assert [skill_type for skill_type, _ in index.skills_by_type()] == ["编程"]
+
+
+def test_chronological_rows_most_recent_first_ties_keep_list_order():
+    entries = [job("A", "2018-01", "2019-06"), job("B", "2020-01", "至今"), job("C", "", ""),
+               job("D", "2017-01", "2019-06"), job("E", "2016-01", "2019-06")]
+    index = ResumeIndex({**empty_resume_data(), "experience": entries})
+    assert index.chronological_rows("experience") == [1, 0, 3, 4, 2]
+    assert [entry.company for entry in index.chronological("experience")] == ["B", "A", "D", "E", "C"]
+
+
+def test_find_ignores_case_and_surrounding_spaces():
+    index = SectionIndex("skills", [skill("Python"), skill("Go"), skill(" python ")])
+    assert index.find("PYTHON") == [0, 2]
+    assert index.find("rust") == []
+
+
+def test_insert_update_delete_move_match_rebuilt_index():
+    rng = random.Random(7)
+    dates = ["2015", "2018-03", "2020.8", "2021年2月", "至今", ""]
+    entries = []
+    index = SectionIndex("experience")
+    for step in range(400):
+        op = rng.choice(["insert", "insert", "update", "delete", "move"]) if entries else "insert"
+        entry = job(rng.choice("ABCDE"), rng.choice(dates), rng.choice(dates))
+        if op == "insert":
+            row = rng.randint(0, len(entries))
+            entries.insert(row, entry)
+            index.insert(row, entry)
+        elif op == "update":
+            row = rng.randrange(len(entries))
+            entries[row] = entry
+            index.update(row, entry)
+        elif op == "delete":
+            row = rng.randrange(len(entries))
+            del entries[row]
+            assert index.delete(row) is not None
+        else:
+            source, target = rng.randrange(len(entries)), rng.randrange(len(entries))
+            entries.insert(target, entries.pop(source))
+            index.move(source, target)
+        if step % 20 == 0:
+            assert_consistent(index, "experience", entries)
+    assert_consistent(index, "experience", entries)
+
+
+def test_repeated_front_inserts_renumber_when_keys_run_out():
+    entries = [skill(f"s{i}", "ab"[i % 2]) for i in range(3)]
+    index = SectionIndex("skills", entries)
+    for i in range(200): # 每次取中点，约 60 次后相邻键之间放不下
+        entry = skill(f"n{i}", "ab"[i % 2])
+        entries.insert(1, entry)
+        index.insert(1, entry)
+    assert_consistent(index, "skills", entries)
+    assert len(set(index.order)) == len(entries)
+
+
+def test_append_uses_order_gap():
+    index = SectionIndex("skills", [skill("a")])
+    index.insert(1, skill("b"))
+    assert index.order == [ORDER_GAP, 2 * ORDER_GAP]
+
+
+def test_reorder_record_matches_reset_section():
+    resume_data = empty_resume_data()
+    resume_data["skills"] = [skill("Python"), skill("英语", "语言"), skill("Go")]
+    index = ResumeIndex(resume_data)
+    apply_record(resume_data, {"op": "reorder", "section": "skills", "order": [2, 0, 1]})
+    index.reset_section("skills", resume_data["skills"]) # 与 EntryListModel.reorder_entries 相同
+    assert [s.name for s in resume_data["skills"]] == ["Go", "Python", "英语"]
+    assert_consistent(index["skills"], "skills", resume_data["skills"])
+    assert index.matches(resume_data)
+
+
+def test_journal_records_replay_like_index_operations():
+    resume_data = empty_resume_data()
+    index = ResumeIndex(resume_data)
+    records = [
+        {"op": "insert", "section": "skills", "index": 0, "entry": {"name": "Python", "type": "编程"}},
+        {"op": "insert", "section": "skills", "index": 0, "entry": {"name": "Go", "type": "编程"}},
+        {"op": "insert", "section": "skills", "index": 2, "entry": {"name": "英语", "type": "语言"}},
+        {"op": "move", "section": "skills", "from": 0, "to": 2},
+        {"op": "update", "section": "skills", "index": 0, "entry": {"name": "Rust", "type": "编程"}},
+        {"op": "delete", "section": "skills", "index": 1},
+    ]
+    for record in records:
+        apply_record(resume_data, record)
+        op = record["op"]
+        if op == "insert":
+            index.insert("skills", record["index"], make_entry("skills", record["entry"]))
+        elif op == "update":
+            index.update("skills", record["index"], make_entry("skills", record["entry"]))
+        elif op == "delete":
+            index.delete("skills", record["index"])
+        else:
+            index.move("skills", record["from"], record["to"])
+    assert [s.name for s in resume_data["skills"]] == ["Rust", "Go"]
+    assert_consistent(index["skills"], "skills", resume_data["skills"])
+
+
+def skill_groups(resume_data, index):
+    [section] = build_document(resume_data, ("skills",), index).sections
+    return [(group.label, group.items) for group in section.blocks]
+
+
+@pytest.mark.parametrize("change", ["type", "reorder"])
+def test_document_ignores_stale_index_of_same_length(change):
+    resume_data = empty_resume_data()
+    resume_data["skills"] = [skill("Python"), skill("英语", "语言"), skill("Go")]
+    index = ResumeIndex(resume_data)
+    if change == "type": # 数据改了，索引没有跟着更新
+        resume_data["skills"][2] = resume_data["skills"][2].replace(type="语言")
+    else:
+        resume_data["skills"].reverse()
+    assert not index.matches(resume_data)
+    expected = skill_groups(resume_data, None)
+    assert skill_groups(resume_data, index) == expected
+    assert expected == ([("编程", ("Python",)), ("语言", ("英语", "Go"))] if change == "type"
+                        else [("编程", ("Go", "Python")), ("语言", ("英语",))])
+
+
+def test_document_uses_synchronized_index(monkeypatch):
+    resume_data = empty_resume_data()
+    resume_data["skills"] = [skill("Python"), skill("Go")]
+    index = ResumeIndex(resume_data)
+    monkeypatch.setattr("resume_document.ResumeIndex", None) # 同步时不重建
+    assert skill_groups(resume_data, index) == [("编程", ("Python", "Go"))]
@@ -0,0 +1,111 @@
+"""resume_journal：修改记录的重放、快照压缩和异常退出后的恢复"""
+import json
+import os
+
+import pytest
+
+from resume_journal import (JOURNAL_FILE, ResumeJournal, apply_record, discard_session, find_crashed_sessions,
+                            recover_session)
+from resume_schema import Skill, empty_resume_data
+
+
+def skill_record(op, index, name):
+    return {"op": op, "section": "skills", "index": index, "entry": {"name": name, "type": "编程"}}
+
+
+RECORDS = [
+    {"op": "personal", "field": "name", "value": "张三"},
+    skill_record("insert", 0, "Python"),
+    skill_record("insert", 1, "Go"),
+    skill_record("insert", 0, "Rust"),
+    {"op": "move", "section": "skills", "from": 0, "to": 2},
+    skill_record("update", 1, "Golang"),
+    {"op": "reorder", "section": "skills", "order": [2, 0, 1]},
+    {"op": "delete", "section": "skills", "index": 1},
+]
+
+
+def replayed(records):
+    resume_data = empty_resume_data()
+    for record in records:
+        apply_record(resume_data, record)
+    return resume_data
+
+
+def skill_names(resume_data):
+    return [skill.name if isinstance(skill, Skill) else skill["name"] for skill in resume_data["skills"]]
+
+
+def crash(journal):
+    """模拟进程退出：释放文件（和锁），但不删除会话目录"""
+    journal._journal.close()
+    journal._lock.close()
+
+
+def test_apply_record_operations():
+    resume_data = replayed(RECORDS)
+    assert resume_data["personal_info"]["name"] == "张三"
+    assert skill_names(resume_data) == ["Rust", "Golang"]
+    assert all(isinstance(skill, Skill) for skill in resume_data["skills"])
+    with pytest.raises(ValueError):
+        apply_record(resume_data, {"op": "rename", "section": "skills"})
+
+
+def test_recover_replays_journal_after_snapshot(tmp_path):
+    journal = ResumeJournal(str(tmp_path))
+    journal.compact(empty_resume_data())
+    for record in RECORDS:
+        journal.append(record)
+    crash(journal)
+    assert find_crashed_sessions(str(tmp_path)) == [journal.session_dir]
+    recovered = recover_session(journal.session_dir)
+    assert skill_names(recovered) == ["Rust", "Golang"]
+    assert recovered["personal_info"]["name"] == "张三"
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    journal = ResumeJournal(str(tmp_path))
+    journal.compact(empty_resume_data())
+    for record in RECORDS[:3]:
+        journal.append(record)
+    journal._journal.write(json.dumps({"seq": 4, **RECORDS[3]})[:25]) # 写到一半时崩溃
+    crash(journal)
+    assert skill_names(recover_session(journal.session_dir)) == ["Python", "Go"]
+
+
+def test_records_already_in_snapshot_are_skipped(tmp_path):
+    journal = ResumeJournal(str(tmp_path), compact_every=3)
+    resume_data = empty_resume_data()
+    for record in RECORDS[:3]:
+        journal.append(record)
+        apply_record(resume_data, record)
+    assert journal.needs_compaction
+    with open(os.path.join(journal.session_dir, JOURNAL_FILE), encoding="utf-8") as f:
+        before_truncate = f.read()
+    journal.compact(resume_data)
+    assert not journal.needs_compaction
+    journal._journal.write(before_truncate) # 替换快照之后、截断日志之前崩溃
+    journal._journal.flush()
+    journal.append(RECORDS[3])
+    crash(journal)
+    assert skill_names(recover_session(journal.session_dir)) == ["Rust", "Python", "Go"]
+
+
+def test_live_and_closed_sessions_are_not_crashed(tmp_path):
+    closed = ResumeJournal(str(tmp_path))
+    closed.close()
+    assert not os.path.exists(closed.session_dir)
+    live = ResumeJournal(str(tmp_path))
+    assert find_crashed_sessions(str(tmp_path)) == []
+    crash(live)
+    assert find_crashed_sessions(str(tmp_path)) == [live.session_dir]
+    discard_session(live.session_dir)
+    assert find_crashed_sessions(str(tmp_path)) == []
+    assert find_crashed_sessions(str(tmp_path / "missing")) == []
+
+
+def test_session_without_snapshot_has_nothing_to_recover(tmp_path):
+    journal = ResumeJournal(str(tmp_path))
+    journal.append(RECORDS[0])
+    crash(journal)
+    assert recover_session(journal.session_dir) is None
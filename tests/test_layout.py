@@ -0,0 +1,139 @@
+"""resume_layout：两端对齐的测量与绘制、分页"""
+import pytest
+
+from resume_layout import ORPHAN_ROWS, Block, Measurer, Row, TextOp, _justified_cell, paginate, spacer
+from resume_linebreak import GlyphAdvances
+
+# 每个字符 500/1000 em：10pt 时约 1.76 毫米
+ADVANCES = GlyphAdvances({}, default=500)
+FONT = ("", 10)
+
+
+class RecordingPDF:
+    """只实现 _justified_cell 用到的接口：每个字符宽 1 毫米，记录绘制的文本"""
+    c_margin = 1.0
+    k = 72 / 25.4
+    font_size = 10 / k
+
+    def __init__(self):
+        self.cells, self.texts, self.char_spacing, self.x, self.y = [], [], 0, 0, 0
+
+    def get_string_width(self, text):
+        return float(len(text))
+
+    def set_xy(self, x, y):
+        self.x, self.y = x, y
+
+    def set_char_spacing(self, spacing):
+        self.char_spacing = spacing
+
+    def cell(self, w, h, text, align='', link=""):
+        self.cells.append((round(self.x, 6), text, align, self.char_spacing))
+
+    def text(self, x, y, text):
+        self.texts.append((round(x, 6), round(y, 6), text))
+
+
+def aligns(rows):
+    return [row.ops[0].align for row in rows]
+
+
+def test_wrapped_lines_justified_last_line_left():
+    measurer = Measurer(ADVANCES)
+    rows = measurer.paragraphs(["负" * 50, "短句", "第一段" * 10 + "\n第二行"], FONT, (0, 0, 0), 5, 10, 40,
+                               justify=True)
+    texts = [row.ops[0].text for row in rows]
+    # 可用宽度 38 毫米，每行 21 字
+    assert texts == ["负" * 21, "负" * 21, "负" * 8, "短句", ("第一段" * 7)[:21], ("第一段" * 10)[21:], "第二行"]
+    assert aligns(rows) == ['J', 'J', 'L', 'L', 'J', 'L', 'L'] # 段末和段内换行前的行左对齐
+    assert set(aligns(measurer.paragraphs(["负" * 50], FONT, (0, 0, 0), 5, 10, 40))) == {'L'}
+
+
+def op(text, w=22):
+    return TextOp(10, w, 5, text, 'J', FONT, (0, 0, 0), "")
+
+
+def test_cjk_line_spreads_slack_between_characters():
+    pdf = RecordingPDF()
+    _justified_cell(pdf, op("负责后端开发提升性能了系统稳定性"), 0) # 16 字，可用宽度 20：空白 4
+    [(x, text, align, spacing)] = pdf.cells
+    assert align == 'L' and spacing == pytest.approx(4 * pdf.k / 15)
+    assert pdf.char_spacing == 0 # 绘制后恢复
+
+
+def test_latin_line_spreads_slack_over_spaces():
+    pdf = RecordingPDF()
+    _justified_cell(pdf, op("aaaa bb cccccc dd"), 3) # 17 字符，可用宽度 20：空白 3，每个空格加 1
+    assert [(x, text) for x, _, text in pdf.texts] == [(11, "aaaa"), (17, "bb"), (21, "cccccc"), (29, "dd")]
+    assert [y for _, y, _ in pdf.texts] == pytest.approx([3 + 2.5 + 0.3 * pdf.font_size] * 4) # 与 cell 同一基线
+    last_x, _, last = pdf.texts[-1]
+    assert last_x + len(last) == pytest.approx(10 + 22 - pdf.c_margin) # 末词对齐右边距
+    assert not pdf.cells
+
+
+@pytest.mark.parametrize("text", ["短", "abc", "a" * 21])
+def test_short_or_overfull_lines_stay_left_aligned(text):
+    pdf = RecordingPDF()
+    _justified_cell(pdf, op(text), 0)
+    assert pdf.cells == [(0, text, 'L', 0)]
+
+
+# --- 分页 ---
+TOP, BOTTOM = 10, 110 # 正文高 100
+
+
+def rows(count, height=10):
+    return [Row(height, (op(f"r{i}"),)) for i in range(count)]
+
+
+def layout(blocks):
+    placements, pages = paginate(blocks, TOP, BOTTOM)
+    return [(p.page, p.y) for p in placements], pages
+
+
+def test_blocks_fill_pages_in_order():
+    assert layout([Block(rows(4)), Block(rows(4))]) == ([(0, 10 + 10 * i) for i in range(8)], 1)
+    assert paginate([], TOP, BOTTOM) == ([], 1)
+
+
+def test_keep_together_moves_whole_block_to_next_page():
+    positions, pages = layout([Block(rows(7)), Block(rows(4))])
+    assert positions[7:] == [(1, 10), (1, 20), (1, 30), (1, 40)]
+    assert pages == 2
+
+
+def test_block_without_keep_together_splits_at_page_end():
+    positions, _ = layout([Block(rows(7)), Block(rows(5), keep_together=False)])
+    assert positions[7:] == [(0, 80), (0, 90), (0, 100), (1, 10), (1, 20)]
+
+
+def test_split_block_needs_orphan_rows_on_current_page():
+    positions, _ = layout([Block(rows(10 - ORPHAN_ROWS + 1)), Block(rows(5), keep_together=False)])
+    assert positions[-5][0] == 1 # 当前页放不下 ORPHAN_ROWS 行：整块移到下一页
+
+
+def test_keep_with_next_moves_heading_with_following_block():
+    heading = Block(rows(1), keep_with_next=True)
+    positions, _ = layout([Block(rows(6)), heading, Block(rows(4))])
+    assert positions[6:] == [(1, 10), (1, 20), (1, 30), (1, 40), (1, 50)]
+
+
+def test_keep_with_next_uses_only_lead_rows_of_splittable_block():
+    heading = Block(rows(1), keep_with_next=True)
+    positions, _ = layout([Block(rows(6)), heading, Block(rows(8), keep_together=False)])
+    assert positions[6] == (0, 70) # 标题和后面块的前 ORPHAN_ROWS 行能放在本页
+    assert positions[7:7 + ORPHAN_ROWS] == [(0, 80 + 10 * i) for i in range(ORPHAN_ROWS)]
+
+
+def test_block_taller_than_page_is_split():
+    positions, pages = layout([Block(rows(1)), Block(rows(25))])
+    assert positions[1] == (0, 20) # 放不下整页的块不整体移动
+    assert pages == 3
+    assert [p for p in positions if p[0] == 1][0] == (1, 10)
+
+
+def test_spacer_dropped_at_top_of_new_page():
+    placements, _ = paginate([Block(rows(10)), Block([spacer(5)] + rows(2))], TOP, BOTTOM)
+    assert [(p.page, p.y, bool(p.row.ops)) for p in placements[10:]] == [(1, 10, True), (1, 20, True)]
+    placements, _ = paginate([Block([spacer(5)] + rows(2))], TOP, BOTTOM)
+    assert placements[0].row.height == 5 # 第一页顶部的间距保留
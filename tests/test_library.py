@@ -0,0 +1,94 @@
+"""resume_library：保存、读取和全文检索"""
+import pytest
+
+from resume_library import ResumeLibrary
+from resume_schema import Experience, Skill
+
+
+def resume(name, summary="", skills=(), jobs=()):
+    return {"personal_info": {"name": name, "email": f"{name}@example.com", "summary": summary},
+            "skills": [{"name": skill, "type": "编程"} for skill in skills],
+            "experience": [{"company": company, "description": description} for company, description in jobs]}
+
+
+@pytest.fixture
+def library(tmp_path):
+    with ResumeLibrary(str(tmp_path / "library.db")) as library:
+        yield library
+
+
+def names(hits):
+    return [hit.name for hit in hits]
+
+
+def test_save_and_load_round_trip(library):
+    resume_id = library.save(resume("张三", "后端工程师", ["Python", "Go"], [("字节跳动", "负责推荐系统")]))
+    loaded = library.load(resume_id)
+    assert loaded["personal_info"]["name"] == "张三" and loaded["personal_info"]["phone"] == ""
+    assert loaded["skills"] == [Skill(name="Python", type="编程"), Skill(name="Go", type="编程")]
+    assert loaded["experience"] == [Experience(company="字节跳动", description="负责推荐系统")]
+    assert loaded["education"] == []
+
+
+def test_overwrite_replaces_entries_and_search_text(library):
+    resume_id = library.save(resume("张三", skills=["Kubernetes"]))
+    assert library.save(resume("张三", skills=["Terraform"]), resume_id) == resume_id
+    assert [skill.name for skill in library.load(resume_id)["skills"]] == ["Terraform"]
+    assert library.search("Kubernetes") == []
+    assert names(library.search("Terraform")) == ["张三"]
+    assert library.count() == 1
+
+
+def test_missing_ids_raise_key_error(library):
+    with pytest.raises(KeyError):
+        library.load(42)
+    with pytest.raises(KeyError):
+        library.save(resume("张三"), 42)
+
+
+def test_search_chinese_substring_and_all_terms(library):
+    library.save_many([resume("张三", jobs=[("阿里巴巴", "负责推荐系统的召回与排序")]),
+                       resume("李四", jobs=[("腾讯", "负责推荐系统的前端")]),
+                       resume("王五", "熟悉分布式存储")])
+    assert sorted(names(library.search("推荐系统"))) == ["张三", "李四"]
+    assert names(library.search("推荐系统 召回与排序")) == ["张三"] # 多个词为“与”关系
+    assert names(library.search("分布式")) == ["王五"] # 简介也参与检索
+
+
+def test_short_terms_fall_back_to_like(library):
+    library.save_many([resume("张三", skills=["Go", "C"]), resume("李四", skills=["Rust"]),
+                       resume("王五", "100% 投入，熟悉 a_b")])
+    assert names(library.search("Go")) == ["张三"]
+    assert names(library.search("Go Rust")) == [] # 短词之间同样为“与”关系
+    assert names(library.search("0%")) == ["王五"] # LIKE 的通配符按字面匹配
+    assert library.search("x%") == [] and names(library.search("a_")) == ["王五"]
+    assert library.search("b_") == []
+
+
+def test_search_ranks_more_relevant_resume_first(library):
+    library.save(resume("张三", jobs=[("甲公司", "使用 Kubernetes。" + "维护内部工具，编写文档。" * 20)]))
+    library.save(resume("李四", "Kubernetes 运维", ["Kubernetes"], [("乙公司", "Kubernetes 集群升级")]))
+    hits = library.search("kubernetes")
+    assert names(hits) == ["李四", "张三"]
+    assert "[Kubernetes]" in hits[0].snippet
+
+
+def test_empty_query_lists_recent_resumes(library):
+    first = library.save(resume("张三"))
+    second = library.save(resume("李四"))
+    library.save(resume("张三", "更新"), first)
+    assert [hit.resume_id for hit in library.search("  ")] == [first, second]
+    assert [entry.resume_id for entry in library.list_resumes(limit=1)] == [first]
+
+
+def test_delete_removes_resume_entries_and_index(library):
+    resume_id = library.save(resume("张三", skills=["Kubernetes"]))
+    library.delete(resume_id)
+    assert library.count() == 0 and library.search("Kubernetes") == []
+    assert library.conn.execute("SELECT COUNT(*) FROM skills").fetchone()[0] == 0
+
+
+def test_save_many_is_one_transaction(library):
+    with pytest.raises(AttributeError): # 第二份不是字典，第一份也不会留下
+        library.save_many([resume("张三"), "oops"])
+    assert library.count() == 0
@@ -0,0 +1,143 @@
+"""resume_linebreak：折行单位、禁则和字宽表的持久化"""
+import json
+import os
+import random
+from collections import defaultdict
+
+import pytest
+
+import resume_linebreak
+from resume_linebreak import PT_PER_MM, GlyphAdvances, contains_cjk, glyph_advances, segment
+
+# 每个字符宽 1000/1000 em；字号取 PT_PER_MM 时每个字符正好宽 1 毫米
+ADVANCES = GlyphAdvances({}, default=1000)
+SIZE = PT_PER_MM
+
+
+def lines(text, width):
+    return ADVANCES.break_lines(text, SIZE, width)
+
+
+def test_segment_latin_words_cjk_characters_and_spaces():
+    assert segment("Hello  world，你好") == [("Hello", False), ("  ", True), ("world，", False),
+                                             ("你", False), ("好", False)]
+    assert segment("https://example.com/a.b") == [("https://example.com/a.b", False)]
+    assert segment("（注）好") == [("（注）", False), ("好", False)]
+
+
+def test_contains_cjk():
+    assert contains_cjk("Go 与 Python")
+    assert not contains_cjk("Go and Python")
+
+
+def test_no_line_start_punctuation_moves_with_previous_character():
+    assert lines("一二三四五。六", 5) == ["一二三四", "五。六"]
+
+
+def test_no_line_end_punctuation_moves_with_next_character():
+    assert lines("一二三四（五）", 5) == ["一二三四", "（五）"]
+
+
+def test_spaces_at_break_are_dropped_and_leading_indent_kept():
+    assert lines("  aaa bbb ccc", 9) == ["  aaa bbb", "ccc"]
+    assert lines("aaa    bbb", 5) == ["aaa", "bbb"]
+
+
+def test_unit_wider_than_line_is_split_by_character():
+    assert lines("x " + "a" * 12, 5) == ["x", "aaaaa", "aaaaa", "aa"]
+
+
+def test_newlines_force_breaks_and_empty_lines_kept():
+    assert lines("a\n\nb", 5) == ["a", "", "b"]
+    assert lines("", 5) == [""]
+
+
+def test_break_paragraphs_matches_break_lines():
+    texts = ["负责后端开发，提升了系统性能。", "Led the migration of billing", "短\n句"]
+    assert ADVANCES.break_paragraphs(texts, SIZE, 8) == [lines(text, 8) for text in texts]
+
+
+def test_no_line_wider_than_limit():
+    rng = random.Random(3)
+    alphabet = ["负", "责", "，", "。", "（", "）", "word", "a", " ", "“", "”", "…", "12"]
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        width = rng.randint(3, 20)
+        result = lines(text, width)
+        assert all(ADVANCES.text_width(line) <= ADVANCES.limit(SIZE, width) for line in result)
+        assert "".join(result).replace(" ", "") == text.replace(" ", "") # 只丢弃空格，不丢字
+
+
+def test_no_line_starts_with_closing_punctuation():
+    rng = random.Random(5)
+    alphabet = ["负", "责", "，", "。", "（", "）", "word", "a", "“", "”", "…", "12"] # 空格处总可以断行
+    checked = 0
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 60)))
+        width = rng.randint(3, 20)
+        if any(ADVANCES.text_width(unit) > ADVANCES.limit(SIZE, width) for unit, _ in segment(text)):
+            continue # 按字符强制断开时不遵守禁则
+        result = lines(text, width)
+        assert not any(line[:1] in resume_linebreak.NO_LINE_START for line in result[1:])
+        assert not any(line[-1:] in resume_linebreak.NO_LINE_END for line in result[:-1])
+        checked += 1
+    assert checked > 100
+
+
+def test_json_round_trip_merges_ranges():
+    advances = GlyphAdvances({65: 500, 66: 500, 67: 600, 70: 500}, default=250, digest="abc")
+    data = advances.to_json()
+    assert data == {"digest": "abc", "default": 250, "ranges": [[65, 66, 500], [67, 67, 600], [70, 70, 500]]}
+    restored = GlyphAdvances.from_json(json.loads(json.dumps(data)))
+    assert (restored.widths, restored.default, restored.digest) == (advances.widths, 250, "abc")
+
+
+def test_from_font_widths_keeps_default():
+    cw = defaultdict(lambda: 600, {65: 500})
+    advances = GlyphAdvances.from_font_widths(cw)
+    assert advances.text_width("AB") == 1100
+
+
+def test_glyph_advances_persisted_and_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_linebreak, "_ADVANCES", {})
+    font_path = tmp_path / "font.ttf"
+    font_path.write_bytes(b"not really a font")
+    table_dir = tmp_path / "widths"
+    calls = []
+
+    def parse(path):
+        calls.append(path)
+        return defaultdict(lambda: 700, {65: 500})
+
+    first = glyph_advances(str(font_path), parse, str(table_dir))
+    assert glyph_advances(str(font_path), parse, str(table_dir)) is first # 进程内缓存
+    assert len(calls) == 1 and len(os.listdir(table_dir)) == 1
+
+    monkeypatch.setattr(resume_linebreak, "_ADVANCES", {}) # 新进程：从文件读取，不再解析字体
+    second = glyph_advances(str(font_path), parse, str(table_dir))
+    assert len(calls) == 1
+    assert (second.widths, second.default, second.digest) == (first.widths, 700, first.digest)
+
+
+def test_glyph_advances_unwritable_directory_still_works(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_linebreak, "_ADVANCES", {})
+    font_path = tmp_path / "font.ttf"
+    font_path.write_bytes(b"font")
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    advances = glyph_advances(str(font_path), lambda path: defaultdict(lambda: 0, {65: 500}),
+                              str(blocker / "widths"))
+    assert advances.text_width("A") == 500
+
+
+@pytest.mark.parametrize("bad", ["{", '{"ranges": 1}'])
+def test_corrupt_table_is_reparsed(tmp_path, monkeypatch, bad):
+    monkeypatch.setattr(resume_linebreak, "_ADVANCES", {})
+    font_path = tmp_path / "font.ttf"
+    font_path.write_bytes(b"font")
+    parse = lambda path: defaultdict(lambda: 0, {65: 500})
+    glyph_advances(str(font_path), parse, str(tmp_path))
+    [table] = [name for name in os.listdir(tmp_path) if name.endswith(".json")]
+    (tmp_path / table).write_text(bad)
+    monkeypatch.setattr(resume_linebreak, "_ADVANCES", {})
+    assert glyph_advances(str(font_path), parse, str(tmp_path)).text_width("A") == 500
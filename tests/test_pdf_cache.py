@@ -0,0 +1,51 @@
+"""resume_pdf_cache：读写、覆盖同一个键时的大小统计、按最近使用淘汰"""
+import os
+
+from resume_pdf_cache import PDFCache
+
+KEY_A, KEY_B, KEY_C = "aa" + "0" * 62, "bb" + "0" * 62, "cc" + "0" * 62
+
+
+def cached_size(cache):
+    return sum(size for _, size, _ in cache._entries())
+
+
+def test_get_put_round_trip(tmp_path):
+    cache = PDFCache(str(tmp_path))
+    assert cache.get(KEY_A) is None
+    cache.put(KEY_A, b"%PDF-a", 2)
+    assert cache.get(KEY_A) == (b"%PDF-a", 2)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries, stats.size) == (1, 1, 1, 6)
+
+
+def test_overwrite_does_not_inflate_size(tmp_path):
+    cache = PDFCache(str(tmp_path), max_bytes=1000)
+    cache.put(KEY_B, b"x" * 100, 1) # 第一次写入时从目录扫描得到总大小
+    for _ in range(5):
+        cache.put(KEY_A, b"y" * 400, 1)
+    assert cache._size == cached_size(cache) == 500
+    assert cache.evictions == 0
+    assert cache.get(KEY_B) is not None
+
+
+def test_overwrite_with_different_page_count_replaces_file(tmp_path):
+    cache = PDFCache(str(tmp_path))
+    cache.put(KEY_B, b"x", 1)
+    cache.put(KEY_A, b"a" * 10, 1)
+    cache.put(KEY_A, b"b" * 20, 3)
+    assert cache.get(KEY_A) == (b"b" * 20, 3)
+    assert cache.stats().entries == 2
+    assert cache._size == cached_size(cache) == 21
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = PDFCache(str(tmp_path), max_bytes=250)
+    cache.put(KEY_A, b"a" * 100, 1)
+    cache.put(KEY_B, b"b" * 100, 1)
+    old = os.path.getmtime(cache._find(KEY_A)[0]) - 10
+    os.utime(cache._find(KEY_B)[0], (old, old)) # B 最久未用
+    cache.put(KEY_C, b"c" * 100, 1)
+    assert cache.get(KEY_B) is None
+    assert cache.get(KEY_A) is not None and cache.get(KEY_C) is not None
+    assert cache.evictions == 1
@@ -0,0 +1,97 @@
+"""resume_render：输出到 bytes 或调用方的流，页数和大小，缓存与取消"""
+import io
+import json
+import multiprocessing
+import os
+import re
+import sys
+
+import pytest
+
+import resume_export
+import resume_render
+from resume_batch import export_batch
+from resume_pdf_cache import PDFCache
+
+
+def resume(entries=1):
+    return {"personal_info": {"name": "Zhang San", "email": "a@b.c", "phone": "123",
+                              "summary": "Backend engineer who enjoys building reliable systems."},
+            "experience": [{"company": f"Company {i}", "position": "Engineer", "start_date": "2020-01",
+                            "end_date": "至今", "description": "Led the migration of the billing platform.\n" * 6}
+                           for i in range(entries)]}
+
+
+def page_objects(data):
+    return len(re.findall(rb"/Type\s*/Page\b", data))
+
+
+def test_render_result_returns_bytes_with_page_count_and_size(pdf_font):
+    result = resume_render.render_result(resume())
+    assert isinstance(result.data, bytes) and result.data.startswith(b"%PDF-")
+    assert result.size == len(result.data)
+    assert result.pages == page_objects(result.data) == 1
+    assert resume_render.render_resume(resume()) == result.data # 输出是确定的
+
+
+def test_long_resume_reports_every_page(pdf_font):
+    result = resume_render.render_result(resume(entries=30))
+    assert result.pages > 1
+    assert page_objects(result.data) == result.pages
+
+
+def test_stream_receives_pdf_without_bytes_copy(pdf_font):
+    expected = resume_render.render_resume(resume())
+    stream = io.BytesIO()
+    result = resume_render.render_result(resume(), stream=stream)
+    assert result.data is None
+    assert stream.getvalue() == expected
+    assert (result.pages, result.size) == (1, len(expected))
+
+
+def test_cache_hit_written_to_stream(pdf_font, tmp_path):
+    cache = PDFCache(str(tmp_path / "cache"))
+    first = resume_render.render_result(resume(), cache=cache)
+    stream = io.BytesIO()
+    second = resume_render.render_result(resume(), stream=stream, cache=cache)
+    assert cache.hits == 1
+    assert stream.getvalue() == first.data and second.pages == first.pages
+
+
+def test_cancelled_render_writes_nothing(pdf_font):
+    stages = []
+    stream = io.BytesIO()
+    with pytest.raises(resume_render.RenderCancelled):
+        resume_render.render_result(resume(), stream=stream,
+                                    progress=lambda done, total, stage: stages.append(done),
+                                    is_cancelled=lambda: len(stages) >= 2)
+    assert stream.getvalue() == b""
+    assert stages == [0, 1]
+
+
+def test_progress_reports_every_section_then_output(pdf_font):
+    calls = []
+    resume_render.render_result(resume(), progress=lambda done, total, stage: calls.append((done, total, stage)))
+    assert [done for done, _, _ in calls] == list(range(len(calls)))
+    assert calls[-1][0] == calls[-1][1] - 1 and calls[-1][2] == resume_render.OUTPUT_STAGE
+
+
+def test_cli_streams_stdin_to_stdout(pdf_font, monkeypatch, capsysbinary):
+    data = resume()
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(json.dumps(data).encode("utf-8"))))
+    assert resume_export.main(["-", "-", "--format", "pdf"]) == 0
+    captured = capsysbinary.readouterr()
+    assert captured.out == resume_render.render_resume(data)
+    assert "标准输出" in captured.err.decode("utf-8") # 提示信息不混入输出
+
+
+def test_batch_streams_pdf_into_output_files(pdf_font, tmp_path):
+    source = tmp_path / "in.json"
+    source.write_text(json.dumps(resume()), encoding="utf-8")
+    report = export_batch([str(source)], str(tmp_path / "out"), workers=1,
+                          mp_context=multiprocessing.get_context("fork"))
+    [result] = report.results
+    assert result.ok
+    with open(result.output, "rb") as f:
+        assert f.read() == resume_render.render_resume(resume())
+    assert os.listdir(tmp_path / "out") == ["Zhang San_简历.pdf"] # 临时文件已改名
@@ -0,0 +1,210 @@
+"""resume_server：HTTP 解析、并发限制、相同请求合并和排队上限"""
+import asyncio
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import resume_server
+from resume_render import PDFResult
+from resume_server import RenderService, Request, RequestError, ServiceBusy, read_request
+
+BODY = json.dumps({"personal_info": {"name": "张三", "email": "a@b.c", "phone": "123"}}).encode("utf-8")
+
+
+# --- 请求解析 ---
+def parse(raw, **kwargs):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await read_request(reader, **kwargs)
+    return asyncio.run(run())
+
+
+def test_read_request_with_body_and_query():
+    request = parse(b"POST /render?template=compact HTTP/1.1\r\nContent-Length: 4\r\nX-A: b\r\n\r\nbody")
+    assert request == Request("POST", "/render", {"template": ["compact"]}, {"content-length": "4", "x-a": "b"},
+                              b"body", True)
+
+
+@pytest.mark.parametrize("head, keep_alive", [
+    (b"GET /health HTTP/1.1\r\n", True), (b"GET /health HTTP/1.1\r\nConnection: close\r\n", False),
+    (b"GET /health HTTP/1.0\r\n", False), (b"GET /health HTTP/1.0\r\nConnection: Keep-Alive\r\n", True),
+])
+def test_keep_alive_follows_http_version(head, keep_alive):
+    assert parse(head + b"\r\n").keep_alive is keep_alive
+
+
+@pytest.mark.parametrize("raw, status", [
+    (b"garbage\r\n\r\n", 400),
+    (b"POST /render HTTP/1.1\r\nno colon\r\n\r\n", 400),
+    (b"POST /render HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n", 411),
+    (b"POST /render HTTP/1.1\r\nContent-Length: x\r\n\r\n", 400),
+    (b"POST /render HTTP/1.1\r\nContent-Length: -1\r\n\r\n", 400),
+    (b"POST /render HTTP/1.1\r\nContent-Length: 11\r\n\r\n", 413),
+])
+def test_invalid_requests(raw, status):
+    with pytest.raises(RequestError) as info:
+        parse(raw, max_body=10)
+    assert info.value.status == status
+
+
+def test_closed_connection_between_requests():
+    assert parse(b"") is None
+
+
+# --- 调度（渲染在线程中用假的 _render_job 完成）---
+class FakeRenderer:
+    """代替工作进程中的渲染：记录同时进行的渲染数，gate 打开前不返回"""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.lock = threading.Lock()
+        self.running = self.peak = self.calls = 0
+
+    def __call__(self, body, template):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            self.gate.wait(5)
+            if b"boom" in body:
+                raise ValueError("渲染失败")
+            return PDFResult(b"%PDF-" + template.encode() + b"-" + body[-8:], 1, 0)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    renderer = FakeRenderer()
+    monkeypatch.setattr(resume_server, "_render_job", renderer)
+    return renderer
+
+
+def service_for(fake, max_concurrency=2, max_queue=2):
+    service = RenderService(workers=4, max_concurrency=max_concurrency, max_queue=max_queue)
+    service._slots = asyncio.Semaphore(service.max_concurrency)
+    service._pool = ThreadPoolExecutor(4)
+    return service
+
+
+async def open_gate_when(fake, condition):
+    while not condition():
+        await asyncio.sleep(0.01)
+    fake.gate.set()
+
+
+def test_identical_requests_share_one_render(fake):
+    async def run():
+        service = service_for(fake)
+        results = await asyncio.gather(service.render(BODY), service.render(BODY), service.render(BODY),
+                                       open_gate_when(fake, lambda: fake.calls == 1))
+        return service, results[:3]
+    service, results = asyncio.run(run())
+    assert fake.calls == 1 and results[0] is results[1] is results[2]
+    assert service.health()["coalesced"] == 2 and service.health()["rendered"] == 1
+    assert service.health()["pending"] == service.health()["in_flight"] == 0
+
+
+def test_template_is_part_of_the_request_key(fake):
+    async def run():
+        service = service_for(fake)
+        fake.gate.set()
+        return await asyncio.gather(service.render(BODY), service.render(BODY, "compact"))
+    default, compact = asyncio.run(run())
+    assert fake.calls == 2 and default.data != compact.data
+
+
+def test_concurrency_bounded_and_full_queue_rejected(fake):
+    async def run():
+        service = service_for(fake, max_concurrency=2, max_queue=2)
+        renders = [asyncio.ensure_future(service.render(BODY + b" " * i)) for i in range(4)]
+        await asyncio.sleep(0) # 四个请求都已计入
+        with pytest.raises(ServiceBusy):
+            await service.render(BODY + b" " * 9)
+        busy = await service.dispatch(Request("POST", "/render", {}, {}, BODY + b" " * 9, True))
+        await open_gate_when(fake, lambda: fake.running == 2)
+        await asyncio.gather(*renders)
+        return service, busy
+    service, busy = asyncio.run(run())
+    assert busy.status == 503 and busy.headers["Retry-After"] == "1"
+    assert fake.peak == 2 and fake.calls == 4
+    health = service.health()
+    assert (health["rendered"], health["rejected"], health["pending"]) == (4, 2, 0)
+
+
+def test_failed_render_counted_and_reported(fake):
+    async def run():
+        service = service_for(fake)
+        fake.gate.set()
+        body = json.dumps({"personal_info": {"name": "boom", "email": "a", "phone": "1"}}).encode()
+        return service, await service.dispatch(Request("POST", "/render", {}, {}, body, True))
+    service, response = asyncio.run(run())
+    assert response.status == 500 and "渲染失败" in json.loads(response.body)["error"]
+    assert service.health()["failed"] == 1 and service.health()["pending"] == 0
+
+
+@pytest.mark.parametrize("method, path, query, body, status", [
+    ("GET", "/nope", {}, b"", 404),
+    ("GET", "/render", {}, BODY, 405),
+    ("POST", "/health", {}, b"", 405),
+    ("POST", "/render", {"template": ["nope"]}, BODY, 400),
+    ("POST", "/render", {}, b"{bad", 400),
+    ("POST", "/render", {}, b"[]", 400),
+    ("POST", "/render", {}, json.dumps({"personal_info": {"name": "张三"}}).encode(), 422),
+])
+def test_dispatch_rejects_bad_requests_before_rendering(fake, method, path, query, body, status):
+    service = service_for(fake)
+    response = asyncio.run(service.dispatch(Request(method, path, query, {}, body, True)))
+    assert response.status == status
+    assert fake.calls == 0
+
+
+def test_keep_alive_connection_serves_several_requests(fake):
+    async def run():
+        service = service_for(fake)
+        fake.gate.set()
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /render?template=compact HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(BODY) + BODY)
+        writer.write(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return data
+    data = asyncio.run(run())
+    first, second = data.split(b"HTTP/1.1 ")[1:]
+    assert first.startswith(b"200 OK") and b"X-Resume-Pages: 1" in first and b"%PDF-compact" in first
+    assert second.startswith(b"200 OK") and b"Connection: close" in second
+    assert json.loads(second.split(b"\r\n\r\n", 1)[1])["rendered"] == 1
+
+
+# --- 真实的进程池 ---
+def test_serve_renders_pdf_in_worker_processes(pdf_font):
+    async def run():
+        service = RenderService(workers=1, mp_context=multiprocessing.get_context("fork"))
+        listening = asyncio.get_running_loop().create_future()
+        task = asyncio.ensure_future(resume_server.serve(service, "127.0.0.1", 0, listening.set_result))
+        server = await asyncio.wait_for(listening, 60)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /render HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n" % len(BODY) + BODY)
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), 60)
+        writer.close()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return data
+    head, body = asyncio.run(run()).split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200 OK") and b"X-Resume-Pages: 1" in head
+    assert body.startswith(b"%PDF-")
@@ -0,0 +1,122 @@
+"""resume_validation：规则检查、错误位置和汇总报告"""
+import json
+
+import pytest
+
+import resume_validation
+from resume_schema import make_entry
+from resume_validation import VALIDATOR, ValidationError, Validator, describe, format_report, summarize
+
+PERSONAL = {"name": "张三", "email": "a@b.c", "phone": "123"}
+JOB = {"company": "ACME", "position": "后端", "start_date": "2020-01", "end_date": "至今", "description": "开发"}
+SCHOOL = {"school": "某大学", "major": "计算机", "start_year": "2016", "end_year": "2020"}
+
+
+def resume(**sections):
+    return {"personal_info": dict(PERSONAL), **sections}
+
+
+def codes(errors):
+    return [(e.section, e.index, e.field, e.code) for e in errors]
+
+
+def test_valid_resume_with_records_or_dicts():
+    assert VALIDATOR.validate(resume(experience=[JOB], education=[SCHOOL])) == []
+    assert VALIDATOR.is_valid(resume(experience=[make_entry("experience", JOB)]))
+
+
+def test_required_fields_reported_with_location():
+    errors = VALIDATOR.validate({"personal_info": {"name": "张三"}, "skills": [{"name": "Go"}, {"level": "熟练"}]})
+    assert codes(errors) == [("personal_info", None, "email", "required"),
+                             ("personal_info", None, "phone", "required"),
+                             ("skills", 1, "name", "required")]
+    assert errors[0].message == "邮箱为必填项"
+
+
+@pytest.mark.parametrize("field, value, code", [
+    ("start_date", "2020", "year_month"), ("start_date", "2020-1", "year_month"),
+    ("start_date", "至今", "year_month"), ("end_date", "2020/01", "year_month_or_present"),
+])
+def test_year_month_checks(field, value, code):
+    errors = VALIDATOR.validate(resume(experience=[{**JOB, field: value}]))
+    assert codes(errors) == [("experience", 0, field, code)]
+
+
+@pytest.mark.parametrize("field, value, ok", [
+    ("start_year", "2016", True), ("start_year", "16", False), ("start_year", "至今", False),
+    ("end_year", "至今", True), ("end_year", "２０２０", False), ("end_year", 2020, False),
+])
+def test_year_checks(field, value, ok):
+    assert VALIDATOR.is_valid(resume(education=[{**SCHOOL, field: value}])) is ok
+
+
+def test_missing_field_not_also_reported_as_bad_format():
+    errors = VALIDATOR.validate(resume(experience=[{**JOB, "start_date": ""}]))
+    assert codes(errors) == [("experience", 0, "start_date", "required")]
+
+
+@pytest.mark.parametrize("data, expected", [
+    ("oops", [(None, None, None, "type")]),
+    ({"personal_info": "oops"}, [("personal_info", None, None, "type")]),
+    (resume(skills={"name": "Go"}), [("skills", None, None, "type")]),
+    (resume(skills=["Go"]), [("skills", 0, None, "type")]),
+])
+def test_structure_type_errors(data, expected):
+    assert codes(VALIDATOR.validate(data)) == expected
+
+
+def test_validate_many_numbers_resumes_and_stops_at_limit():
+    batch = [resume(), {"personal_info": {}}, resume(skills=[{}])]
+    errors = VALIDATOR.validate_many(batch)
+    assert [(e.resume, e.field) for e in errors] == [(1, "name"), (1, "email"), (1, "phone"), (2, "name")]
+    assert len(VALIDATOR.validate_many(batch, limit=2)) == 2
+
+
+def test_custom_rules_checked_when_compiled():
+    validator = Validator({"skills": {"name": ("required",), "level": ("required",)}})
+    assert codes(validator.validate({"personal_info": {}, "skills": [{"name": "Go"}]})) == [
+        ("skills", 0, "level", "required")]
+    with pytest.raises(ValueError):
+        Validator({"skills": {"color": ("required",)}})
+    with pytest.raises(ValueError):
+        Validator({"skills": {"name": ("email",)}})
+    with pytest.raises(ValueError):
+        Validator({"hobbies": {}})
+
+
+def test_describe_and_report():
+    error = ValidationError(2, "experience", 0, "start_date", "year_month", "开始时间格式错误")
+    assert describe(error) == "简历 #3 工作经历 #1: 开始时间格式错误"
+    assert describe(error._replace(resume=None, section="personal_info", index=None)) == "个人信息: 开始时间格式错误"
+    assert format_report([]) == "未发现问题"
+    errors = VALIDATOR.validate_many([{"personal_info": {}}] * 3)
+    assert summarize(errors)[0][-1] == 3
+    report = format_report(errors, limit=4)
+    assert report.startswith("共 9 处问题:")
+    assert "个人信息: 姓名为必填项 × 3" in report
+    assert report.endswith("…… 另有 5 处未列出")
+
+
+def test_main_reports_problems_and_unreadable_files(tmp_path, capsys):
+    good, bad, broken = tmp_path / "good.json", tmp_path / "bad.json", tmp_path / "broken.json"
+    good.write_text(json.dumps(resume()), encoding="utf-8")
+    bad.write_text(json.dumps({"personal_info": {}}), encoding="utf-8")
+    broken.write_text("{", encoding="utf-8")
+    assert resume_validation.main([str(good)]) == 0
+    assert resume_validation.main([str(good), str(bad)]) == 1
+    assert resume_validation.main([str(broken)]) == 1
+    captured = capsys.readouterr()
+    assert "未发现问题" in captured.out and "姓名为必填项" in captured.out
+    assert "无法读取" in captured.err
+
+
+def test_non_string_fields_reported_as_type_errors():
+    data = {"personal_info": {**PERSONAL, "name": 123, "summary": ["a"]},
+            "experience": [{**JOB, "start_date": 2020}], "languages": [{"name": "英语", "level": 6}]}
+    errors = VALIDATOR.validate(data)
+    assert codes(errors) == [("personal_info", None, "name", "type"), ("personal_info", None, "summary", "type"),
+                             ("experience", 0, "start_date", "type"), ("languages", 0, "level", "type")]
+    assert errors[0].message == "姓名应为文本"
+    assert VALIDATOR.is_valid(resume(experience=[{**JOB, "description": None}])) is False # 必填，None 视为缺失
+    assert codes(Validator({"skills": {}}).validate({"personal_info": {"phone": 1}})) == [
+        ("personal_info", None, "phone", "type")] # 与规则无关